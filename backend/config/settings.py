@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'recipes',
     'rest_framework',
     'drf_spectacular',
@@ -143,4 +144,74 @@ REST_FRAMEWORK = {
 }
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / "media"
+
+# 테스트 시 managed=False 모델의 테이블을 만들어 주는 러너
+TEST_RUNNER = "config.test_runner.UnmanagedModelTestRunner"
+
+# 레시피 상세 payload 캐시 (recipes/cache.py)
+# 여러 프로세스로 띄울 때는 버전 카운터가 공유되도록 Redis/Memcached/파일 등 공용 백엔드로 바꿔야 한다.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "cooking-site"),
+    }
+}
+RECIPE_DETAIL_CACHE_TIMEOUT = 60 * 10
+
+# JWT 인증 (recipes/authentication.py)
+# True 면 읽기 요청은 토큰 claims 로 principal 을 만들고 member 를 조회하지 않는다 (쓰기는 항상 조회).
+# role 변경 무효화가 모든 워커에 전달되어야 하므로 공용 CACHE_BACKEND 없이는 켤 수 없다 (recipes.E001).
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "0") == "1"
+JWT_MEMBER_CACHE_SIZE = 1024   # 프로세스 내 member 캐시 최대 개수
+JWT_MEMBER_CACHE_TTL = 60      # 초
+
+# 재료 기반 검색 역색인(recipes/ingredient_index.py)
+INGREDIENT_INDEX_MIN_REBUILD_INTERVAL = 30  # DB 버전(ingredient_index_version_seq) 확인 최소 간격(초)
+INGREDIENT_INDEX_MAX_AGE = 60 * 60          # 버전이 그대로여도 이보다 오래된 인덱스는 다시 만든다(초)
+
+# 인기 레시피 스냅샷 (mv_recipe_popularity, manage.py refresh_popular_recipes)
+POPULAR_RECIPES_REFRESH_INTERVAL = 300      # --loop 갱신 간격(초)
+POPULAR_RECIPES_MAX_STALENESS = 60 * 60     # 이보다 오래된 스냅샷이면 v_recipe_summary 직접 조회 (None: 제한 없음)
+
+# 트렌딩 레시피 (recipes/trending.py, manage.py update_trending)
+TRENDING_HALF_LIFE_HOURS = 24       # 이벤트 점수가 절반이 되는 시간
+TRENDING_WINDOW_DAYS = 7            # 이보다 오래된 이벤트는 점수에서 뺀다
+TRENDING_WEIGHTS = {"like": 1.0, "rating": 1.5, "comment": 2.0}
+TRENDING_LAG_SECONDS = 60           # 늦게 커밋되는 이벤트를 위해 now() - lag 까지만 반영
+TRENDING_UPDATE_INTERVAL = 60       # --loop 갱신 간격(초)
+TRENDING_REBUILD_INTERVAL = 6 * 60 * 60  # --loop 에서 처음부터 다시 계산하는 간격(초), 증분에 안 잡힌 삭제 정리
+
+# 평점 일괄 이관 API (POST /api/admin/ratings/import/) 요청 1건당 최대 행 수
+RATING_IMPORT_MAX_BATCH = 1000
+
+# 레시피 이미지 variant (recipes/images.py)
+# 업로드 원본으로 썸네일/카드/큰 이미지를 WebP + JPEG 로 만든다. 이름 → (가로, 세로, crop|fit)
+RECIPE_IMAGE_VARIANTS = {
+    "thumb": (160, 160, "crop"),
+    "card": (480, 360, "crop"),
+    "full": (1600, 1600, "fit"),
+}
+RECIPE_IMAGE_WORKERS = 2        # 변환 워커 스레드 수 (0 이면 커밋 직후 요청 스레드에서 처리)
+RECIPE_IMAGE_QUALITY = 82
+
+# 레시피 이미지 업로드 최대 크기(바이트) (recipes/uploads.py)
+RECIPE_IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+# 팔로우 피드 (recipes/feed.py)
+FEED_FANOUT_MAX_FOLLOWERS = 1000    # 팔로워가 이보다 많은 작성자는 fan-out 대신 조회 시 직접 읽음
+FEED_FOLLOW_BACKFILL = 20           # 새로 팔로우한 작성자의 최근 레시피를 이만큼 피드에 채움
+
+# 관리자 신고 처리 큐 (recipes/moderation.py)
+MODERATION_RECENT_REASONS = 3               # 큐 항목마다 보여 줄 최근 신고 사유 수
+MODERATION_COMMENT_SNIPPET_LENGTH = 80      # 댓글 미리보기 글자 수
+MODERATION_BULK_MAX_REPORTS = 500           # 신고 일괄 처리 요청 1건당 최대 report_ids 수
+
+# 이용 제한 확인 (recipes/sanctions.py)
+SANCTION_NON_BLOCKING_TYPES = ("WARNING",)  # 쓰기를 막지 않는 제재 종류
+SANCTION_CACHE_TTL = 60 * 60                # 제한 중인 회원의 상태 캐시 시간(초, 제한 종료 시각이 더 이르면 그때까지)
+SANCTION_NEGATIVE_CACHE_TTL = 60            # "제한 없음" 캐시 시간(초). 앱 밖/다른 워커에서 넣은 제재도 이 안에 반영
+
+# 신고 접수 빈도 제한 (recipes/throttles.py, 슬라이딩 윈도우 카운터)
+REPORT_RATE_LIMIT = 10          # 회원 1명이 REPORT_RATE_WINDOW 초 동안 접수할 수 있는 신고 수
+REPORT_RATE_WINDOW = 10 * 60
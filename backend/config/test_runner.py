@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+
+class UnmanagedModelTestRunner(DiscoverRunner):
+    """
+    recipes 모델은 전부 managed=False (스키마는 PostgreSQL 쪽에서 관리)라서
+    테스트 DB 에 테이블이 생기지 않는다.
+    테스트 동안만 managed=True 로 바꾸고 recipes 마이그레이션(RunSQL)을 건너뛰어
+    syncdb 로 테이블을 만든다.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        self.unmanaged_models = [
+            m for m in apps.get_app_config("recipes").get_models()
+            if not m._meta.managed
+        ]
+        for m in self.unmanaged_models:
+            m._meta.managed = True
+        self._old_migration_modules = settings.MIGRATION_MODULES
+        settings.MIGRATION_MODULES = {**settings.MIGRATION_MODULES, "recipes": None}
+        super().setup_test_environment(**kwargs)
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        settings.MIGRATION_MODULES = self._old_migration_modules
+        for m in self.unmanaged_models:
+            m._meta.managed = False
+
+    def setup_databases(self, **kwargs):
+        old_config = super().setup_databases(**kwargs)
+        # recipe_tag / recipe_like / follow 는 실제 DB 에서 복합 PK 인데
+        # 모델은 첫 FK 를 primary_key 로 두고 있어 syncdb 결과가 (FK 하나만) PK 가 된다.
+        # 실제 스키마처럼 unique_together 컬럼 전체를 PK 로 바꿔 준다.
+        for alias in connections:
+            with connections[alias].cursor() as cursor:
+                for m in self.unmanaged_models:
+                    if not m._meta.unique_together or not m._meta.pk.is_relation:
+                        continue
+                    table = m._meta.db_table
+                    columns = ", ".join(
+                        m._meta.get_field(name).column
+                        for name in m._meta.unique_together[0]
+                    )
+                    cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_pkey")
+                    cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({columns})")
+        return old_config
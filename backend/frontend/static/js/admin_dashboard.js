@@ -61,81 +61,92 @@ async function loadAdminStats() {
 }
 
 /***********************
- *  신고 내역 리스트
+ *  신고 처리 큐 (대상별로 묶인 대기 신고)
  ***********************/
-async function loadReportList() {
+async function loadReportList(nextUrl = null) {
   const listEl = document.getElementById("reportList");
   const errorEl = document.getElementById("reportError");
   if (!listEl) return;
 
-  listEl.innerHTML = "";
+  // 더 보기(nextUrl)일 때는 기존 목록 뒤에 이어 붙인다
+  if (!nextUrl) listEl.innerHTML = "";
   if (errorEl) errorEl.textContent = "";
 
+  const moreBtn = document.getElementById("reportLoadMore");
+  if (moreBtn) moreBtn.remove();
+
   try {
-    const res = await authFetch("/api/admin/reports/");
+    // 신고 수가 많은 대상부터 5개씩, 이후에는 서버가 준 next URL 을 따라간다
+    const res = await authFetch(nextUrl || "/api/admin/reports/queue/?page_size=5");
     if (!res.ok) {
       if (errorEl) errorEl.textContent = "신고 내역을 불러오지 못했습니다.";
       return;
     }
 
-    const reports = await res.json();
+    const body = await res.json();
+    const items = body.results || [];
+    const next = body.next;
 
-    if (!Array.isArray(reports) || reports.length === 0) {
+    if (!nextUrl && items.length === 0) {
       listEl.innerHTML = "<p>신고된 내용이 없습니다.</p>";
       return;
     }
 
-    reports.slice(0, 5).forEach((report) => {
+    items.forEach((entry) => {
       const item = document.createElement("div");
       item.className = "report-item";
 
-      const reporterName =
-        report.reporter?.name ||
-        report.reporter?.login_id ||
-        "알 수 없음";
-
-      let targetText = "알 수 없음";
-      if (report.target_type === "RECIPE") {
-        targetText = `레시피 #${report.recipe_id}`;
-      } else if (report.target_type === "COMMENT") {
-        targetText = `댓글 #${report.comment_id}`;
+      // 대상 미리보기 (삭제된 대상이면 target 이 null)
+      const target = entry.target;
+      const authorName = target?.author?.name || target?.author?.login_id || "알 수 없음";
+      let targetText = "삭제된 대상";
+      if (entry.target_type === "RECIPE") {
+        targetText = target
+          ? `레시피 #${entry.recipe_id} "${escapeHtml(target.title)}"`
+          : `레시피 #${entry.recipe_id} (삭제됨)`;
+      } else if (entry.target_type === "COMMENT") {
+        targetText = target
+          ? `댓글 #${entry.comment_id} "${escapeHtml(target.snippet)}"`
+          : `댓글 #${entry.comment_id} (삭제됨)`;
       }
 
-      const reason = report.reason || "(사유 없음)";
-      const createdDate = (report.created_at || "").slice(0, 10);
-
-      const isResolved = report.status === "RESOLVED";
-      const statusText = isResolved ? "처리완료" : "대기";
-      const statusClass = isResolved ? "resolved" : "processing";
+      const reasons = (entry.recent_reasons || []).map(escapeHtml).join(" / ") || "(사유 없음)";
+      const firstDate = (entry.first_reported_at || "").slice(0, 10);
 
       item.innerHTML = `
-        <div class="report-title">${reason}</div>
-        <div class="report-date">${createdDate}</div>
-        <div class="report-status ${statusClass}">
-          ${statusText}
+        <div class="report-title">${reasons}</div>
+        <div class="report-date">${firstDate}</div>
+        <div class="report-status processing">
+          신고 ${entry.report_count}건
         </div>
         <div class="report-subtext">
-          대상: ${targetText} · 신고자: ${reporterName}
+          대상: ${targetText} · 작성자: ${escapeHtml(authorName)}
         </div>
         <div class="report-actions">
-          ${
-            isResolved
-              ? `<button class="report-btn secondary" data-id="${report.report_id}" disabled>처리 완료</button>`
-              : `<button class="report-btn primary" data-id="${report.report_id}">처리하기</button>`
-          }
+          <button class="report-btn primary">처리하기</button>
+          <button class="report-btn secondary">반려</button>
         </div>
       `;
 
+      // 버튼 이벤트 연결 (이어 붙인 항목만). 화면에 보인 신고(report_ids)만 처리한다
+      item.querySelector(".report-btn.primary").addEventListener("click", () => {
+        handleReports(entry.report_ids, "RESOLVED");
+      });
+      item.querySelector(".report-btn.secondary").addEventListener("click", () => {
+        handleReports(entry.report_ids, "REJECTED");
+      });
+
       listEl.appendChild(item);
     });
 
-    // 버튼 이벤트 연결
-    listEl.querySelectorAll(".report-btn.primary").forEach((btn) => {
-      btn.addEventListener("click", () => {
-        const reportId = btn.getAttribute("data-id");
-        handleReport(reportId);
-      });
-    });
+    if (next) {
+      const more = document.createElement("button");
+      more.id = "reportLoadMore";
+      more.className = "report-btn secondary";
+      more.textContent = "더 보기";
+      more.addEventListener("click", () => loadReportList(next));
+      listEl.insertAdjacentElement("afterend", more);
+    }
   } catch (err) {
     console.error("loadReportList error:", err);
     if (errorEl) {
@@ -144,40 +155,49 @@ async function loadReportList() {
   }
 }
 
+function escapeHtml(text) {
+  const div = document.createElement("div");
+  div.innerText = text ?? "";
+  return div.innerHTML;
+}
+
 /***********************
- *  신고 처리
+ *  신고 일괄 처리 (대상에 쌓인 신고를 요청 한 번으로)
  ***********************/
-async function handleReport(reportId) {
-  if (!reportId) return;
+async function handleReports(reportIds, status) {
+  if (!reportIds || reportIds.length === 0) return;
 
-  const confirmResult = confirm(`신고 #${reportId} 를 처리 상태로 변경하시겠습니까?`);
+  const actionText = status === "RESOLVED" ? "처리" : "반려";
+  const confirmResult = confirm(`이 대상의 신고 ${reportIds.length}건을 ${actionText}하시겠습니까?`);
   if (!confirmResult) return;
 
   const note = prompt("처리 메모를 입력하세요. (선택 사항)", "") || "";
 
   try {
     const body = {
-      status: "RESOLVED",
+      status,
+      report_ids: reportIds,
     };
     if (note.trim()) {
       body.handle_note = note.trim();
     }
 
-    const res = await authFetch(`/api/admin/reports/${reportId}/`, {
-      method: "PATCH",
+    const res = await authFetch("/api/admin/reports/bulk/", {
+      method: "POST",
       body: JSON.stringify(body),
     });
 
     if (!res.ok) {
-      alert("신고 처리에 실패했습니다.");
+      alert(`신고 ${actionText}에 실패했습니다.`);
       return;
     }
 
-    alert("신고가 처리되었습니다.");
+    const result = await res.json();
+    alert(`신고 ${result.updated}건이 ${actionText}되었습니다.`);
     loadReportList();
   } catch (err) {
-    console.error("handleReport error:", err);
-    alert("신고 처리 중 오류가 발생했습니다.");
+    console.error("handleReports error:", err);
+    alert(`신고 ${actionText} 중 오류가 발생했습니다.`);
   }
 }
 
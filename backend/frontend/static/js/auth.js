@@ -210,18 +210,27 @@ async function loadRecipeList(container) {
         description,
         author_name,
         image_path,
+        image_variants,
         avg_rating,
         like_count,
       } = recipe;
 
+      // 카드 크기 variant(WebP + JPEG)가 만들어져 있으면 원본 대신 사용
+      const cardImage = image_variants && image_variants.card;
+
       const card = document.createElement("article");
       card.className = "recipe-card";
       card.innerHTML = `
         <a href="/recipes/${recipe_id}/" class="recipe-link">
           <div class="recipe-thumb">
             ${
-              image_path
-                ? `<img src="${image_path}" alt="${title}">`
+              cardImage
+                ? `<picture>
+                    <source srcset="${cardImage.webp}" type="image/webp">
+                    <img src="${cardImage.jpeg}" alt="${title}" loading="lazy">
+                  </picture>`
+                : image_path
+                ? `<img src="${image_path}" alt="${title}" loading="lazy">`
                 : `<div class="placeholder-thumb">이미지 없음</div>`
             }
           </div>
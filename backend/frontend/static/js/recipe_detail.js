@@ -21,6 +21,9 @@ document.addEventListener("DOMContentLoaded", () => {
   const commentCountEl = document.getElementById("commentCount");
   const commentInput = document.getElementById("commentInput");
   const commentSubmitBtn = document.getElementById("commentSubmitBtn");
+  const commentMoreBtn = document.getElementById("commentMoreBtn");
+  // 다음 댓글 페이지 URL (루트 댓글 기준 cursor 페이지네이션)
+  let commentNextUrl = null;
 
   // ====== 1) 내 정보 불러오기 (댓글 삭제/표시용) ======
   if (token) {
@@ -55,7 +58,11 @@ document.addEventListener("DOMContentLoaded", () => {
       }
 
       // 대표 이미지
-      if (data.image_path) {
+      const fullImage = data.image_variants && data.image_variants.full;
+      if (fullImage) {
+        // 메타데이터를 지우고 크기를 줄인 variant (원본은 수 MB 일 수 있음)
+        imageEl.src = fullImage.jpeg;
+      } else if (data.image_path) {
         imageEl.src = data.image_path;
       } else {
         imageEl.src = "https://via.placeholder.com/960x400?text=No+Image";
@@ -81,6 +88,7 @@ document.addEventListener("DOMContentLoaded", () => {
         ? `${data.rating_count}명 평가`
         : "0명 평가";
       likeCountEl.textContent = data.like_count ?? 0;
+      setCommentCount(data.comment_count);
 
       // 재료
       ingredientListEl.innerHTML = "";
@@ -116,50 +124,106 @@ document.addEventListener("DOMContentLoaded", () => {
   } // ✅ 누락되었던 함수 닫는 중괄호 추가
 
   // ====== 3) 댓글 목록 불러오기 ======
-  async function loadComments() {
+  // append=false: 첫 페이지부터 다시, append=true: 다음 페이지를 이어 붙임
+  async function loadComments(append = false) {
+    const url = append && commentNextUrl
+      ? commentNextUrl
+      : `/api/recipes/${recipeId}/comments/`;
     try {
-      const res = await fetch(`/api/recipes/${recipeId}/comments/`);
+      const res = await fetch(url);
       const data = await res.json();
       if (!res.ok) {
         console.error("댓글 목록 실패", data);
         return;
       }
 
-      const comments = Array.isArray(data) ? data : data.results || [];
-      commentCountEl.textContent = `(${comments.length})`;
-      commentListEl.innerHTML = "";
-
-      comments.forEach(comment => {
-        const item = document.createElement("div");
-        item.className = "comment-item";
-
-        const canDelete =
-          currentMemberId && comment.author_id === currentMemberId;
-
-        item.innerHTML = `
-          <div class="comment-avatar">👤</div>
-          <div class="comment-body">
-            <div class="comment-meta">
-              <div>
-                <span class="comment-author">${comment.author_name || "익명"}</span>
-                <span class="comment-date">${formatDate(comment.created_at)}</span>
-              </div>
-              ${
-                canDelete
-                  ? `<span class="comment-delete" data-comment-id="${comment.comment_id}">삭제</span>`
-                  : ""
-              }
-            </div>
-            <div class="comment-content">${escapeHtml(comment.content || "")}</div>
-          </div>
-        `;
-        commentListEl.appendChild(item);
-      });
+      // 루트 댓글 스레드 목록 (각 댓글에 replies / reply_count)
+      const threads = Array.isArray(data) ? data : data.results || [];
+      if (!append) commentListEl.innerHTML = "";
+      threads.forEach(comment => renderComment(comment, 0));
+
+      commentNextUrl = data.next || null;
+      if (commentMoreBtn) {
+        commentMoreBtn.style.display = commentNextUrl ? "" : "none";
+      }
+    } catch (err) {
+      console.error(err);
+    }
+  }
+
+  function setCommentCount(count) {
+    commentCountEl.textContent = `(${count ?? 0})`;
+  }
+
+  // 댓글 작성/삭제 후 레시피의 comment_count 다시 읽기
+  async function refreshCommentCount() {
+    try {
+      const res = await fetch(`/api/recipes/${recipeId}/`);
+      if (!res.ok) return;
+      const data = await res.json();
+      setCommentCount(data.comment_count);
     } catch (err) {
       console.error(err);
     }
   }
 
+  function renderComment(comment, depth) {
+    const item = document.createElement("div");
+    item.className = depth > 0 ? "comment-item comment-reply" : "comment-item";
+    item.style.marginLeft = `${Math.min(depth, 4) * 24}px`;
+
+    const canDelete =
+      currentMemberId && comment.author_id === currentMemberId;
+
+    item.innerHTML = `
+      <div class="comment-avatar">👤</div>
+      <div class="comment-body">
+        <div class="comment-meta">
+          <div>
+            <span class="comment-author">${comment.author_name || "익명"}</span>
+            <span class="comment-date">${formatDate(comment.created_at)}</span>
+          </div>
+          <div>
+            <span class="comment-reply-btn" data-comment-id="${comment.comment_id}">답글</span>
+            ${
+              canDelete
+                ? `<span class="comment-delete" data-comment-id="${comment.comment_id}">삭제</span>`
+                : ""
+            }
+          </div>
+        </div>
+        <div class="comment-content">${escapeHtml(comment.content || "")}</div>
+      </div>
+    `;
+    commentListEl.appendChild(item);
+
+    (comment.replies || []).forEach(reply => renderComment(reply, depth + 1));
+  }
+
+  async function postComment(content, parentCommentId) {
+    const token = localStorage.getItem("accessToken");
+    const body = { content };
+    if (parentCommentId) body.parent_comment_id = Number(parentCommentId);
+
+    const res = await fetch(`/api/recipes/${recipeId}/comments/create/`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Authorization: `Bearer ${token}`,
+      },
+      body: JSON.stringify(body),
+    });
+
+    const data = await res.json().catch(() => ({}));
+    if (!res.ok) {
+      console.error("댓글 작성 실패", data);
+      alert("댓글 작성에 실패했습니다.");
+      return false;
+    }
+    if (typeof data.comment_count !== "undefined") setCommentCount(data.comment_count);
+    return true;
+  }
+
   function formatDate(isoString) {
     if (!isoString) return "";
     const d = new Date(isoString);
@@ -201,7 +265,6 @@ document.addEventListener("DOMContentLoaded", () => {
     commentSubmitBtn.addEventListener("click", async () => {
       if (!ensureLoginOrRedirect()) return;
 
-      const token = localStorage.getItem("accessToken");
       const content = commentInput.value.trim();
       if (!content) {
         alert("댓글 내용을 입력해주세요.");
@@ -209,22 +272,7 @@ document.addEventListener("DOMContentLoaded", () => {
       }
 
       try {
-        const res = await fetch(`/api/recipes/${recipeId}/comments/create/`, {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-            Authorization: `Bearer ${token}`,
-          },
-          body: JSON.stringify({ content }),
-        });
-
-        const data = await res.json().catch(() => ({}));
-        if (!res.ok) {
-          console.error("댓글 작성 실패", data);
-          alert("댓글 작성에 실패했습니다.");
-          return;
-        }
-
+        if (!(await postComment(content))) return;
         commentInput.value = "";
         await loadComments();
       } catch (err) {
@@ -236,6 +284,23 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // ====== 5) 댓글 삭제 (내 댓글만) ======
   if (commentListEl) {
+    // 답글 작성
+    commentListEl.addEventListener("click", async (e) => {
+      if (!e.target.classList.contains("comment-reply-btn")) return;
+      if (!ensureLoginOrRedirect()) return;
+
+      const parentCommentId = e.target.dataset.commentId;
+      const content = (prompt("답글을 입력해주세요.") || "").trim();
+      if (!content) return;
+
+      try {
+        if (await postComment(content, parentCommentId)) await loadComments();
+      } catch (err) {
+        console.error(err);
+        alert("서버와 통신 중 오류가 발생했습니다.");
+      }
+    });
+
     commentListEl.addEventListener("click", async (e) => {
       if (!e.target.classList.contains("comment-delete")) return;
       if (!ensureLoginOrRedirect()) return;
@@ -261,7 +326,7 @@ document.addEventListener("DOMContentLoaded", () => {
           return;
         }
 
-        await loadComments();
+        await Promise.all([loadComments(), refreshCommentCount()]);
       } catch (err) {
         console.error(err);
         alert("서버와 통신 중 오류가 발생했습니다.");
@@ -269,6 +334,10 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  if (commentMoreBtn) {
+    commentMoreBtn.addEventListener("click", () => loadComments(true));
+  }
+
   // 브레드크럼 클릭 시 메인으로
   const breadcrumb = document.querySelector(".breadcrumb");
   if (breadcrumb) {
@@ -19,7 +19,12 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 });
 
-async function searchRecipes(keyword) {
+const SEARCH_PAGE_SIZE = 20;
+
+// 지금까지 화면에 그린 결과 수 (더 보기로 이어 붙일 때 누적)
+let searchShownCount = 0;
+
+async function searchRecipes(keyword, nextUrl = null) {
   const resultsContainer = document.getElementById("searchResults");
   const resultCountEl = document.getElementById("searchResultCount");
   const errorEl = document.getElementById("searchError");
@@ -27,34 +32,48 @@ async function searchRecipes(keyword) {
   if (!resultsContainer) return;
 
   if (errorEl) errorEl.textContent = "";
-  if (resultCountEl) resultCountEl.textContent = "";
 
-  // 기본 /api/recipes/ 에 ?search= 키워드 붙여서 사용한다고 가정
-  let url = "/api/recipes/";
-  if (keyword) {
-    const params = new URLSearchParams({ search: keyword });
-    url += "?" + params.toString();
+  // 키워드가 있으면 관련도순 검색 API(/api/recipes/search/?q=), 없으면 최신순 목록(/api/recipes/)
+  // page_size 를 붙여 cursor 페이지네이션 사용, 더 보기일 때는 서버가 준 next URL 을 그대로 따라간다.
+  let url = nextUrl;
+  if (!url) {
+    const params = new URLSearchParams({ page_size: SEARCH_PAGE_SIZE });
+    if (keyword) {
+      params.set("q", keyword);
+      url = "/api/recipes/search/?" + params.toString();
+    } else {
+      url = "/api/recipes/?" + params.toString();
+    }
   }
+  const isFirstPage = !nextUrl;
 
   try {
     const response = await fetch(url);  // 로그인 필요 없음
 
     if (!response.ok) {
       if (errorEl) errorEl.textContent = "레시피 검색에 실패했습니다.";
-      resultsContainer.innerHTML = "";
+      if (isFirstPage) resultsContainer.innerHTML = "";
       return;
     }
 
-    const data = await response.json();
+    const body = await response.json();
+    const data = Array.isArray(body) ? body : body.results || [];
+    const next = Array.isArray(body) ? null : body.next;
+
+    removeLoadMoreButton();
+
+    if (isFirstPage) {
+      resultsContainer.innerHTML = "";
+      searchShownCount = 0;
+    }
 
-    if (!Array.isArray(data) || data.length === 0) {
+    if (isFirstPage && data.length === 0) {
       resultsContainer.innerHTML = "<p>검색 결과가 없습니다.</p>";
       if (resultCountEl) resultCountEl.textContent = "검색 결과 0개";
       return;
     }
 
     // 카드 렌더링 부분만 교체
-resultsContainer.innerHTML = "";
 data.forEach((recipe) => {
   const {
     recipe_id,
@@ -62,12 +81,16 @@ data.forEach((recipe) => {
     description,
     author_name,
     image_path,
+    image_variants,
     avg_rating,
     like_count,
     cooking_time,
     tags,
   } = recipe;
 
+  // 카드 크기 variant(WebP + JPEG)가 만들어져 있으면 원본 대신 사용
+  const cardImage = image_variants && image_variants.card;
+
   // tags가 ["한식", "매운맛"] OR [{name: "한식"}, {name: "매운맛"}] 둘 다 대응
   const tagNames = (tags || [])
     .map((t) => {
@@ -91,8 +114,13 @@ data.forEach((recipe) => {
     <a href="/recipes/${recipe_id}/" class="recipe-link">
       <div class="recipe-thumb">
         ${
-          image_path
-            ? `<img src="${image_path}" alt="${title}">`
+          cardImage
+            ? `<picture>
+                <source srcset="${cardImage.webp}" type="image/webp">
+                <img src="${cardImage.jpeg}" alt="${title}" loading="lazy">
+              </picture>`
+            : image_path
+            ? `<img src="${image_path}" alt="${title}" loading="lazy">`
             : `<div class="placeholder-thumb">이미지 없음</div>`
         }
         <span class="rating-badge">
@@ -127,8 +155,15 @@ data.forEach((recipe) => {
 });
 
 
+    searchShownCount += data.length;
     if (resultCountEl) {
-      resultCountEl.textContent = `검색 결과 ${data.length}개`;
+      resultCountEl.textContent = next
+        ? `검색 결과 ${searchShownCount}개 이상`
+        : `검색 결과 ${searchShownCount}개`;
+    }
+
+    if (next) {
+      appendLoadMoreButton(resultsContainer, () => searchRecipes(keyword, next));
     }
   } catch (err) {
     console.error("Search error:", err);
@@ -137,3 +172,21 @@ data.forEach((recipe) => {
     }
   }
 }
+
+function appendLoadMoreButton(resultsContainer, onClick) {
+  const btn = document.createElement("button");
+  btn.type = "button";
+  btn.id = "searchLoadMore";
+  btn.className = "btn-primary";
+  btn.textContent = "더 보기";
+  btn.addEventListener("click", () => {
+    btn.disabled = true;
+    onClick();
+  });
+  resultsContainer.insertAdjacentElement("afterend", btn);
+}
+
+function removeLoadMoreButton() {
+  const btn = document.getElementById("searchLoadMore");
+  if (btn) btn.remove();
+}
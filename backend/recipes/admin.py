@@ -1,7 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Member, Recipe, Ingredient, Tag, RecipeComment
+from django.db import transaction
+
+from .authentication import invalidate_member
+from .models import Member, Recipe, Ingredient, Tag, RecipeComment, UserSanction
+from .sanctions import invalidate_sanction_cache
 
 
 @admin.register(Member)
@@ -9,6 +13,13 @@ class MemberAdmin(admin.ModelAdmin):
     list_display = ('member_id', 'login_id', 'name', 'role', 'created_at')
     search_fields = ('login_id', 'name')
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # role 이 바뀌면 기존 토큰의 role claim 대신 DB 값을 쓰도록 (커밋 후에 지워야
+        # 그 사이 다른 요청이 옛 role 을 다시 캐시하지 않는다)
+        if change and 'role' in form.changed_data:
+            transaction.on_commit(lambda: invalidate_member(obj.member_id))
+
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
@@ -35,3 +46,34 @@ class RecipeCommentAdmin(admin.ModelAdmin):
     list_display = ('comment_id', 'recipe', 'author', 'created_at')
     search_fields = ('content',)
     raw_id_fields = ('recipe', 'author', 'parent_comment')
+
+
+@admin.register(UserSanction)
+class UserSanctionAdmin(admin.ModelAdmin):
+    list_display = ('sanction_id', 'member', 'sanction', 'start_at', 'end_at', 'created_by', 'created_at')
+    list_filter = ('sanction',)
+    search_fields = ('reason', 'member__login_id', 'member__name')
+    raw_id_fields = ('member', 'created_by')
+
+    @staticmethod
+    def _invalidate(member_ids):
+        # 캐시된 이용 제한 상태 / 인증 정보를 커밋 후에 지운다 (다음 쓰기 요청부터 바로 반영)
+        for member_id in set(member_ids):
+            transaction.on_commit(lambda member_id=member_id: invalidate_sanction_cache(member_id))
+            transaction.on_commit(lambda member_id=member_id: invalidate_member(member_id))
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        member_ids = [obj.member_id]
+        if change and 'member' in form.changed_data and form.initial.get('member'):
+            member_ids.append(form.initial['member'])
+        self._invalidate(member_ids)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._invalidate([obj.member_id])
+
+    def delete_queryset(self, request, queryset):
+        member_ids = list(queryset.values_list('member_id', flat=True))
+        super().delete_queryset(request, queryset)
+        self._invalidate(member_ids)
@@ -1,10 +1,108 @@
 # backend/recipes/authentication.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
 
-from .jwt_utils import decode_jwt
+from .jwt_utils import JWT_EXP_DELTA_DAYS, decode_jwt
 from .models import Member
 
+# True 면 읽기 요청은 토큰 claims(member_id, role)만으로 request.user 를 만들고 DB 를 조회하지 않는다.
+# 무효화 표시(invalidate_member)가 모든 워커에 보여야 하므로 공용 캐시 백엔드가 필요하다 (checks.py).
+JWT_STATELESS_AUTH = getattr(settings, "JWT_STATELESS_AUTH", False)
+MEMBER_CACHE_SIZE = getattr(settings, "JWT_MEMBER_CACHE_SIZE", 1024)
+MEMBER_CACHE_TTL = getattr(settings, "JWT_MEMBER_CACHE_TTL", 60)
+
+
+class MemberCache:
+    """
+    프로세스 내 member 행 캐시 (크기 제한 LRU + TTL).
+    TokenMember 에서 name/login_id 같은 전체 행이 필요할 때만 사용한다.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, member_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(member_id)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(member_id)
+                return copy.copy(entry[1])
+
+        member = Member.objects.filter(member_id=member_id).first()
+        if member is None:
+            return None
+
+        with self._lock:
+            self._data[member_id] = (now + self.ttl, member)
+            self._data.move_to_end(member_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return copy.copy(member)
+
+    def invalidate(self, member_id):
+        with self._lock:
+            self._data.pop(member_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+member_cache = MemberCache(MEMBER_CACHE_SIZE, MEMBER_CACHE_TTL)
+
+
+def _stale_key(member_id):
+    return f"member:stale:{member_id}"
+
+
+def invalidate_member(member_id):
+    """
+    role 변경 / 제재 등으로 토큰 claims 를 더 이상 믿으면 안 될 때 호출.
+    - 프로세스 내 캐시에서 제거
+    - 토큰 유효기간 동안은 claims 대신 DB(→ 캐시) 행으로 인증하도록 표시
+      (공용 캐시 백엔드를 쓰면 다른 프로세스에도 적용된다)
+    """
+    member_cache.invalidate(member_id)
+    cache.set(_stale_key(member_id), True, JWT_EXP_DELTA_DAYS * 24 * 60 * 60)
+
+
+class TokenMember(Member):
+    """
+    JWT claims 로 만든 가벼운 principal.
+    member_id / role 만 채워져 있고 나머지 필드는 deferred 상태라,
+    실제로 접근할 때만 member_cache 를 통해 한 번 채운다.
+    Member 의 proxy 이므로 ORM 필터나 FK 대입에 그대로 쓸 수 있다.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, member_id, role):
+        return cls.from_db(DEFAULT_DB_ALIAS, ["member_id", "role"], [member_id, role])
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        member = member_cache.get(self.member_id)
+        if member is None:
+            raise Member.DoesNotExist("해당 사용자를 찾을 수 없습니다.")
+
+        names = fields or [f.attname for f in self._meta.concrete_fields]
+        for name in names:
+            setattr(self, name, getattr(member, name))
+
 
 class JWTAuthentication(BaseAuthentication):
     keyword = "Bearer"
@@ -28,9 +126,21 @@ class JWTAuthentication(BaseAuthentication):
         if member_id is None:
             raise AuthenticationFailed("토큰에 member_id가 없습니다.")
 
-        try:
-            member = Member.objects.get(member_id=member_id)
-        except Member.DoesNotExist:
+        role = payload.get("role")
+        read_only = request.method in SAFE_METHODS
+        if (JWT_STATELESS_AUTH and read_only and role is not None
+                and not cache.get(_stale_key(member_id))):
+            # 읽기 요청은 DB 조회 없이 claims 로 principal 구성
+            return (TokenMember.from_claims(member_id, role), token)
+
+        # 쓰기 요청은 회원 행이 아직 있는지와 현재 role 을 항상 DB 에서 확인한다
+        # (탈퇴한 회원의 토큰이 FK 오류(500)까지 가지 않고 401 이 되도록).
+        # claims 를 믿을 수 없는 읽기 요청(role 변경/제재 직후 등)은 프로세스 내 캐시를 거친다.
+        if JWT_STATELESS_AUTH and read_only:
+            member = member_cache.get(member_id)
+        else:
+            member = Member.objects.filter(member_id=member_id).first()
+        if member is None:
             raise AuthenticationFailed("해당 사용자를 찾을 수 없습니다.")
 
         return (member, token)
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+RECIPE_DETAIL_CACHE_TIMEOUT = getattr(settings, "RECIPE_DETAIL_CACHE_TIMEOUT", 60 * 10)
+
+
+def _version_key(recipe_id):
+    return f"recipe:detail:version:{recipe_id}"
+
+
+def get_recipe_detail_version(recipe_id):
+    """
+    레시피 상세 캐시 버전. 캐시에서 밀려나 사라진 경우 예전 버전 번호와
+    겹치지 않도록 현재 시각(ns)으로 새로 시작한다.
+    """
+    key = _version_key(recipe_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def recipe_detail_cache_key(recipe_id):
+    """
+    현재 버전이 들어간 상세 payload 캐시 키.
+    DB 에서 읽기 전에 키를 먼저 정해 두어야, 읽는 도중 수정이 커밋돼도
+    옛 데이터가 새 버전 키로 저장되지 않는다.
+    """
+    return f"recipe:detail:{recipe_id}:v{get_recipe_detail_version(recipe_id)}"
+
+
+def bump_recipe_detail_version(recipe_id):
+    """
+    레시피 상세에 보이는 내용(본문/태그/단계/재료/평점)이 바뀌면 호출.
+    트랜잭션 안이면 커밋 후에 버전을 올린다 (커밋 전 데이터가 새 버전으로 캐시되는 것 방지).
+    """
+    def _bump():
+        key = _version_key(recipe_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+    transaction.on_commit(_bump)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+# 워커마다 따로 저장되어 다른 프로세스와 공유되지 않는 캐시 백엔드
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_stateless_auth_cache(app_configs, **kwargs):
+    """
+    JWT_STATELESS_AUTH 는 invalidate_member 의 무효화 표시를 CACHES['default'] 에 남긴다.
+    프로세스별 캐시면 role 변경을 처리한 워커만 알게 되고, 다른 워커는 토큰 유효기간 동안
+    예전 role 을 믿으므로 이 조합으로는 서버가 뜨지 않게 막는다.
+    """
+    if not getattr(settings, "JWT_STATELESS_AUTH", False):
+        return []
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [
+            Error(
+                "JWT_STATELESS_AUTH 를 켜려면 모든 워커가 공유하는 캐시 백엔드가 필요합니다.",
+                hint="CACHE_BACKEND 를 Redis/Memcached 등으로 설정하거나 JWT_STATELESS_AUTH 를 끄세요.",
+                obj="settings.CACHES['default']",
+                id="recipes.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,124 @@
+"""
+팔로우 피드 (GET /api/feed/).
+
+follow → recipe 를 조회 시점에 JOIN 하면 팔로우한 작성자가 많을수록 느려지므로,
+레시피가 작성될 때 팔로워들의 타임라인(feed_entry)에 미리 넣어 둔다 (fan-out-on-write).
+팔로워가 FEED_FANOUT_MAX_FOLLOWERS 보다 많은 작성자는 한 번에 넣을 행이 너무 많아서
+feed_pull_author 에 등록해 두고, 피드 조회 시 그 작성자의 최근 레시피를 직접 읽어 합친다 (pull).
+"""
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import FeedEntry, Follow, Recipe
+
+FEED_FANOUT_MAX_FOLLOWERS = getattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1000)
+# 새로 팔로우했을 때 타임라인에 넣어 줄 그 작성자의 최근 레시피 수
+FEED_FOLLOW_BACKFILL = getattr(settings, "FEED_FOLLOW_BACKFILL", 20)
+
+
+def fan_out_recipe(recipe_id):
+    """
+    레시피를 작성자의 팔로워 타임라인에 넣는다 (INSERT ... SELECT 한 문장).
+    팔로워가 너무 많은 작성자는 pull 대상으로 등록만 한다.
+    반환: 넣은 행 수
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT r.author_id,
+                   EXISTS (SELECT 1 FROM feed_pull_author p WHERE p.member_id = r.author_id),
+                   (SELECT count(*) FROM (
+                        SELECT 1 FROM follow f WHERE f.followee_id = r.author_id LIMIT %s
+                    ) limited)
+            FROM recipe r
+            WHERE r.recipe_id = %s
+            """,
+            [FEED_FANOUT_MAX_FOLLOWERS + 1, recipe_id],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return 0
+        author_id, is_pull_author, followers = row
+
+        if is_pull_author:
+            return 0
+        if followers > FEED_FANOUT_MAX_FOLLOWERS:
+            cursor.execute(
+                """
+                INSERT INTO feed_pull_author (member_id, since) VALUES (%s, now())
+                ON CONFLICT (member_id) DO NOTHING
+                """,
+                [author_id],
+            )
+            return 0
+
+        cursor.execute(
+            """
+            INSERT INTO feed_entry (member_id, recipe_id, author_id, created_at)
+            SELECT f.follower_id, r.recipe_id, r.author_id, r.created_at
+            FROM recipe r
+            JOIN follow f ON f.followee_id = r.author_id
+            WHERE r.recipe_id = %s
+            ON CONFLICT (member_id, recipe_id) DO NOTHING
+            """,
+            [recipe_id],
+        )
+        return cursor.rowcount
+
+
+def schedule_fan_out(recipe_id):
+    """레시피 작성 트랜잭션이 커밋된 뒤 fan-out (롤백되면 아무것도 하지 않음)."""
+    transaction.on_commit(lambda: fan_out_recipe(recipe_id))
+
+
+def follow_added(follower_id, followee_id):
+    """새로 팔로우한 작성자의 최근 레시피를 타임라인에 채운다 (pull 대상 작성자는 조회 시 읽으므로 생략)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO feed_entry (member_id, recipe_id, author_id, created_at)
+            SELECT %s, r.recipe_id, r.author_id, r.created_at
+            FROM recipe r
+            WHERE r.author_id = %s
+              AND NOT EXISTS (SELECT 1 FROM feed_pull_author p WHERE p.member_id = r.author_id)
+            ORDER BY r.created_at DESC NULLS LAST, r.recipe_id DESC
+            LIMIT %s
+            ON CONFLICT (member_id, recipe_id) DO NOTHING
+            """,
+            [follower_id, followee_id, FEED_FOLLOW_BACKFILL],
+        )
+
+
+def follow_removed(follower_id, followee_id):
+    """언팔로우한 작성자의 레시피를 타임라인에서 뺀다."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM feed_entry WHERE member_id = %s AND author_id = %s",
+            [follower_id, followee_id],
+        )
+
+
+def feed_queryset(member, ordering=("-created_at", "-recipe_id"), predicate=None, limit=None):
+    """
+    member 의 피드 레시피 queryset.
+    - 타임라인: feed_entry (member_id, created_at, recipe_id) 인덱스
+    - pull: 팔로우한 pull 대상 작성자의 레시피 (recipe (author_id, created_at) 인덱스)
+    페이지 조회에서는 cursor 의 seek 조건(predicate, created_at / recipe_id 기준)과 정렬, LIMIT 을
+    두 subquery 에 각각 넣는다. 각각 limit 개만 읽고 그 recipe_id 만 합쳐서 recipe 를 읽으므로
+    피드가 아무리 길어도, 몇 번째 페이지든 읽는 양이 페이지 크기로 제한된다.
+    """
+    timeline = FeedEntry.objects.filter(member=member)
+    pulled = Recipe.objects.filter(
+        author__in=Follow.objects
+        .filter(follower=member, followee__feed_pull__isnull=False)
+        .values("followee")
+    )
+    if predicate is not None:
+        timeline = timeline.filter(predicate)
+        pulled = pulled.filter(predicate)
+    timeline = timeline.order_by(*ordering).values("recipe_id")
+    pulled = pulled.order_by(*ordering).values("recipe_id")
+    if limit is not None:
+        timeline = timeline[:limit]
+        pulled = pulled[:limit]
+    return Recipe.objects.filter(pk__in=timeline.union(pulled)).order_by(*ordering)
@@ -0,0 +1,65 @@
+from django.db.models import Count, Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import RecipeTag
+
+
+def parse_tag_ids(request):
+    raw = request.query_params.get(TagFilterBackend.tags_query_param)
+    if not raw:
+        return []
+    try:
+        return sorted({int(part) for part in raw.split(",") if part.strip()})
+    except ValueError:
+        raise ValidationError({"tags": "태그 id 를 쉼표로 구분해 입력해주세요. (예: 1,2,3)"})
+
+
+class TagFilterBackend(BaseFilterBackend):
+    """
+    ?tags=1,2,3&tag_mode=and|or
+    - and (기본): 모든 태그가 달린 레시피
+    - or: 하나라도 달린 레시피
+    recipe_tag (tag_id, recipe_id) 인덱스만으로 처리되도록 서브쿼리로 건다.
+    """
+    tags_query_param = "tags"
+    mode_query_param = "tag_mode"
+
+    def filter_queryset(self, request, queryset, view):
+        tag_ids = parse_tag_ids(request)
+        if not tag_ids:
+            return queryset
+
+        mode = request.query_params.get(self.mode_query_param, "and").lower()
+        if mode == "or":
+            return queryset.filter(
+                Exists(RecipeTag.objects.filter(recipe=OuterRef("pk"), tag_id__in=tag_ids))
+            )
+
+        matching = (
+            RecipeTag.objects
+            .filter(tag_id__in=tag_ids)
+            .values("recipe")
+            .annotate(n=Count("tag", distinct=True))
+            .filter(n=len(tag_ids))
+            .values("recipe")
+        )
+        return queryset.filter(pk__in=matching)
+
+
+def tag_facets(queryset):
+    """
+    queryset(필터 적용 후) 전체 결과에 대한 태그별 레시피 수.
+    태그마다 COUNT 를 따로 세지 않고 GROUP BY 한 번으로 계산한다.
+    """
+    rows = (
+        RecipeTag.objects
+        .filter(recipe__in=queryset.order_by().values("pk"))
+        .values("tag_id", "tag__name")
+        .annotate(count=Count("recipe"))
+        .order_by("-count", "tag__name")
+    )
+    return [
+        {"tag_id": row["tag_id"], "name": row["tag__name"], "count": row["count"]}
+        for row in rows
+    ]
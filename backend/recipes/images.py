@@ -0,0 +1,148 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+
+from .cache import bump_recipe_detail_version
+from .models import Recipe
+
+logger = logging.getLogger(__name__)
+
+# 이름 → (가로, 세로, 방식). crop: 비율 맞춰 가운데 잘라 정확히 그 크기 / fit: 비율 유지하며 그 안에 들어가게 축소
+RECIPE_IMAGE_VARIANTS = getattr(
+    settings,
+    "RECIPE_IMAGE_VARIANTS",
+    {
+        "thumb": (160, 160, "crop"),
+        "card": (480, 360, "crop"),
+        "full": (1600, 1600, "fit"),
+    },
+)
+RECIPE_IMAGE_WORKERS = getattr(settings, "RECIPE_IMAGE_WORKERS", 2)
+RECIPE_IMAGE_QUALITY = getattr(settings, "RECIPE_IMAGE_QUALITY", 82)
+
+# 저장 형식: WebP 를 기본으로, 지원하지 않는 브라우저용 JPEG 를 같이 만든다
+_FORMATS = (
+    ("webp", "WEBP", {"method": 4}),
+    ("jpeg", "JPEG", {"optimize": True, "progressive": True}),
+)
+
+
+def _storage_name(image_path):
+    """'/media/recipes/abc.png' → 'recipes/abc.png' (default_storage 기준 이름)"""
+    prefix = settings.MEDIA_URL
+    if image_path.startswith(prefix):
+        return image_path[len(prefix):]
+    return image_path.lstrip("/")
+
+
+def build_variants(image_path):
+    """
+    원본 이미지로 크기별 WebP/JPEG 파일을 만들어 저장한다.
+    EXIF 방향은 픽셀에 반영하고, EXIF/ICC 등 메타데이터는 저장하지 않는다(위치 정보 제거).
+    반환: {"thumb": {"webp": url, "jpeg": url}, "card": {...}, "full": {...}}
+    """
+    from PIL import Image, ImageOps
+
+    name = _storage_name(image_path)
+    stem = os.path.splitext(os.path.basename(name))[0]
+    directory = os.path.join(os.path.dirname(name), "variants")
+
+    with default_storage.open(name, "rb") as f:
+        with Image.open(f) as original:
+            original = ImageOps.exif_transpose(original)
+            if original.mode not in ("RGB", "L"):
+                # 투명 배경은 흰색으로 (JPEG 에 알파 채널이 없으므로 두 형식 결과를 맞춤)
+                rgba = original.convert("RGBA")
+                original = Image.new("RGB", rgba.size, (255, 255, 255))
+                original.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                original = original.convert("RGB")
+
+    variants = {}
+    for variant, (width, height, mode) in RECIPE_IMAGE_VARIANTS.items():
+        if mode == "crop":
+            resized = ImageOps.fit(original, (width, height), Image.Resampling.LANCZOS)
+        else:
+            resized = original.copy()
+            resized.thumbnail((width, height), Image.Resampling.LANCZOS)
+
+        variants[variant] = {}
+        for ext, image_format, options in _FORMATS:
+            # 원본은 내용 해시 이름이므로 같은 이름/크기의 variant 가 이미 있으면 그대로 쓴다
+            name = os.path.join(directory, f"{stem}_{variant}_{width}x{height}.{ext}")
+            if not default_storage.exists(name):
+                buffer = io.BytesIO()
+                resized.save(buffer, image_format, quality=RECIPE_IMAGE_QUALITY, **options)
+                name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            variants[variant][ext] = default_storage.url(name)
+    return variants
+
+
+def process_recipe_image(recipe_id, image_path):
+    """
+    variant 를 만들어 recipe.image_variants 에 기록한다.
+    그 사이 이미지가 바뀌었으면(image_path 가 다르면) 기록하지 않는다.
+    """
+    try:
+        variants = build_variants(image_path)
+    except Exception:
+        logger.exception("레시피 %s 이미지 변환 실패: %s", recipe_id, image_path)
+        return None
+
+    updated = (
+        Recipe.objects
+        .filter(pk=recipe_id, image_path=image_path)
+        .update(image_variants=variants)
+    )
+    if updated:
+        bump_recipe_detail_version(recipe_id)
+    return variants
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=RECIPE_IMAGE_WORKERS,
+                    thread_name_prefix="recipe-image",
+                )
+    return _executor
+
+
+def _run_in_worker(recipe_id, image_path):
+    # 워커 스레드는 요청 사이클 밖이라 DB 연결을 직접 정리해야 한다
+    close_old_connections()
+    try:
+        return process_recipe_image(recipe_id, image_path)
+    finally:
+        connection.close()
+
+
+def schedule_recipe_image(recipe_id, image_path):
+    """
+    커밋 후 워커 풀에서 variant 생성 (요청 스레드는 원본 저장까지만 한다).
+    RECIPE_IMAGE_WORKERS = 0 이면 커밋 직후 같은 스레드에서 처리한다.
+    """
+    if not image_path:
+        return
+
+    def _submit():
+        if RECIPE_IMAGE_WORKERS:
+            _get_executor().submit(_run_in_worker, recipe_id, image_path)
+        else:
+            process_recipe_image(recipe_id, image_path)
+
+    transaction.on_commit(_submit)
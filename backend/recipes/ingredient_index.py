@@ -0,0 +1,170 @@
+import heapq
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .models import Ingredient, RecipeIngredient
+
+# 인덱스 버전(ingredient_index_version_seq)을 다시 확인하기까지 최소 간격(초).
+# 이 시간 동안은 쿼리 없이 메모리 인덱스를 쓰므로 재료 변경이 이만큼 늦게 반영될 수 있다.
+INGREDIENT_INDEX_MIN_REBUILD_INTERVAL = getattr(
+    settings, "INGREDIENT_INDEX_MIN_REBUILD_INTERVAL", 30
+)
+# 버전이 그대로여도 이보다 오래된 인덱스는 다시 만든다 (트리거 밖의 변경 대비)
+INGREDIENT_INDEX_MAX_AGE = getattr(settings, "INGREDIENT_INDEX_MAX_AGE", 60 * 60)
+# True 면 오래된 인덱스를 그대로 응답하고 백그라운드 스레드에서 다시 만든다.
+# False 면 요청 스레드에서 바로 다시 만든다 (테스트용).
+INGREDIENT_INDEX_BACKGROUND_REBUILD = getattr(settings, "INGREDIENT_INDEX_BACKGROUND_REBUILD", True)
+
+
+def normalize_ingredient_name(name):
+    return " ".join((name or "").split()).lower()
+
+
+class IngredientIndex:
+    """
+    "냉장고 재료로 만들 수 있는 레시피" 검색용 역색인 (프로세스 메모리).
+
+    - postings: ingredient_id → 그 재료를 쓰는 recipe_id 배열
+    - recipe_ingredients: recipe_id → 필요한 ingredient_id 배열
+    - ingredient_ids: 정규화한 재료 이름 → ingredient_id
+
+    질의는 가진 재료들의 postings 만 훑어 레시피별 일치 개수를 세므로
+    레시피 수가 아니라 해당 재료를 쓰는 레시피 수에 비례한다.
+    """
+
+    def __init__(self, postings, recipe_ingredients, ingredient_names, version):
+        self.postings = postings
+        self.recipe_ingredients = recipe_ingredients
+        self.ingredient_names = ingredient_names
+        self.ingredient_ids = {
+            normalize_ingredient_name(name): ingredient_id
+            for ingredient_id, name in ingredient_names.items()
+        }
+        self.version = version
+        self.built_at = time.monotonic()
+        # 마지막으로 DB 버전을 확인한 시각
+        self.checked_at = self.built_at
+
+    @classmethod
+    def build(cls, version=None):
+        postings = defaultdict(lambda: array("i"))
+        recipe_ingredients = defaultdict(lambda: array("i"))
+        rows = RecipeIngredient.objects.values_list("recipe_id", "ingredient_id").iterator()
+        for recipe_id, ingredient_id in rows:
+            postings[ingredient_id].append(recipe_id)
+            recipe_ingredients[recipe_id].append(ingredient_id)
+
+        ingredient_names = dict(Ingredient.objects.values_list("ingredient_id", "name"))
+        return cls(dict(postings), dict(recipe_ingredients), ingredient_names, version)
+
+    def resolve(self, names):
+        """재료 이름 목록 → (ingredient_id 집합, 모르는 이름 목록)"""
+        ids, unknown = set(), []
+        for name in names:
+            ingredient_id = self.ingredient_ids.get(normalize_ingredient_name(name))
+            if ingredient_id is None:
+                unknown.append(name)
+            else:
+                ids.add(ingredient_id)
+        return ids, unknown
+
+    def match(self, ingredient_ids, limit):
+        """
+        가진 재료로 커버되는 비율이 높은 순 → 부족한 재료 수가 적은 순 → 최신(recipe_id 큰) 순.
+        반환: [(recipe_id, matched, total, missing_ingredient_ids)]
+        """
+        matched = defaultdict(int)
+        for ingredient_id in ingredient_ids:
+            for recipe_id in self.postings.get(ingredient_id, ()):
+                matched[recipe_id] += 1
+
+        def sort_key(item):
+            recipe_id, count = item
+            total = len(self.recipe_ingredients[recipe_id])
+            return (count / total, -(total - count), recipe_id)
+
+        top = heapq.nlargest(limit, matched.items(), key=sort_key)
+        return [
+            (
+                recipe_id,
+                count,
+                len(self.recipe_ingredients[recipe_id]),
+                [i for i in self.recipe_ingredients[recipe_id] if i not in ingredient_ids],
+            )
+            for recipe_id, count in top
+        ]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def current_version():
+    """DB 의 인덱스 버전 (트리거가 nextval 로 올린다. last_value 읽기는 잠금이 없다)"""
+    with connection.cursor() as cursor:
+        # nextval 을 한 번도 안 불렀으면 last_value 가 시작값(1)이므로 0 으로 본다
+        cursor.execute(
+            "SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM ingredient_index_version_seq"
+        )
+        return cursor.fetchone()[0]
+
+
+def _rebuild(version):
+    """_lock 을 잡은 상태에서 호출. 다 만든 뒤 한 번에 교체한다."""
+    global _index
+    try:
+        _index = IngredientIndex.build(version)
+    finally:
+        _lock.release()
+
+
+def _rebuild_in_worker(version):
+    # 요청 사이클 밖의 스레드라 DB 연결을 직접 정리해야 한다
+    close_old_connections()
+    try:
+        _rebuild(version)
+    finally:
+        connection.close()
+
+
+def get_ingredient_index():
+    """
+    현재 프로세스의 인덱스.
+    - 마지막 확인 후 INGREDIENT_INDEX_MIN_REBUILD_INTERVAL 안이면 쿼리 없이 그대로
+    - 그 뒤로는 DB 버전을 한 번 읽고, 버전이 바뀌었거나 INGREDIENT_INDEX_MAX_AGE 가 지났으면 다시 만든다.
+      이미 인덱스가 있으면 기존 인덱스로 응답하고 백그라운드에서 만든다 (이미 만드는 중이면 건너뜀).
+    """
+    global _index
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - index.checked_at < INGREDIENT_INDEX_MIN_REBUILD_INTERVAL:
+        return index
+
+    version = current_version()
+    if index is not None and index.version == version and now - index.built_at < INGREDIENT_INDEX_MAX_AGE:
+        index.checked_at = now
+        return index
+
+    if index is None:
+        # 처음 한 번은 만들어질 때까지 기다린다
+        with _lock:
+            if _index is None:
+                _index = IngredientIndex.build(version)
+            return _index
+
+    index.checked_at = now
+    if _lock.acquire(blocking=False):
+        if INGREDIENT_INDEX_BACKGROUND_REBUILD:
+            threading.Thread(
+                target=_rebuild_in_worker, args=(version,),
+                name="ingredient-index", daemon=True,
+            ).start()
+        else:
+            _rebuild(version)
+            return _index
+    return index
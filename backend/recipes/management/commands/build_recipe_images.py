@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from recipes.images import process_recipe_image
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = "이미지 variant(썸네일/카드/큰 이미지)가 없는 레시피의 variant 를 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="이미 variant 가 있는 레시피도 다시 생성",
+        )
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(image_path__isnull=True).exclude(image_path="")
+        if not options["all"]:
+            recipes = recipes.filter(image_variants__isnull=True)
+
+        done = failed = 0
+        for recipe_id, image_path in recipes.values_list("recipe_id", "image_path").iterator():
+            if process_recipe_image(recipe_id, image_path) is None:
+                failed += 1
+            else:
+                done += 1
+        self.stdout.write(self.style.SUCCESS(f"variant 생성 {done}건, 실패 {failed}건"))
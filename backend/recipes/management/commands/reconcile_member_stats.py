@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from recipes.models import Member
+from recipes.queries import reconcile_member_stats
+
+
+class Command(BaseCommand):
+    help = "member_stats(회원별 레시피 수/받은 좋아요/받은 평점)를 원본 테이블로 다시 계산해 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="한 트랜잭션에서 다시 계산할 member_id 범위 크기 (기본 1000)",
+        )
+
+    def handle(self, *args, **options):
+        bounds = Member.objects.aggregate(first=Min("member_id"), last=Max("member_id"))
+        if bounds["first"] is None:
+            self.stdout.write("회원이 없습니다.")
+            return
+
+        batch_size = max(options["batch_size"], 1)
+        fixed = 0
+        # member_id 구간별로 나눠서 한 번에 잠그는 행 수를 제한한다
+        for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+            with transaction.atomic():
+                fixed += reconcile_member_stats(start, start + batch_size - 1)
+        self.stdout.write(self.style.SUCCESS(f"member_stats 갱신 완료: {fixed}건 수정"))
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.queries import refresh_popularity
+
+
+class Command(BaseCommand):
+    help = "인기 레시피 스냅샷(mv_recipe_popularity)을 갱신합니다. --loop 로 주기 실행 가능."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="종료하지 않고 --interval 초마다 계속 갱신",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=getattr(settings, "POPULAR_RECIPES_REFRESH_INTERVAL", 300),
+            help="--loop 갱신 간격(초), 기본값은 settings.POPULAR_RECIPES_REFRESH_INTERVAL",
+        )
+        parser.add_argument(
+            "--blocking",
+            action="store_true",
+            help="CONCURRENTLY 없이 갱신 (더 빠르지만 갱신 중 조회가 대기)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            refresh_popularity(concurrently=not options["blocking"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"mv_recipe_popularity 갱신 완료 ({time.monotonic() - started:.2f}s)"
+                )
+            )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.trending import update_trending
+
+
+class Command(BaseCommand):
+    help = "트렌딩 점수(recipe_trending)를 증분 갱신합니다. --loop 로 주기 실행 가능."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="종료하지 않고 --interval 초마다 계속 갱신",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=getattr(settings, "TRENDING_UPDATE_INTERVAL", 60),
+            help="--loop 갱신 간격(초), 기본값은 settings.TRENDING_UPDATE_INTERVAL",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="윈도우 안의 이벤트로 점수를 처음부터 다시 계산 (관리자 화면 등에서 지운 이벤트 정리)",
+        )
+        parser.add_argument(
+            "--rebuild-every",
+            type=int,
+            default=getattr(settings, "TRENDING_REBUILD_INTERVAL", 6 * 60 * 60),
+            help="--loop 에서 이 간격(초)마다 처음부터 다시 계산, 0 이면 하지 않음. "
+                 "기본값은 settings.TRENDING_REBUILD_INTERVAL",
+        )
+
+    def handle(self, *args, **options):
+        rebuild = options["rebuild"]
+        rebuilt_at = None
+        while True:
+            started = time.monotonic()
+            if (
+                options["loop"] and options["rebuild_every"] > 0
+                and (rebuilt_at is None or started - rebuilt_at >= options["rebuild_every"])
+            ):
+                rebuild = True
+            processed_until = update_trending(rebuild=rebuild)
+            if rebuild:
+                rebuilt_at = started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"recipe_trending 갱신 완료: {processed_until:%Y-%m-%d %H:%M:%S} 까지 "
+                    f"({time.monotonic() - started:.2f}s)"
+                )
+            )
+            if not options["loop"]:
+                return
+            rebuild = False
+            time.sleep(options["interval"])
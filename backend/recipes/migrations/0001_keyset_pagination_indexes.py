@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    keyset 페이지네이션용 인덱스.
+    모델은 managed=False 이므로 테이블 대신 정렬 키와 같은 순서의 인덱스만 추가한다.
+    """
+
+    dependencies = []
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS recipe_created_at_id_idx
+                    ON recipe (created_at DESC, recipe_id DESC);
+                CREATE INDEX IF NOT EXISTS recipe_author_created_at_id_idx
+                    ON recipe (author_id, created_at DESC, recipe_id DESC);
+                CREATE INDEX IF NOT EXISTS recipe_like_member_liked_at_idx
+                    ON recipe_like (member_id, liked_at DESC, recipe_id DESC);
+                CREATE INDEX IF NOT EXISTS recipe_comment_recipe_created_at_idx
+                    ON recipe_comment (recipe_id, created_at, comment_id);
+                CREATE INDEX IF NOT EXISTS report_status_created_at_id_idx
+                    ON report (status, created_at DESC, report_id DESC);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS recipe_created_at_id_idx;
+                DROP INDEX IF EXISTS recipe_author_created_at_id_idx;
+                DROP INDEX IF EXISTS recipe_like_member_liked_at_idx;
+                DROP INDEX IF EXISTS recipe_comment_recipe_created_at_idx;
+                DROP INDEX IF EXISTS report_status_created_at_id_idx;
+            """,
+        ),
+    ]
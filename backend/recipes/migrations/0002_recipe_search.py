@@ -0,0 +1,150 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    레시피 검색용 recipe_search 테이블.
+    - document: 제목(A) / 태그·재료 이름(B) / 설명(C) 가중치 tsvector
+    - search_text: 같은 내용을 이어 붙인 텍스트 (pg_trgm 부분 일치용)
+    recipe / recipe_tag / recipe_ingredient / tag / ingredient 변경 시 트리거로 갱신한다.
+    한국어 형태소 사전이 없으므로 'simple' 설정을 쓰고, 부분 일치는 trigram 으로 보완한다.
+    """
+
+    dependencies = [
+        ('recipes', '0001_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+                CREATE TABLE IF NOT EXISTS recipe_search (
+                    recipe_id   integer PRIMARY KEY REFERENCES recipe (recipe_id) ON DELETE CASCADE,
+                    document    tsvector NOT NULL,
+                    search_text text NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS recipe_search_document_idx
+                    ON recipe_search USING gin (document);
+                CREATE INDEX IF NOT EXISTS recipe_search_text_trgm_idx
+                    ON recipe_search USING gin (search_text gin_trgm_ops);
+
+                -- 주어진 레시피들의 검색 문서를 한 번에 다시 만든다
+                CREATE OR REPLACE FUNCTION refresh_recipe_search(recipe_ids integer[])
+                RETURNS void LANGUAGE sql AS $$
+                    INSERT INTO recipe_search (recipe_id, document, search_text)
+                    SELECT r.recipe_id,
+                           setweight(to_tsvector('simple', coalesce(r.title, '')), 'A')
+                           || setweight(to_tsvector('simple', coalesce(t.names, '')), 'B')
+                           || setweight(to_tsvector('simple', coalesce(i.names, '')), 'B')
+                           || setweight(to_tsvector('simple', coalesce(r.description, '')), 'C'),
+                           concat_ws(' ', r.title, t.names, i.names, r.description)
+                    FROM recipe r
+                    LEFT JOIN LATERAL (
+                        SELECT string_agg(tag.name, ' ') AS names
+                        FROM recipe_tag rt JOIN tag ON tag.tag_id = rt.tag_id
+                        WHERE rt.recipe_id = r.recipe_id
+                    ) t ON true
+                    LEFT JOIN LATERAL (
+                        SELECT string_agg(ing.name, ' ') AS names
+                        FROM recipe_ingredient ri JOIN ingredient ing ON ing.ingredient_id = ri.ingredient_id
+                        WHERE ri.recipe_id = r.recipe_id
+                    ) i ON true
+                    WHERE r.recipe_id = ANY (recipe_ids)
+                    ON CONFLICT (recipe_id) DO UPDATE
+                        SET document = EXCLUDED.document,
+                            search_text = EXCLUDED.search_text;
+                $$;
+
+                -- recipe / recipe_tag / recipe_ingredient: 변경된 행의 recipe_id 기준 (문장 단위)
+                CREATE OR REPLACE FUNCTION recipe_search_rows_changed()
+                RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM refresh_recipe_search(array(SELECT DISTINCT recipe_id FROM changed_rows));
+                    RETURN NULL;
+                END;
+                $$;
+
+                -- recipe 제목/설명 변경 (평점·카운터 갱신 같은 다른 UPDATE 에는 반응하지 않도록 행 단위 + WHEN)
+                CREATE OR REPLACE FUNCTION recipe_search_recipe_updated()
+                RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM refresh_recipe_search(ARRAY[NEW.recipe_id]);
+                    RETURN NULL;
+                END;
+                $$;
+
+                -- tag 이름 변경: 해당 태그가 달린 레시피 전체
+                CREATE OR REPLACE FUNCTION recipe_search_tag_renamed()
+                RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM refresh_recipe_search(array(
+                        SELECT recipe_id FROM recipe_tag WHERE tag_id = NEW.tag_id
+                    ));
+                    RETURN NULL;
+                END;
+                $$;
+
+                -- ingredient 이름 변경: 해당 재료를 쓰는 레시피 전체
+                CREATE OR REPLACE FUNCTION recipe_search_ingredient_renamed()
+                RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM refresh_recipe_search(array(
+                        SELECT recipe_id FROM recipe_ingredient WHERE ingredient_id = NEW.ingredient_id
+                    ));
+                    RETURN NULL;
+                END;
+                $$;
+
+                CREATE TRIGGER recipe_search_recipe_ins AFTER INSERT ON recipe
+                    REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION recipe_search_rows_changed();
+                CREATE TRIGGER recipe_search_recipe_upd AFTER UPDATE OF title, description ON recipe
+                    FOR EACH ROW
+                    WHEN (OLD.title IS DISTINCT FROM NEW.title
+                          OR OLD.description IS DISTINCT FROM NEW.description)
+                    EXECUTE FUNCTION recipe_search_recipe_updated();
+
+                CREATE TRIGGER recipe_search_tag_link_ins AFTER INSERT ON recipe_tag
+                    REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION recipe_search_rows_changed();
+                CREATE TRIGGER recipe_search_tag_link_del AFTER DELETE ON recipe_tag
+                    REFERENCING OLD TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION recipe_search_rows_changed();
+
+                CREATE TRIGGER recipe_search_ingredient_link_ins AFTER INSERT ON recipe_ingredient
+                    REFERENCING NEW TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION recipe_search_rows_changed();
+                CREATE TRIGGER recipe_search_ingredient_link_del AFTER DELETE ON recipe_ingredient
+                    REFERENCING OLD TABLE AS changed_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION recipe_search_rows_changed();
+
+                CREATE TRIGGER recipe_search_tag_upd AFTER UPDATE OF name ON tag
+                    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+                    EXECUTE FUNCTION recipe_search_tag_renamed();
+                CREATE TRIGGER recipe_search_ingredient_upd AFTER UPDATE OF name ON ingredient
+                    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+                    EXECUTE FUNCTION recipe_search_ingredient_renamed();
+
+                -- 기존 레시피 채우기
+                SELECT refresh_recipe_search(array(SELECT recipe_id FROM recipe));
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS recipe_search_recipe_ins ON recipe;
+                DROP TRIGGER IF EXISTS recipe_search_recipe_upd ON recipe;
+                DROP TRIGGER IF EXISTS recipe_search_tag_link_ins ON recipe_tag;
+                DROP TRIGGER IF EXISTS recipe_search_tag_link_del ON recipe_tag;
+                DROP TRIGGER IF EXISTS recipe_search_ingredient_link_ins ON recipe_ingredient;
+                DROP TRIGGER IF EXISTS recipe_search_ingredient_link_del ON recipe_ingredient;
+                DROP TRIGGER IF EXISTS recipe_search_tag_upd ON tag;
+                DROP TRIGGER IF EXISTS recipe_search_ingredient_upd ON ingredient;
+                DROP FUNCTION IF EXISTS recipe_search_rows_changed();
+                DROP FUNCTION IF EXISTS recipe_search_recipe_updated();
+                DROP FUNCTION IF EXISTS recipe_search_tag_renamed();
+                DROP FUNCTION IF EXISTS recipe_search_ingredient_renamed();
+                DROP FUNCTION IF EXISTS refresh_recipe_search(integer[]);
+                DROP TABLE IF EXISTS recipe_search;
+            """,
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    태그 필터 / 태그별 개수(facet) 집계용 recipe_tag (tag_id, recipe_id) 인덱스.
+    """
+
+    dependencies = [
+        ('recipes', '0002_recipe_search'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS recipe_tag_tag_recipe_idx
+                    ON recipe_tag (tag_id, recipe_id);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS recipe_tag_tag_recipe_idx;
+            """,
+        ),
+    ]
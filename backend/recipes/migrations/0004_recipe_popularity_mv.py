@@ -0,0 +1,54 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    인기 레시피 목록용 materialized view.
+    v_recipe_summary 를 매 요청마다 집계하지 않고 주기적으로 스냅샷을 떠 두고
+    (manage.py refresh_popular_recipes), 정렬 순서와 같은 인덱스로 바로 읽는다.
+    스냅샷 시각은 행 1개짜리 popularity_refresh_state 에 따로 둔다 (refresh_popularity 가 갱신).
+    MV 의 모든 행에 now() 를 넣으면 REFRESH 때마다 모든 행이 달라져서
+    REFRESH ... CONCURRENTLY 가 바뀐 행만이 아니라 전체를 다시 쓴다.
+    """
+
+    dependencies = [
+        ('recipes', '0003_recipe_tag_facet_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS mv_recipe_popularity AS
+                SELECT s.recipe_id,
+                       s.title,
+                       s.description,
+                       s.cooking_time,
+                       s.avg_score,
+                       s.rating_count,
+                       s.like_count,
+                       s.comment_count
+                FROM v_recipe_summary s
+                WITH DATA;
+
+                -- REFRESH ... CONCURRENTLY 에 필요한 유일 인덱스
+                CREATE UNIQUE INDEX IF NOT EXISTS mv_recipe_popularity_pk
+                    ON mv_recipe_popularity (recipe_id);
+                -- PopularRecipeListAPIView 정렬 순서와 동일 → 인덱스 스캔 + LIMIT
+                CREATE INDEX IF NOT EXISTS mv_recipe_popularity_rank_idx
+                    ON mv_recipe_popularity (
+                        like_count DESC, avg_score DESC, rating_count DESC,
+                        comment_count DESC, recipe_id DESC
+                    );
+
+                -- 행이 없으면 스냅샷 시각을 모르는 것으로 보고 v_recipe_summary 를 직접 읽는다
+                CREATE TABLE IF NOT EXISTS popularity_refresh_state (
+                    id           smallint PRIMARY KEY CHECK (id = 1),
+                    refreshed_at timestamptz NOT NULL
+                );
+            """,
+            reverse_sql="""
+                DROP TABLE IF EXISTS popularity_refresh_state;
+                DROP MATERIALIZED VIEW IF EXISTS mv_recipe_popularity;
+            """,
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    트렌딩 점수 테이블 (recipes/trending.py, manage.py update_trending 이 유지).
+    - recipe_trending.score: 기준 시각(trending_state.epoch) 기준으로 환산한 감쇠 점수 합
+    - trending_state: 기준 시각 / 어디까지 이벤트를 반영했는지 (행 1개)
+    """
+
+    dependencies = [
+        ('recipes', '0004_recipe_popularity_mv'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS recipe_trending (
+                    recipe_id integer PRIMARY KEY REFERENCES recipe (recipe_id) ON DELETE CASCADE,
+                    score     double precision NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS recipe_trending_score_idx
+                    ON recipe_trending (score DESC, recipe_id DESC);
+
+                CREATE TABLE IF NOT EXISTS trending_state (
+                    id              smallint PRIMARY KEY CHECK (id = 1),
+                    epoch           timestamptz NOT NULL,
+                    processed_until timestamptz NOT NULL
+                );
+
+                -- 구간 스캔용 이벤트 시각 인덱스
+                CREATE INDEX IF NOT EXISTS recipe_like_liked_at_idx ON recipe_like (liked_at);
+                CREATE INDEX IF NOT EXISTS rating_created_at_idx ON rating (created_at);
+                CREATE INDEX IF NOT EXISTS recipe_comment_created_at_idx ON recipe_comment (created_at);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS recipe_like_liked_at_idx;
+                DROP INDEX IF EXISTS rating_created_at_idx;
+                DROP INDEX IF EXISTS recipe_comment_created_at_idx;
+                DROP TABLE IF EXISTS trending_state;
+                DROP TABLE IF EXISTS recipe_trending;
+            """,
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    recipe.like_count: 좋아요 수 비정규화 컬럼.
+    목록/상세에서 recipe_like 를 COUNT 하지 않도록 recipe 행에 같이 둔다.
+    좋아요 토글(queries.toggle_recipe_like)이 recipe_like 변경과 같은 문장에서 갱신한다.
+    """
+
+    dependencies = [
+        ('recipes', '0005_recipe_trending'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE recipe
+                    ADD COLUMN IF NOT EXISTS like_count integer NOT NULL DEFAULT 0
+                    CHECK (like_count >= 0);
+
+                UPDATE recipe r
+                SET like_count = l.n
+                FROM (
+                    SELECT recipe_id, count(*) AS n FROM recipe_like GROUP BY recipe_id
+                ) l
+                WHERE l.recipe_id = r.recipe_id
+                  AND r.like_count IS DISTINCT FROM l.n;
+            """,
+            reverse_sql="""
+                ALTER TABLE recipe DROP COLUMN IF EXISTS like_count;
+            """,
+        ),
+    ]
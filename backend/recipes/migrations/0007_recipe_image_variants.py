@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    recipe.image_variants: 업로드 이미지로 만든 크기별 WebP/JPEG 경로 (recipes/images.py)
+    {"thumb": {"webp": url, "jpeg": url}, "card": {...}, "full": {...}}
+    아직 만들어지지 않았으면 NULL (목록/상세는 image_path 원본을 쓴다).
+    """
+
+    dependencies = [
+        ('recipes', '0006_recipe_like_count'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE recipe ADD COLUMN IF NOT EXISTS image_variants jsonb;
+            """,
+            reverse_sql="""
+                ALTER TABLE recipe DROP COLUMN IF EXISTS image_variants;
+            """,
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    팔로우 피드 (recipes/feed.py).
+    - feed_entry: 회원별 미리 펼쳐 둔 타임라인. 레시피 작성 시 팔로워들에게 fan-out 된다.
+    - feed_pull_author: 팔로워가 많아 fan-out 하지 않는 작성자. 이 작성자의 레시피는 피드 조회 시 직접 읽는다.
+    - follow (followee_id) 인덱스: 작성자의 팔로워 목록 조회용 (PK 는 follower_id 가 앞)
+    """
+
+    dependencies = [
+        ('recipes', '0007_recipe_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS feed_entry (
+                    member_id  integer NOT NULL REFERENCES member (member_id) ON DELETE CASCADE,
+                    recipe_id  integer NOT NULL REFERENCES recipe (recipe_id) ON DELETE CASCADE,
+                    author_id  integer NOT NULL,
+                    created_at timestamptz,
+                    PRIMARY KEY (member_id, recipe_id)
+                );
+                CREATE INDEX IF NOT EXISTS feed_entry_member_created_at_idx
+                    ON feed_entry (member_id, created_at DESC, recipe_id DESC);
+                CREATE INDEX IF NOT EXISTS feed_entry_member_author_idx
+                    ON feed_entry (member_id, author_id);
+
+                CREATE TABLE IF NOT EXISTS feed_pull_author (
+                    member_id integer PRIMARY KEY REFERENCES member (member_id) ON DELETE CASCADE,
+                    since     timestamptz NOT NULL DEFAULT now()
+                );
+
+                CREATE INDEX IF NOT EXISTS follow_followee_follower_idx
+                    ON follow (followee_id, follower_id);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS follow_followee_follower_idx;
+                DROP TABLE IF EXISTS feed_pull_author;
+                DROP TABLE IF EXISTS feed_entry;
+            """,
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    member.follower_count / following_count: 팔로워/팔로잉 수 비정규화 컬럼.
+    팔로우 토글(queries.toggle_follow)이 follow 변경과 같은 문장에서 갱신한다.
+    follow 목록 keyset 페이지네이션용 (회원, followed_at, 상대 id) 인덱스도 추가.
+    """
+
+    dependencies = [
+        ('recipes', '0008_feed'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE member
+                    ADD COLUMN IF NOT EXISTS follower_count integer NOT NULL DEFAULT 0
+                        CHECK (follower_count >= 0),
+                    ADD COLUMN IF NOT EXISTS following_count integer NOT NULL DEFAULT 0
+                        CHECK (following_count >= 0);
+
+                UPDATE member m
+                SET follower_count = coalesce(f.n, 0)
+                FROM (SELECT followee_id, count(*) AS n FROM follow GROUP BY followee_id) f
+                WHERE f.followee_id = m.member_id;
+
+                UPDATE member m
+                SET following_count = coalesce(f.n, 0)
+                FROM (SELECT follower_id, count(*) AS n FROM follow GROUP BY follower_id) f
+                WHERE f.follower_id = m.member_id;
+
+                CREATE INDEX IF NOT EXISTS follow_follower_followed_at_idx
+                    ON follow (follower_id, followed_at DESC, followee_id DESC);
+                CREATE INDEX IF NOT EXISTS follow_followee_followed_at_idx
+                    ON follow (followee_id, followed_at DESC, follower_id DESC);
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS follow_follower_followed_at_idx;
+                DROP INDEX IF EXISTS follow_followee_followed_at_idx;
+                ALTER TABLE member
+                    DROP COLUMN IF EXISTS follower_count,
+                    DROP COLUMN IF EXISTS following_count;
+            """,
+        ),
+    ]
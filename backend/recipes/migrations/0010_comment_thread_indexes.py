@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    댓글 스레드(queries.comment_threads)용 인덱스.
+    - 답글: 재귀 CTE 가 부모 → 자식으로 내려갈 때와 답글 수를 셀 때 parent_comment_id 로 찾는다.
+    - 루트 댓글: 루트만 작성순으로 페이지네이션하므로 parent_comment_id IS NULL 부분 인덱스.
+    """
+
+    dependencies = [
+        ('recipes', '0009_member_follow_counts'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS recipe_comment_parent_created_at_idx
+                    ON recipe_comment (parent_comment_id, created_at, comment_id)
+                    WHERE parent_comment_id IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS recipe_comment_root_created_at_idx
+                    ON recipe_comment (recipe_id, created_at, comment_id)
+                    WHERE parent_comment_id IS NULL;
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS recipe_comment_parent_created_at_idx;
+                DROP INDEX IF EXISTS recipe_comment_root_created_at_idx;
+            """,
+        ),
+    ]
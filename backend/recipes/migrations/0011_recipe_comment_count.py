@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    recipe.comment_count: 댓글 수(답글 포함) 비정규화 컬럼.
+    상세 화면이 recipe_comment 를 COUNT 하지 않도록 recipe 행에 같이 둔다.
+    댓글 작성/삭제(queries.create_comment / delete_comment)가 같은 문장에서 갱신한다.
+    """
+
+    dependencies = [
+        ('recipes', '0010_comment_thread_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE recipe
+                    ADD COLUMN IF NOT EXISTS comment_count integer NOT NULL DEFAULT 0
+                    CHECK (comment_count >= 0);
+
+                UPDATE recipe r
+                SET comment_count = c.n
+                FROM (
+                    SELECT recipe_id, count(*) AS n FROM recipe_comment GROUP BY recipe_id
+                ) c
+                WHERE c.recipe_id = r.recipe_id
+                  AND r.comment_count IS DISTINCT FROM c.n;
+            """,
+            reverse_sql="""
+                ALTER TABLE recipe DROP COLUMN IF EXISTS comment_count;
+            """,
+        ),
+    ]
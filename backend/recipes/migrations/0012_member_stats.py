@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    member_stats: 회원별 활동 통계 (작성 레시피 수, 받은 좋아요, 받은 평점 합/개수).
+    마이페이지가 recipe × recipe_like JOIN 을 집계하지 않고 PK 로 한 행만 읽도록 한다.
+    쓰기 경로(queries.py)가 같은 문장에서 증감하고, 어긋나면 manage.py reconcile_member_stats 로 다시 맞춘다.
+    """
+
+    dependencies = [
+        ('recipes', '0011_recipe_comment_count'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE IF NOT EXISTS member_stats (
+                    member_id integer PRIMARY KEY REFERENCES member (member_id) ON DELETE CASCADE,
+                    recipe_count integer NOT NULL DEFAULT 0,
+                    likes_received integer NOT NULL DEFAULT 0,
+                    rating_sum bigint NOT NULL DEFAULT 0,
+                    rating_count integer NOT NULL DEFAULT 0,
+                    updated_at timestamptz NOT NULL DEFAULT now()
+                );
+
+                INSERT INTO member_stats (member_id, recipe_count, likes_received, rating_sum, rating_count)
+                SELECT m.member_id,
+                       coalesce(r.recipe_count, 0),
+                       coalesce(r.likes_received, 0),
+                       coalesce(g.rating_sum, 0),
+                       coalesce(g.rating_count, 0)
+                FROM member m
+                LEFT JOIN (
+                    SELECT author_id, count(*) AS recipe_count, sum(like_count) AS likes_received
+                    FROM recipe GROUP BY author_id
+                ) r ON r.author_id = m.member_id
+                LEFT JOIN (
+                    SELECT rc.author_id, sum(g.score) AS rating_sum, count(*) AS rating_count
+                    FROM rating g JOIN recipe rc ON rc.recipe_id = g.recipe_id
+                    GROUP BY rc.author_id
+                ) g ON g.author_id = m.member_id
+                ON CONFLICT (member_id) DO NOTHING;
+            """,
+            reverse_sql="""
+                DROP TABLE IF EXISTS member_stats;
+            """,
+        ),
+    ]
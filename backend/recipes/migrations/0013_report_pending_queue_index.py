@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    관리자 신고 처리 큐(recipes/moderation.py)용 부분 인덱스.
+    PENDING 신고만 담으므로 처리된 신고가 쌓여도 인덱스 크기는 대기 건수만큼만 유지되고,
+    대상별 묶음(target_type, recipe_id, comment_id)과 최초/최근 신고 시각을 인덱스에서 바로 읽는다.
+    """
+
+    dependencies = [
+        ('recipes', '0012_member_stats'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS report_pending_target_idx
+                    ON report (target_type, recipe_id, comment_id, created_at)
+                    WHERE status = 'PENDING';
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS report_pending_target_idx;
+            """,
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    같은 회원이 같은 대상에 PENDING 신고를 중복으로 남기지 못하도록 부분 유니크 인덱스를 만든다.
+    신고 생성(moderation.create_report)은 INSERT ... ON CONFLICT DO NOTHING 한 문장으로 중복을 거른다.
+    인덱스를 만들기 전에 이미 쌓인 중복은 가장 먼저 접수된 신고 하나만 남기고 REJECTED 로 정리한다.
+    """
+
+    dependencies = [
+        ('recipes', '0013_report_pending_queue_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                UPDATE report r
+                SET status = 'REJECTED',
+                    handle_note = '중복 신고 (먼저 접수된 신고로 처리)',
+                    handled_at = now()
+                FROM (
+                    SELECT report_id,
+                           row_number() OVER (
+                               PARTITION BY reporter_id, target_type, recipe_id, comment_id
+                               ORDER BY created_at, report_id
+                           ) AS n
+                    FROM report
+                    WHERE status = 'PENDING'
+                ) d
+                WHERE r.report_id = d.report_id AND d.n > 1;
+
+                CREATE UNIQUE INDEX IF NOT EXISTS report_pending_recipe_uniq
+                    ON report (reporter_id, recipe_id)
+                    WHERE target_type = 'RECIPE' AND status = 'PENDING';
+                CREATE UNIQUE INDEX IF NOT EXISTS report_pending_comment_uniq
+                    ON report (reporter_id, comment_id)
+                    WHERE target_type = 'COMMENT' AND status = 'PENDING';
+            """,
+            reverse_sql="""
+                DROP INDEX IF EXISTS report_pending_recipe_uniq;
+                DROP INDEX IF EXISTS report_pending_comment_uniq;
+            """,
+        ),
+    ]
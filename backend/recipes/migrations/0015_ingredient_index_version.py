@@ -0,0 +1,68 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    재료 역색인(recipes/ingredient_index.py) 버전을 DB 에 둔다.
+    프로세스별 캐시에 두면 재료를 바꾼 워커만 버전이 올라가므로, 모든 워커가 같은 시퀀스를 읽게 한다.
+    - recipe_ingredient / ingredient 의 모든 변경과 recipe 삭제(관리자 화면, 직접 SQL 포함)에서
+      트리거가 nextval() 로 버전을 올린다. 행 하나를 UPDATE 하면 그 행 잠금이 커밋까지 유지되어
+      레시피 작성/수정/삭제가 전부 한 줄로 서게 되므로, 잠금이 없는 시퀀스를 쓴다.
+    - 시퀀스 값은 커밋 전에도 다른 세션에 보이므로, 트리거를 커밋 직전에 실행되는
+      DEFERRABLE INITIALLY DEFERRED 제약 트리거로 만들어 "버전은 올랐는데 데이터는 아직 안 보이는" 구간을 줄인다.
+      (제약 트리거는 행 단위만 가능. TRUNCATE 는 일반 문장 트리거)
+    """
+
+    dependencies = [
+        ('recipes', '0014_report_pending_unique'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE SEQUENCE IF NOT EXISTS ingredient_index_version_seq;
+
+                CREATE OR REPLACE FUNCTION ingredient_index_bump() RETURNS trigger
+                LANGUAGE plpgsql AS $$
+                BEGIN
+                    PERFORM nextval('ingredient_index_version_seq');
+                    RETURN NULL;
+                END;
+                $$;
+
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_ingredient_bump ON recipe_ingredient;
+                CREATE CONSTRAINT TRIGGER ingredient_index_recipe_ingredient_bump
+                    AFTER INSERT OR UPDATE OR DELETE ON recipe_ingredient
+                    DEFERRABLE INITIALLY DEFERRED
+                    FOR EACH ROW EXECUTE FUNCTION ingredient_index_bump();
+                DROP TRIGGER IF EXISTS ingredient_index_ingredient_bump ON ingredient;
+                CREATE CONSTRAINT TRIGGER ingredient_index_ingredient_bump
+                    AFTER INSERT OR UPDATE OR DELETE ON ingredient
+                    DEFERRABLE INITIALLY DEFERRED
+                    FOR EACH ROW EXECUTE FUNCTION ingredient_index_bump();
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_bump ON recipe;
+                CREATE CONSTRAINT TRIGGER ingredient_index_recipe_bump
+                    AFTER DELETE ON recipe
+                    DEFERRABLE INITIALLY DEFERRED
+                    FOR EACH ROW EXECUTE FUNCTION ingredient_index_bump();
+
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_ingredient_truncate ON recipe_ingredient;
+                CREATE TRIGGER ingredient_index_recipe_ingredient_truncate
+                    AFTER TRUNCATE ON recipe_ingredient
+                    FOR EACH STATEMENT EXECUTE FUNCTION ingredient_index_bump();
+                DROP TRIGGER IF EXISTS ingredient_index_ingredient_truncate ON ingredient;
+                CREATE TRIGGER ingredient_index_ingredient_truncate
+                    AFTER TRUNCATE ON ingredient
+                    FOR EACH STATEMENT EXECUTE FUNCTION ingredient_index_bump();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_ingredient_truncate ON recipe_ingredient;
+                DROP TRIGGER IF EXISTS ingredient_index_ingredient_truncate ON ingredient;
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_ingredient_bump ON recipe_ingredient;
+                DROP TRIGGER IF EXISTS ingredient_index_ingredient_bump ON ingredient;
+                DROP TRIGGER IF EXISTS ingredient_index_recipe_bump ON recipe;
+                DROP FUNCTION IF EXISTS ingredient_index_bump();
+                DROP SEQUENCE IF EXISTS ingredient_index_version_seq;
+            """,
+        ),
+    ]
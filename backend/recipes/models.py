@@ -1,4 +1,7 @@
-﻿from django.db import models
+﻿from decimal import Decimal
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
 
 
 class Member(models.Model):
@@ -8,6 +11,9 @@ class Member(models.Model):
     name = models.CharField(max_length=50)
     role = models.TextField()  # PostgreSQL enum(user_role) 매핑 추정
     created_at = models.DateTimeField(blank=True, null=True)
+    # follow 행 수 (queries.toggle_follow 가 유지)
+    follower_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
 
     @property
     def is_authenticated(self):
@@ -74,6 +80,8 @@ class Recipe(models.Model):
     description = models.TextField()
     cooking_time = models.IntegerField(blank=True, null=True)
     image_path = models.TextField(blank=True, null=True)
+    # image_path 로 만든 크기별 이미지 경로 (recipes/images.py 가 비동기로 채움)
+    image_variants = models.JSONField(blank=True, null=True)
     created_at = models.DateTimeField(blank=True, null=True)
     updated_at = models.DateTimeField(blank=True, null=True)
     avg_score = models.DecimalField(
@@ -83,12 +91,139 @@ class Recipe(models.Model):
         null=True,
     )
     rating_count = models.IntegerField(blank=True, null=True)
+    # recipe_like 행 수 (queries.toggle_recipe_like 가 유지)
+    like_count = models.IntegerField(default=0)
+    # recipe_comment 행 수, 답글 포함 (queries.create_comment / delete_comment 가 유지)
+    comment_count = models.IntegerField(default=0)
 
     class Meta:
         managed = False
         db_table = 'recipe'
 
 
+class RecipeSearch(models.Model):
+    """
+    recipe_search 테이블: 검색용 tsvector / trigram 텍스트
+    (제목·설명·태그·재료 이름, DB 트리거가 유지)
+    """
+    recipe = models.OneToOneField(
+        Recipe,
+        models.DO_NOTHING,
+        primary_key=True,
+        related_name='search',
+    )
+    document = SearchVectorField()
+    search_text = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = 'recipe_search'
+
+
+class RecipeTrending(models.Model):
+    """
+    recipe_trending 테이블: 시간 감쇠 트렌딩 점수 (recipes/trending.py 가 유지)
+    """
+    recipe = models.OneToOneField(
+        Recipe,
+        models.DO_NOTHING,
+        primary_key=True,
+        related_name='trending',
+    )
+    score = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'recipe_trending'
+
+
+class TrendingState(models.Model):
+    """
+    trending_state 테이블 (행 1개): 점수 기준 시각 / 이벤트 반영 완료 시각
+    """
+    id = models.SmallIntegerField(primary_key=True)
+    epoch = models.DateTimeField()
+    processed_until = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'trending_state'
+
+
+class FeedEntry(models.Model):
+    """
+    feed_entry 테이블: 회원별 피드 타임라인 (recipes/feed.py 가 fan-out 으로 채움)
+    실제 DB 에서는 (member_id, recipe_id) 복합 PK
+    """
+    member = models.ForeignKey(
+        Member,
+        models.DO_NOTHING,
+        related_name='feed_entries',
+        primary_key=True,
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        models.DO_NOTHING,
+        related_name='feed_entries',
+    )
+    author_id = models.IntegerField()
+    created_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'feed_entry'
+        unique_together = ('member', 'recipe')
+
+
+class MemberStats(models.Model):
+    """
+    member_stats 테이블: 회원별 활동 통계 (마이페이지 /api/auth/me/ 용)
+    레시피 작성 / 좋아요 토글 / 평점 쓰기가 같은 문장에서 증감하고,
+    manage.py reconcile_member_stats 가 원본 테이블로 다시 계산해 맞춘다.
+    팔로워/팔로잉 수는 member.follower_count / following_count 에 있다.
+    """
+    member = models.OneToOneField(
+        Member,
+        models.DO_NOTHING,
+        primary_key=True,
+        related_name='stats',
+    )
+    recipe_count = models.IntegerField(default=0)
+    # 내 레시피들이 받은 좋아요 수
+    likes_received = models.IntegerField(default=0)
+    # 내 레시피들이 받은 평점 합/개수 (평균은 rating_sum / rating_count)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'member_stats'
+
+    @property
+    def avg_rating_received(self):
+        if not self.rating_count:
+            return None
+        return round(Decimal(self.rating_sum) / self.rating_count, 2)
+
+
+class FeedPullAuthor(models.Model):
+    """
+    feed_pull_author 테이블: 팔로워가 많아 fan-out 대신 조회 시 직접 읽는 작성자
+    """
+    member = models.OneToOneField(
+        Member,
+        models.DO_NOTHING,
+        primary_key=True,
+        related_name='feed_pull',
+    )
+    since = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'feed_pull_author'
+
+
 class RecipeStep(models.Model):
     step_id = models.AutoField(primary_key=True)
     recipe = models.ForeignKey(
@@ -250,6 +385,20 @@ class Report(models.Model):
     class Meta:
         managed = False
         db_table = 'report'
+        # 한 회원이 같은 대상에 처리 대기(PENDING) 신고를 두 건 이상 둘 수 없다
+        # (실제 DB 에는 0014 마이그레이션의 부분 유니크 인덱스, 신고 생성은 ON CONFLICT DO NOTHING)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['reporter', 'recipe'],
+                condition=models.Q(target_type='RECIPE', status='PENDING'),
+                name='report_pending_recipe_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['reporter', 'comment'],
+                condition=models.Q(target_type='COMMENT', status='PENDING'),
+                name='report_pending_comment_uniq',
+            ),
+        ]
 
 
 class UserSanction(models.Model):
@@ -299,4 +448,39 @@ class RecipeSummary(models.Model):
         ordering = ['-like_count', '-avg_score', '-rating_count', '-comment_count', '-recipe_id']
 
     def __str__(self):
-        return f"[{self.recipe_id}] {self.title}"
\ No newline at end of file
+        return f"[{self.recipe_id}] {self.title}"
+
+
+class RecipePopularity(models.Model):
+    """
+    PostgreSQL MATERIALIZED VIEW: mv_recipe_popularity 매핑용 모델
+    v_recipe_summary 스냅샷 (manage.py refresh_popular_recipes 로 갱신)
+    """
+    recipe_id = models.IntegerField(primary_key=True)
+    title = models.CharField(max_length=150)
+    description = models.TextField()
+    cooking_time = models.IntegerField(null=True)
+    avg_score = models.DecimalField(max_digits=3, decimal_places=2)
+    rating_count = models.IntegerField()
+    like_count = models.IntegerField()
+    comment_count = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_recipe_popularity'
+        ordering = ['-like_count', '-avg_score', '-rating_count', '-comment_count', '-recipe_id']
+
+    def __str__(self):
+        return f"[{self.recipe_id}] {self.title}"
+
+
+class PopularityRefreshState(models.Model):
+    """
+    popularity_refresh_state 테이블 (행 1개): mv_recipe_popularity 스냅샷 시각
+    """
+    id = models.SmallIntegerField(primary_key=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'popularity_refresh_state'
@@ -0,0 +1,212 @@
+"""
+관리자 신고 처리 큐 (GET /api/admin/reports/queue/).
+
+처리 대기(PENDING) 신고를 신고 대상(레시피/댓글)별로 묶어서
+신고 수가 많은 대상 → 먼저 신고된 대상 순으로 보여 준다.
+묶음 조회는 report (target_type, recipe_id, comment_id, created_at) WHERE status = 'PENDING'
+부분 인덱스만 읽으므로 처리 완료된 신고가 쌓여도 비용이 늘지 않는다.
+대상 미리보기(레시피 제목 / 댓글 앞부분 + 작성자)는 페이지 단위로 종류별 쿼리 1번씩 읽는다.
+
+일괄 처리(bulk_handle_reports)는 신고 상태 변경과 경고 제재 생성을 SQL 한 문장으로 한다.
+신고 접수(create_report)는 대상 확인과 중복 확인, INSERT 를 SQL 한 문장으로 한다.
+"""
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection
+from django.db.models import Count, Func, IntegerField, Max, Min, TextField
+from django.db.models.functions import Coalesce, Left
+
+from .models import RecipeComment, Recipe, Report
+
+# 큐 항목마다 보여 줄 최근 신고 사유 수
+MODERATION_RECENT_REASONS = getattr(settings, "MODERATION_RECENT_REASONS", 3)
+# 댓글 미리보기 길이 (글자 수)
+MODERATION_COMMENT_SNIPPET_LENGTH = getattr(settings, "MODERATION_COMMENT_SNIPPET_LENGTH", 80)
+
+# 신고 수 많은 순 → 오래 기다린 순. (target_type, target_id) 로 유일하게 만든다
+QUEUE_ORDERING = ("-report_count", "first_reported_at", "target_type", "target_id")
+
+
+class _ArrayHead(Func):
+    """(array)[1:n] — 집계한 배열의 앞 n 개"""
+    template = "(%(expressions)s)[1:%(size)d]"
+    output_field = ArrayField(TextField())
+
+
+def moderation_queue_queryset():
+    """
+    대상별로 묶은 PENDING 신고 (values() queryset, 정렬은 호출하는 쪽에서).
+    각 행: target_type, target_id, recipe_id, comment_id, report_count,
+           first_reported_at, last_reported_at, report_ids, recent_reasons
+    report_ids 는 이 행을 만들 때 본 신고들이라, 일괄 처리 시 그 사이 새로 들어온 신고는 건드리지 않을 수 있다.
+    """
+    return (
+        Report.objects
+        .filter(status="PENDING")
+        .values("target_type", "recipe_id", "comment_id")
+        .annotate(
+            target_id=Coalesce("comment_id", "recipe_id", output_field=IntegerField()),
+            report_count=Count("report_id"),
+            first_reported_at=Min("created_at"),
+            last_reported_at=Max("created_at"),
+            report_ids=ArrayAgg("report_id", ordering="report_id"),
+            recent_reasons=_ArrayHead(
+                ArrayAgg("reason", ordering="-created_at"),
+                size=MODERATION_RECENT_REASONS,
+            ),
+        )
+    )
+
+
+def load_target_previews(rows):
+    """
+    큐 행들의 신고 대상 미리보기를 한 번에 읽어 각 행의 "target" 에 넣는다.
+    레시피: {recipe_id, title, author} / 댓글: {comment_id, recipe_id, snippet, author}
+    이미 삭제된 대상은 None.
+    """
+    recipe_ids = {row["recipe_id"] for row in rows if row["target_type"] == "RECIPE" and row["recipe_id"]}
+    comment_ids = {row["comment_id"] for row in rows if row["target_type"] == "COMMENT" and row["comment_id"]}
+
+    recipes = {}
+    if recipe_ids:
+        recipes = {
+            recipe.recipe_id: recipe
+            for recipe in (
+                Recipe.objects
+                .filter(recipe_id__in=recipe_ids)
+                .select_related("author")
+                .only("recipe_id", "title", "author__member_id", "author__login_id",
+                      "author__name", "author__role")
+            )
+        }
+
+    comments = {}
+    if comment_ids:
+        comments = {
+            comment.comment_id: comment
+            for comment in (
+                RecipeComment.objects
+                .filter(comment_id__in=comment_ids)
+                .select_related("author")
+                .only("comment_id", "recipe_id", "author__member_id", "author__login_id",
+                      "author__name", "author__role")
+                .annotate(snippet=Left("content", MODERATION_COMMENT_SNIPPET_LENGTH))
+            )
+        }
+
+    for row in rows:
+        if row["target_type"] == "RECIPE":
+            row["target"] = recipes.get(row["recipe_id"])
+        elif row["target_type"] == "COMMENT":
+            row["target"] = comments.get(row["comment_id"])
+        else:
+            row["target"] = None
+    return rows
+
+
+def bulk_handle_reports(admin_id, status, handle_note=None, report_ids=None, target=None):
+    """
+    PENDING 신고 여러 건을 한 번에 처리한다 (RESOLVED / REJECTED).
+    대상은 report_ids 또는 target=(target_type, target_id) 중 하나 — target 이면 그 대상의 대기 신고 전체.
+
+    한 문장에서
+      1) 신고 상태/메모/처리자/처리 시각을 UPDATE (이미 처리된 신고는 건드리지 않음)
+      2) RESOLVED 면 처리된 신고의 대상 작성자마다 WARNING 제재를 한 건씩 INSERT
+    동시에 같은 신고를 처리해도 status = 'PENDING' 조건으로 한쪽만 반영되어 제재가 중복되지 않는다.
+
+    반환: (처리한 report_id 목록, [(sanction_id, member_id)])
+    """
+    if target is not None:
+        target_type, target_id = target
+        column = "recipe_id" if target_type == "RECIPE" else "comment_id"
+        report_filter = f"r.target_type = %(target_type)s AND r.{column} = %(target_id)s"
+        params = {"target_type": target_type, "target_id": target_id}
+    else:
+        report_filter = "r.report_id = ANY(%(report_ids)s::integer[])"
+        params = {"report_ids": list(report_ids or [])}
+
+    params.update(admin_id=admin_id, status=status, note=handle_note or None)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH handled AS (
+                UPDATE report r
+                SET status = %(status)s,
+                    handle_note = coalesce(%(note)s, r.handle_note),
+                    handled_by = %(admin_id)s,
+                    handled_at = now()
+                WHERE r.status = 'PENDING' AND {report_filter}
+                RETURNING r.report_id, r.target_type, r.recipe_id, r.comment_id
+            ), offenders AS (
+                SELECT coalesce(rc.author_id, c.author_id) AS member_id,
+                       string_agg(h.report_id::text, ',' ORDER BY h.report_id) AS report_ids
+                FROM handled h
+                LEFT JOIN recipe rc
+                       ON h.target_type = 'RECIPE' AND rc.recipe_id = h.recipe_id
+                LEFT JOIN recipe_comment c
+                       ON h.target_type = 'COMMENT' AND c.comment_id = h.comment_id
+                WHERE %(status)s = 'RESOLVED'
+                GROUP BY 1
+            ), sanctions AS (
+                INSERT INTO user_sanction (member_id, sanction, reason, start_at, created_by, created_at)
+                SELECT member_id,
+                       'WARNING',
+                       coalesce(%(note)s, '신고 처리 (report_id=' || report_ids || ')에 따른 경고'),
+                       now(),
+                       %(admin_id)s,
+                       now()
+                FROM offenders
+                WHERE member_id IS NOT NULL
+                RETURNING sanction_id, member_id
+            )
+            SELECT (SELECT coalesce(array_agg(report_id ORDER BY report_id), '{{}}') FROM handled),
+                   (SELECT coalesce(array_agg(ARRAY[sanction_id, member_id] ORDER BY member_id), '{{}}')
+                    FROM sanctions)
+            """,
+            params,
+        )
+        handled_ids, sanctions = cursor.fetchone()
+    return handled_ids, [tuple(pair) for pair in sanctions]
+
+
+# 신고 대상 종류 → (대상 테이블, report 의 대상 컬럼)
+REPORT_TARGETS = {
+    "RECIPE": ("recipe", "recipe_id"),
+    "COMMENT": ("recipe_comment", "comment_id"),
+}
+
+
+def create_report(reporter_id, target_type, target_id, reason):
+    """
+    신고를 접수한다 (대상이 있을 때만 INSERT, 같은 대상의 PENDING 신고가 이미 있으면 DO NOTHING).
+    중복 여부는 report_pending_recipe_uniq / report_pending_comment_uniq 부분 유니크 인덱스가 판단하므로
+    동시에 같은 신고가 들어와도 한 건만 남는다.
+
+    반환: (report_id, None) / 실패 시 (None, "not_found" | "duplicate")
+    """
+    # target_type 은 REPORT_TARGETS 키로 검증된 상수 (ON CONFLICT 추론 조건은 상수여야 한다)
+    table, column = REPORT_TARGETS[target_type]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO report (reporter_id, target_type, {column}, reason, status, created_at)
+            SELECT %(reporter_id)s, %(target_type)s, t.{column}, %(reason)s, 'PENDING', now()
+            FROM {table} t
+            WHERE t.{column} = %(target_id)s
+            ON CONFLICT (reporter_id, {column})
+                WHERE target_type = '{target_type}' AND status = 'PENDING'
+                DO NOTHING
+            RETURNING report_id
+            """,
+            {"reporter_id": reporter_id, "target_type": target_type,
+             "target_id": target_id, "reason": reason},
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            return row[0], None
+
+        # 실패했을 때만 원인을 구분한다
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {column} = %s)", [target_id])
+        exists = cursor.fetchone()[0]
+    return None, "duplicate" if exists else "not_found"
@@ -0,0 +1,220 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    정렬 컬럼 튜플 기반 keyset(cursor) 페이지네이션.
+
+    - OFFSET 대신 "마지막 행보다 뒤" 조건(seek predicate)으로 다음 페이지를 조회하므로
+      깊은 페이지도 첫 페이지와 비용이 같다.
+    - 정렬 기준은 view.cursor_ordering 에서 읽는다. 마지막 컬럼은 반드시 유일해야 한다(PK 등).
+    - ?cursor= 또는 ?page_size= 가 있을 때만 동작한다. 둘 다 없으면 기존처럼 전체 목록을 돌려준다.
+    - view 에 seek_queryset(ordering, predicate, limit) 이 있으면 그 결과를 페이지로 쓴다.
+      여러 subquery 를 합치는 목록(피드 등)이 seek 조건과 LIMIT 을 subquery 안까지 넣을 때 쓴다.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    ordering = ("-pk",)
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "cursor_ordering", None) or self.ordering)
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except ValueError:
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def is_enabled(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    # ----------------------------
+    # cursor 인코딩 / 디코딩
+    # ----------------------------
+
+    def encode_cursor(self, values, reverse):
+        def _plain(value):
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return str(value)
+            return value
+
+        payload = {"v": [_plain(v) for v in values], "r": int(reverse)}
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        token = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, ordering):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            values = payload["v"]
+            reverse = bool(payload.get("r", 0))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("잘못된 cursor 입니다.")
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound("잘못된 cursor 입니다.")
+        return values, reverse
+
+    # ----------------------------
+    # seek predicate
+    # ----------------------------
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+    @staticmethod
+    def _after(field, descending, value):
+        """
+        정렬상 value "뒤"에 오는 행 조건.
+        PostgreSQL 기본 NULL 정렬(ASC → NULLS LAST, DESC → NULLS FIRST)을 따른다.
+        """
+        if value is None:
+            if descending:
+                return Q(**{f"{field}__isnull": False})
+            return None  # ASC 에서 NULL 은 맨 뒤라 뒤에 오는 값이 없음
+        if descending:
+            return Q(**{f"{field}__lt": value})
+        return Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+
+    @staticmethod
+    def _equal(field, value):
+        if value is None:
+            return Q(**{f"{field}__isnull": True})
+        return Q(**{field: value})
+
+    def build_predicate(self, ordering, values):
+        """
+        (a, b, c) > (x, y, z) 를 정렬 방향이 섞여 있어도 쓸 수 있게 풀어 쓴 형태:
+          a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        # 항상 거짓인 Q(pk__in=[]) 로 시작하지 않는다: values().annotate() 로 묶은 queryset 에서
+        # pk 를 참조하면 GROUP BY 에 pk 가 추가되어 묶음이 깨진다.
+        predicate = None
+        prefix = Q()
+        for spec, value in zip(ordering, values):
+            field = spec.lstrip("-")
+            descending = spec.startswith("-")
+            after = self._after(field, descending, value)
+            if after is not None:
+                term = prefix & after
+                predicate = term if predicate is None else predicate | term
+            prefix &= self._equal(field, value)
+        return predicate if predicate is not None else Q(pk__in=[])
+
+    @staticmethod
+    def _position(obj, ordering):
+        # 모델 인스턴스 또는 values() 결과(dict) 모두 지원
+        values = []
+        for spec in ordering:
+            value = obj
+            for part in spec.lstrip("-").split("__"):
+                value = value[part] if isinstance(value, dict) else getattr(value, part)
+            values.append(value)
+        return values
+
+    # ----------------------------
+    # BasePagination 구현
+    # ----------------------------
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_enabled(request):
+            return None
+
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.cursor_query_param
+        )
+        ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, ordering)
+
+        # 이전 페이지는 정렬을 뒤집어서 같은 방식으로 seek 한 뒤 결과를 다시 뒤집는다.
+        query_ordering = self._flip(ordering) if reverse else ordering
+        # cursor 값의 타입은 filter 를 만들 때(컬럼 타입으로 변환할 때) 처음 검사된다
+        try:
+            predicate = None if values is None else self.build_predicate(query_ordering, values)
+            seek = getattr(view, "seek_queryset", None)
+            if seek is not None:
+                queryset = seek(query_ordering, predicate, page_size + 1)
+            else:
+                queryset = queryset.order_by(*query_ordering)
+                if predicate is not None:
+                    queryset = queryset.filter(predicate)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound("잘못된 cursor 입니다.")
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.next_link = None
+        self.previous_link = None
+        if rows:
+            # 정방향: 한 행 더 읽혔으면 다음 페이지가 있고, cursor 로 들어왔으면 이전 페이지가 있다.
+            # 역방향: 항상 다음 페이지가 있고, 한 행 더 읽혔으면 이전 페이지가 있다.
+            has_next = reverse or has_more
+            has_previous = has_more if reverse else values is not None
+            if has_next:
+                self.next_link = self.encode_cursor(
+                    self._position(rows[-1], ordering), reverse=False
+                )
+            if has_previous:
+                self.previous_link = self.encode_cursor(
+                    self._position(rows[0], ordering), reverse=True
+                )
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.next_link,
+            "previous": self.previous_link,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class AlwaysKeysetPagination(KeysetPagination):
+    """
+    ?cursor= / ?page_size= 가 없어도 첫 페이지(page_size)부터 돌려주는 keyset 페이지네이션.
+    전체 목록을 한 번에 내려주면 안 되는 목록(댓글 등)에 쓴다.
+    """
+
+    def is_enabled(self, request):
+        return True
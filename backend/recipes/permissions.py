@@ -1,5 +1,11 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
 from rest_framework import permissions
 
+from .sanctions import sanction_blocked_until
+
 
 class IsAuthorOrAdmin(permissions.BasePermission):
     """
@@ -20,3 +26,32 @@ class IsAuthorOrAdmin(permissions.BasePermission):
         is_author = (obj.author_id == user.member_id)
         is_admin = (user.role == "ADMIN")
         return is_author or is_admin
+
+
+class IsNotSanctioned(permissions.BasePermission):
+    """
+    이용 제한(제재) 중인 회원의 쓰기 요청(POST/PUT/PATCH)을 막는다.
+    제한 종료 시각은 회원별로 캐시되어 있어 보통 쿼리 없이 판단한다 (recipes/sanctions.py).
+    삭제(DELETE)는 자기 글 정리를 위해 허용한다.
+    """
+    WRITE_METHODS = ("POST", "PUT", "PATCH")
+
+    def has_permission(self, request, view):
+        if request.method not in self.WRITE_METHODS:
+            return True
+
+        user = request.user
+        if not user or not getattr(user, "is_authenticated", False):
+            # 로그인 여부는 다른 permission 이 판단
+            return True
+
+        blocked_until = sanction_blocked_until(user.member_id)
+        if blocked_until is None:
+            return True
+
+        if blocked_until == math.inf:
+            self.message = "이용이 제한된 계정입니다."
+        else:
+            until = timezone.localtime(datetime.fromtimestamp(blocked_until, tz=dt_timezone.utc))
+            self.message = f"이용이 제한된 계정입니다. ({until:%Y-%m-%d %H:%M} 까지)"
+        return False
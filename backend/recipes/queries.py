@@ -0,0 +1,691 @@
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg, JSONBAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import Exists, F, FloatField, OuterRef, Q, Subquery, Value, BooleanField
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.functions import Cast, Coalesce, JSONObject
+from django.utils import timezone
+
+from .models import (
+    Follow,
+    Member,
+    PopularityRefreshState,
+    Rating,
+    Recipe,
+    RecipeComment,
+    RecipeIngredient,
+    RecipeLike,
+    RecipePopularity,
+    RecipeStep,
+    RecipeSummary,
+    RecipeTag,
+)
+from .trending import retract_sql
+
+
+def _per_recipe(queryset, aggregate):
+    """
+    자식 테이블을 recipe 별로 묶어 집계한 값 하나를 돌려주는 상관 서브쿼리.
+    (SELECT agg(...) FROM child WHERE child.recipe_id = recipe.recipe_id GROUP BY recipe_id)
+    """
+    return Subquery(
+        queryset
+        .filter(recipe=OuterRef("pk"))
+        .values("recipe")
+        .annotate(payload=aggregate)
+        .values("payload")
+    )
+
+
+def recipe_detail_queryset(member=None):
+    """
+    레시피 상세 화면에 필요한 모든 데이터를 SELECT 한 번으로 가져오는 queryset.
+
+    - author: JOIN (select_related)
+    - tag_names: 태그 이름 배열
+    - steps_data: [{step_id, step_order, content}] (step_order 순으로 정렬된 JSON)
+    - ingredients_data: [{name, amount}] JSON
+    - is_liked: 로그인 사용자가 좋아요 했는지 (EXISTS)
+
+    RecipeDetailSerializer 는 이 annotation 들이 있으면 추가 쿼리 없이 그대로 사용한다.
+    """
+    if member is not None:
+        is_liked = Exists(
+            RecipeLike.objects.filter(recipe=OuterRef("pk"), member=member)
+        )
+    else:
+        is_liked = Value(False, output_field=BooleanField())
+
+    return (
+        Recipe.objects
+        .select_related("author")
+        .annotate(
+            tag_names=_per_recipe(
+                RecipeTag.objects,
+                ArrayAgg("tag__name"),
+            ),
+            steps_data=_per_recipe(
+                RecipeStep.objects,
+                JSONBAgg(
+                    JSONObject(
+                        step_id="step_id",
+                        step_order="step_order",
+                        content="content",
+                    ),
+                    order_by=("step_order", "step_id"),
+                ),
+            ),
+            ingredients_data=_per_recipe(
+                RecipeIngredient.objects,
+                JSONBAgg(
+                    JSONObject(
+                        name="ingredient__name",
+                        amount=Coalesce("amount", Value("")),
+                    ),
+                ),
+            ),
+            is_liked=is_liked,
+        )
+    )
+
+
+def viewer_recipe_state(member, recipe_ids):
+    """
+    로그인 사용자의 레시피별 (좋아요 여부, 내 평점, 작성자 팔로우 여부)를 쿼리 한 번으로 조회.
+    반환: {recipe_id: (is_liked, my_score, is_following_author)}  (my_score 는 평점이 없으면 None)
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return {}
+    rows = (
+        Recipe.objects
+        .filter(pk__in=recipe_ids)
+        .annotate(
+            viewer_liked=Exists(
+                RecipeLike.objects.filter(recipe=OuterRef("pk"), member=member)
+            ),
+            viewer_score=Subquery(
+                Rating.objects.filter(recipe=OuterRef("pk"), member=member).values("score")[:1]
+            ),
+            viewer_follows_author=Exists(
+                Follow.objects.filter(follower=member, followee=OuterRef("author"))
+            ),
+        )
+        .values_list("pk", "viewer_liked", "viewer_score", "viewer_follows_author")
+    )
+    return {recipe_id: tuple(state) for recipe_id, *state in rows}
+
+
+# recipe_search.document 를 만들 때 쓴 text search 설정 (migrations/0002_recipe_search.py 와 같아야 함)
+SEARCH_CONFIG = "simple"
+
+
+def search_terms(text):
+    """검색어를 단어 단위로 나눈다. tsquery 특수문자는 버린다."""
+    return re.findall(r"\w+", text or "")
+
+
+def search_recipes_queryset(text):
+    """
+    recipe_search 를 이용한 관련도순 검색.
+
+    - 전문 검색: 단어별 접두어 일치(tsquery 'a:* & b:*'), 제목 > 태그/재료 > 설명 가중치
+    - 부분 일치/오타: pg_trgm word_similarity (%> 연산자, GIN 인덱스 사용)
+    두 점수를 더한 rank 로 정렬한다. 검색어가 비어 있으면 빈 결과.
+    rank 는 double precision 으로 바꿔 둔다: 두 함수는 real 을 돌려주는데, real 의 텍스트 값을 cursor 에 담았다가
+    다시 비교하면 같은 값이 되지 않아 (-rank, -recipe_id) 다음 페이지가 같은 행을 되풀이한다.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return Recipe.objects.none()
+
+    phrase = " ".join(terms)
+    query = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    return (
+        Recipe.objects
+        .filter(
+            Q(search__document=query)
+            | Q(search__search_text__trigram_word_similar=phrase)
+        )
+        .annotate(
+            rank=Cast(
+                SearchRank(F("search__document"), query)
+                + TrigramWordSimilarity(phrase, "search__search_text"),
+                output_field=FloatField(),
+            )
+        )
+    )
+
+
+_POPULARITY_REFRESHED_AT_KEY = "popularity:refreshed_at"
+
+
+def refresh_popularity(concurrently=True):
+    """
+    mv_recipe_popularity 스냅샷 갱신 + 스냅샷 시각(popularity_refresh_state) 기록 (한 트랜잭션).
+    CONCURRENTLY 로 돌리면 갱신 중에도 인기 목록 조회가 막히지 않는다.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_recipe_popularity"
+            if concurrently else
+            "REFRESH MATERIALIZED VIEW mv_recipe_popularity"
+        )
+        cursor.execute(
+            """
+            INSERT INTO popularity_refresh_state (id, refreshed_at) VALUES (1, now())
+            ON CONFLICT (id) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at
+            """
+        )
+    cache.delete(_POPULARITY_REFRESHED_AT_KEY)
+
+
+def popularity_refreshed_at():
+    """스냅샷 시각. 매 요청 조회하지 않도록 짧게 캐시한다."""
+    refreshed_at = cache.get(_POPULARITY_REFRESHED_AT_KEY)
+    if refreshed_at is None:
+        refreshed_at = (
+            PopularityRefreshState.objects.filter(id=1).values_list("refreshed_at", flat=True).first()
+        )
+        if refreshed_at is not None:
+            cache.set(_POPULARITY_REFRESHED_AT_KEY, refreshed_at, 60)
+    return refreshed_at
+
+
+def popular_recipes_queryset():
+    """
+    인기 레시피 목록 queryset.
+    평소에는 materialized view(정렬 인덱스 스캔), 스냅샷이 비어 있거나
+    허용 지연(settings.POPULAR_RECIPES_MAX_STALENESS 초)보다 오래됐으면 집계 뷰(v_recipe_summary)를 직접 읽는다.
+    허용 지연이 None 이면 스냅샷이 아무리 오래돼도 그대로 사용.
+    """
+    max_staleness = getattr(settings, "POPULAR_RECIPES_MAX_STALENESS", 60 * 60)
+    if max_staleness is None:
+        return RecipePopularity.objects.all()
+
+    refreshed_at = popularity_refreshed_at()
+    if refreshed_at is not None and (
+        timezone.now() - refreshed_at <= timedelta(seconds=max_staleness)
+    ):
+        return RecipePopularity.objects.all()
+    return RecipeSummary.objects.all()
+
+
+# member_stats 증감 CTE. deltas 는 (member_id, recipe_count, likes_received, rating_sum, rating_count)
+# 증감값을 회원당 한 행씩 돌려주는 SELECT 로, 원본 테이블을 바꾸는 문장의 RETURNING 을 읽어 만든다.
+# 그래서 통계가 원본 변경과 같은 문장(같은 트랜잭션)에서 반영된다. 행이 없는 회원은 증감값으로 새로 만든다.
+def _member_stats_upsert(deltas):
+    return f"""
+        INSERT INTO member_stats AS s
+            (member_id, recipe_count, likes_received, rating_sum, rating_count, updated_at)
+        SELECT member_id, recipe_count, likes_received, rating_sum, rating_count, now()
+        FROM ({deltas}) d (member_id, recipe_count, likes_received, rating_sum, rating_count)
+        ON CONFLICT (member_id) DO UPDATE SET
+            recipe_count = greatest(s.recipe_count + EXCLUDED.recipe_count, 0),
+            likes_received = greatest(s.likes_received + EXCLUDED.likes_received, 0),
+            rating_sum = greatest(s.rating_sum + EXCLUDED.rating_sum, 0),
+            rating_count = greatest(s.rating_count + EXCLUDED.rating_count, 0),
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+def add_member_recipes(member_id, count=1):
+    """레시피 작성 시 member_stats.recipe_count 증가 (레시피 INSERT 와 같은 트랜잭션에서 호출)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _member_stats_upsert("SELECT %s, %s, 0, 0, 0"),
+            [member_id, count],
+        )
+
+
+def reconcile_member_stats(first_member_id, last_member_id):
+    """
+    member_id 가 [first, last] 범위인 회원의 member_stats 를 원본 테이블로 다시 계산한다 (한 문장).
+    증감 누락/경합으로 어긋난 값을 맞추는 용도이며, 값이 바뀐 행만 UPDATE 한다.
+    반환: 새로 만들거나 고친 행 수
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO member_stats AS s
+                (member_id, recipe_count, likes_received, rating_sum, rating_count, updated_at)
+            SELECT m.member_id,
+                   coalesce(r.recipe_count, 0),
+                   coalesce(r.likes_received, 0),
+                   coalesce(g.rating_sum, 0),
+                   coalesce(g.rating_count, 0),
+                   now()
+            FROM member m
+            LEFT JOIN (
+                SELECT author_id, count(*) AS recipe_count, sum(like_count) AS likes_received
+                FROM recipe
+                WHERE author_id BETWEEN %(first)s AND %(last)s
+                GROUP BY author_id
+            ) r ON r.author_id = m.member_id
+            LEFT JOIN (
+                SELECT rc.author_id, sum(g.score) AS rating_sum, count(*) AS rating_count
+                FROM rating g
+                JOIN recipe rc ON rc.recipe_id = g.recipe_id
+                WHERE rc.author_id BETWEEN %(first)s AND %(last)s
+                GROUP BY rc.author_id
+            ) g ON g.author_id = m.member_id
+            WHERE m.member_id BETWEEN %(first)s AND %(last)s
+            ON CONFLICT (member_id) DO UPDATE SET
+                recipe_count = EXCLUDED.recipe_count,
+                likes_received = EXCLUDED.likes_received,
+                rating_sum = EXCLUDED.rating_sum,
+                rating_count = EXCLUDED.rating_count,
+                updated_at = EXCLUDED.updated_at
+            WHERE (s.recipe_count, s.likes_received, s.rating_sum, s.rating_count)
+                  IS DISTINCT FROM
+                  (EXCLUDED.recipe_count, EXCLUDED.likes_received,
+                   EXCLUDED.rating_sum, EXCLUDED.rating_count)
+            """,
+            {"first": first_member_id, "last": last_member_id},
+        )
+        return cursor.rowcount
+
+
+def toggle_recipe_like(member_id, recipe_id):
+    """
+    좋아요 토글을 SQL 한 문장으로 처리한다.
+    - 이미 있으면 DELETE, 없으면 INSERT ... ON CONFLICT DO NOTHING
+    - 같은 문장에서 recipe.like_count / 작성자 member_stats.likes_received 를 증감하고 결과를 RETURNING
+    - 취소한 좋아요가 트렌딩 점수에 이미 들어가 있으면 같은 문장에서 뺀다
+
+    exists() 후 create()/delete() 하던 방식과 달리 확인과 변경 사이에 틈이 없어서
+    더블클릭으로 같은 요청이 겹쳐도 중복 INSERT 오류나 카운트 어긋남이 생기지 않는다.
+    (겹친 INSERT 는 한쪽이 DO NOTHING 으로 끝나고 그쪽도 liked=True 를 돌려준다)
+
+    반환: (liked, created, like_count). 레시피가 없으면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH deleted AS (
+                DELETE FROM recipe_like
+                WHERE member_id = %(member_id)s AND recipe_id = %(recipe_id)s
+                RETURNING recipe_id, liked_at
+            ), trending AS (""" + retract_sql("like", "SELECT recipe_id, liked_at FROM deleted") + """
+            ), inserted AS (
+                INSERT INTO recipe_like (member_id, recipe_id, liked_at)
+                SELECT %(member_id)s, recipe_id, now()
+                FROM recipe
+                WHERE recipe_id = %(recipe_id)s AND NOT EXISTS (SELECT 1 FROM deleted)
+                ON CONFLICT (member_id, recipe_id) DO NOTHING
+                RETURNING 1
+            ), author_stats AS (""" + _member_stats_upsert("""
+                SELECT author_id, 0,
+                       (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted),
+                       0, 0
+                FROM recipe
+                WHERE recipe_id = %(recipe_id)s
+                  AND (EXISTS (SELECT 1 FROM inserted) OR EXISTS (SELECT 1 FROM deleted))
+            """) + """)
+            UPDATE recipe
+            SET like_count = like_count
+                             + (SELECT count(*) FROM inserted)
+                             - (SELECT count(*) FROM deleted)
+            WHERE recipe_id = %(recipe_id)s
+            RETURNING NOT EXISTS (SELECT 1 FROM deleted),
+                      EXISTS (SELECT 1 FROM inserted),
+                      like_count
+            """,
+            {"member_id": member_id, "recipe_id": recipe_id},
+        )
+        return cursor.fetchone()
+
+
+
+def create_comment(recipe_id, author_id, content, parent_comment_id=None):
+    """
+    댓글 INSERT 와 recipe.comment_count 증가를 SQL 한 문장으로 처리한다.
+    답글이면 부모 댓글이 같은 레시피에 있어야 INSERT 된다.
+
+    반환: (comment_id, created_at, comment_count).
+          레시피가 없거나 부모 댓글이 이 레시피의 댓글이 아니면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH inserted AS (
+                INSERT INTO recipe_comment (recipe_id, author_id, parent_comment_id, content, created_at)
+                SELECT r.recipe_id, %(author_id)s, %(parent_id)s, %(content)s, now()
+                FROM recipe r
+                WHERE r.recipe_id = %(recipe_id)s
+                  AND (
+                      %(parent_id)s::integer IS NULL
+                      OR EXISTS (
+                          SELECT 1 FROM recipe_comment p
+                          WHERE p.comment_id = %(parent_id)s AND p.recipe_id = r.recipe_id
+                      )
+                  )
+                RETURNING comment_id, created_at
+            )
+            UPDATE recipe r
+            SET comment_count = r.comment_count + 1
+            FROM inserted
+            WHERE r.recipe_id = %(recipe_id)s
+            RETURNING inserted.comment_id, inserted.created_at, r.comment_count
+            """,
+            {
+                "recipe_id": recipe_id,
+                "author_id": author_id,
+                "parent_id": parent_comment_id,
+                "content": content,
+            },
+        )
+        return cursor.fetchone()
+
+
+def delete_comment(comment_id):
+    """
+    댓글과 그 아래 답글 전체를 지우고 recipe.comment_count 를 지운 개수만큼 줄인다 (SQL 한 문장).
+    지운 댓글의 트렌딩 점수도 같은 문장에서 뺀다.
+    반환: (recipe_id, 지운 댓글 수, comment_count). 댓글이 없으면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH RECURSIVE subtree AS (
+                SELECT comment_id, recipe_id FROM recipe_comment WHERE comment_id = %s
+              UNION ALL
+                SELECT c.comment_id, c.recipe_id
+                FROM recipe_comment c
+                JOIN subtree s ON c.parent_comment_id = s.comment_id
+            ), deleted AS (
+                DELETE FROM recipe_comment c
+                USING subtree s
+                WHERE c.comment_id = s.comment_id
+                RETURNING c.recipe_id, c.created_at
+            ), trending AS (""" + retract_sql("comment", "SELECT recipe_id, created_at FROM deleted") + """
+            ), removed AS (
+                SELECT recipe_id, count(*) AS n FROM deleted GROUP BY recipe_id
+            )
+            UPDATE recipe r
+            SET comment_count = greatest(r.comment_count - removed.n, 0)
+            FROM removed
+            WHERE r.recipe_id = removed.recipe_id
+            RETURNING r.recipe_id, removed.n, r.comment_count
+            """,
+            [comment_id],
+        )
+        return cursor.fetchone()
+
+
+def _rating_summary(cursor, recipe_id):
+    """
+    평점 쓰기 뒤 recipe.avg_score / rating_count 를 다시 읽는다 (PK 조회 1번).
+    집계는 DB 트리거가 갱신하는데 트리거 결과는 같은 문장의 RETURNING 에서 보이지 않으므로,
+    집계 식을 여기서 따라 계산하지 않고 트리거가 쓴 값을 그대로 돌려준다.
+    """
+    cursor.execute(
+        "SELECT avg_score, rating_count FROM recipe WHERE recipe_id = %s",
+        [recipe_id],
+    )
+    return cursor.fetchone()
+
+
+def upsert_rating(member_id, recipe_id, score):
+    """
+    평점 등록/수정을 SQL 한 문장으로 처리하고 (작성자 member_stats 도 같이 갱신) 새 평균/개수를 읽는다.
+    반환: (created, score, avg_score, rating_count). 레시피가 없으면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH previous AS (
+                SELECT score FROM rating
+                WHERE recipe_id = %(recipe_id)s AND member_id = %(member_id)s
+            ), upserted AS (
+                INSERT INTO rating (recipe_id, member_id, score, created_at)
+                SELECT recipe_id, %(member_id)s, %(score)s, now()
+                FROM recipe
+                WHERE recipe_id = %(recipe_id)s
+                ON CONFLICT (recipe_id, member_id) DO UPDATE SET score = EXCLUDED.score
+                RETURNING score, (xmax = 0) AS created
+            ), author_stats AS (""" + _member_stats_upsert("""
+                SELECT r.author_id, 0, 0,
+                       u.score - coalesce((SELECT score FROM previous), 0),
+                       u.created::integer
+                FROM upserted u
+                JOIN recipe r ON r.recipe_id = %(recipe_id)s
+            """) + """)
+            SELECT created, score FROM upserted
+            """,
+            {"member_id": member_id, "recipe_id": recipe_id, "score": score},
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return (*row, *_rating_summary(cursor, recipe_id))
+
+
+def delete_rating(member_id, recipe_id):
+    """
+    평점 삭제를 SQL 한 문장으로 처리하고 (작성자 member_stats, 트렌딩 점수도 같이 갱신) 새 평균/개수를 읽는다.
+    반환: (avg_score, rating_count). 삭제할 평점이 없으면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH deleted AS (
+                DELETE FROM rating
+                WHERE recipe_id = %(recipe_id)s AND member_id = %(member_id)s
+                RETURNING recipe_id, score, created_at
+            ), trending AS (""" + retract_sql("rating", "SELECT recipe_id, created_at FROM deleted") + """
+            ), author_stats AS (""" + _member_stats_upsert("""
+                SELECT r.author_id, 0, 0, -d.score, -1
+                FROM deleted d
+                JOIN recipe r ON r.recipe_id = %(recipe_id)s
+            """) + """)
+            SELECT count(*) FROM deleted
+            """,
+            {"member_id": member_id, "recipe_id": recipe_id},
+        )
+        if not cursor.fetchone()[0]:
+            return None
+        return _rating_summary(cursor, recipe_id)
+
+
+def import_ratings(rows):
+    """
+    평점 일괄 등록 (기존 시스템 이관용).
+    rows: [(recipe_id, member_id, score, created_at 또는 None)], (recipe_id, member_id) 중복 없음.
+
+    배열 파라미터를 unnest 해서 한 문장으로 넣는다.
+    - 이미 있는 평점: UPDATE (created_at 은 값을 준 경우에만 바꾼다)
+    - 없는 평점: INSERT (created_at 을 안 주면 now())
+    작성자별 member_stats 평점 합/개수도 같은 문장에서 반영한다.
+    존재하지 않는 레시피/회원 행은 JOIN 에서 걸러져 건너뛴다.
+    문장 도중 다른 요청이 같은 (recipe_id, member_id) 평점을 먼저 넣은 경우도 그 평점을 두고 건너뛴다.
+    반환: [(recipe_id, created)] 실제 반영된 행
+    """
+    if not rows:
+        return []
+    recipe_ids, member_ids, scores, created_ats = (list(column) for column in zip(*rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH v AS (
+                SELECT *
+                FROM unnest(%s::integer[], %s::integer[], %s::integer[], %s::timestamptz[])
+                     AS v (recipe_id, member_id, score, created_at)
+            ), previous AS (
+                SELECT g.recipe_id, g.member_id, g.score
+                FROM rating g
+                JOIN v ON v.recipe_id = g.recipe_id AND v.member_id = g.member_id
+            ), updated AS (
+                UPDATE rating g
+                SET score = v.score,
+                    created_at = coalesce(v.created_at, g.created_at)
+                FROM v
+                WHERE g.recipe_id = v.recipe_id AND g.member_id = v.member_id
+                RETURNING g.recipe_id, g.member_id, g.score, false AS created
+            ), inserted AS (
+                INSERT INTO rating (recipe_id, member_id, score, created_at)
+                SELECT r.recipe_id, m.member_id, v.score, coalesce(v.created_at, now())
+                FROM v
+                JOIN recipe r ON r.recipe_id = v.recipe_id
+                JOIN member m ON m.member_id = v.member_id
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM previous p
+                    WHERE p.recipe_id = v.recipe_id AND p.member_id = v.member_id
+                )
+                ON CONFLICT (recipe_id, member_id) DO NOTHING
+                RETURNING recipe_id, member_id, score, true AS created
+            ), upserted AS (
+                SELECT * FROM updated
+                UNION ALL
+                SELECT * FROM inserted
+            ), author_stats AS (""" + _member_stats_upsert("""
+                SELECT r.author_id, 0, 0,
+                       sum(u.score - coalesce(p.score, 0)),
+                       count(*) FILTER (WHERE u.created)
+                FROM upserted u
+                JOIN recipe r ON r.recipe_id = u.recipe_id
+                LEFT JOIN previous p ON p.recipe_id = u.recipe_id AND p.member_id = u.member_id
+                GROUP BY r.author_id
+            """) + """)
+            SELECT recipe_id, created FROM upserted
+            """,
+            [recipe_ids, member_ids, scores, created_ats],
+        )
+        return cursor.fetchall()
+
+
+def toggle_follow(follower_id, followee_id):
+    """
+    팔로우 토글을 SQL 한 문장으로 처리 (toggle_recipe_like 와 같은 방식).
+    follow 행 DELETE/INSERT 와 두 회원의 follower_count / following_count 증감을 함께 한다.
+    두 member 행은 UPDATE 한 번으로 (member_id 순으로) 잠그므로 맞팔 요청이 겹쳐도 교착되지 않는다.
+
+    반환: (following, created, followee 의 follower_count). 상대 회원이 없으면 None.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH deleted AS (
+                DELETE FROM follow
+                WHERE follower_id = %(follower_id)s AND followee_id = %(followee_id)s
+                RETURNING 1
+            ), inserted AS (
+                INSERT INTO follow (follower_id, followee_id, followed_at)
+                SELECT %(follower_id)s, member_id, now()
+                FROM member
+                WHERE member_id = %(followee_id)s AND NOT EXISTS (SELECT 1 FROM deleted)
+                ON CONFLICT (follower_id, followee_id) DO NOTHING
+                RETURNING 1
+            ), delta AS (
+                SELECT (SELECT count(*) FROM inserted) - (SELECT count(*) FROM deleted) AS n
+            )
+            UPDATE member m
+            SET follower_count = m.follower_count
+                    + CASE WHEN m.member_id = %(followee_id)s THEN delta.n ELSE 0 END,
+                following_count = m.following_count
+                    + CASE WHEN m.member_id = %(follower_id)s THEN delta.n ELSE 0 END
+            FROM delta
+            WHERE m.member_id IN (%(follower_id)s, %(followee_id)s)
+            RETURNING m.member_id,
+                      NOT EXISTS (SELECT 1 FROM deleted),
+                      EXISTS (SELECT 1 FROM inserted),
+                      m.follower_count
+            """,
+            {"follower_id": follower_id, "followee_id": followee_id},
+        )
+        for member_id, following, created, follower_count in cursor.fetchall():
+            if member_id == followee_id:
+                return following, created, follower_count
+    return None
+
+
+def followed_member_ids(member, member_ids):
+    """member_ids 중 member 가 팔로우하는 회원 id 집합 (쿼리 1번)"""
+    member_ids = list(member_ids)
+    if not member_ids:
+        return set()
+    return set(
+        Follow.objects
+        .filter(follower=member, followee_id__in=member_ids)
+        .values_list("followee_id", flat=True)
+    )
+
+
+def comment_threads(recipe_id, root_ids=None, max_depth=None):
+    """
+    레시피 댓글을 루트 댓글 단위 스레드(트리)로 읽는다.
+    재귀 CTE 한 문장으로 루트부터 답글을 내려가며 작성자/답글 수까지 함께 읽고,
+    (depth, created_at, comment_id) 순으로 오므로 부모가 항상 먼저 나와서 Python 에서 한 번 훑어 조립한다 (O(n)).
+
+    - root_ids: 이 루트 댓글들의 스레드만 (페이지 단위). None 이면 레시피의 모든 루트 댓글
+    - max_depth: 루트 아래 이 깊이까지만 답글을 읽는다. 더 깊은 답글은 reply_count 로만 알 수 있다.
+
+    반환: 루트 RecipeComment 목록 (root_ids 를 주면 그 순서, 아니면 작성순).
+          각 댓글에 reply_count(바로 아래 답글 수) / thread_replies(읽은 답글 목록) 가 붙는다.
+    """
+    if root_ids is not None:
+        root_ids = list(root_ids)
+        if not root_ids:
+            return []
+
+    root_filter = "" if root_ids is None else "AND c.comment_id = ANY(%(root_ids)s)"
+    depth_filter = "" if max_depth is None else "WHERE t.depth < %(max_depth)s"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH RECURSIVE tree AS (
+                SELECT c.comment_id, c.parent_comment_id, c.author_id, c.content, c.created_at,
+                       0 AS depth
+                FROM recipe_comment c
+                WHERE c.recipe_id = %(recipe_id)s AND c.parent_comment_id IS NULL {root_filter}
+              UNION ALL
+                SELECT c.comment_id, c.parent_comment_id, c.author_id, c.content, c.created_at,
+                       t.depth + 1
+                FROM tree t
+                JOIN recipe_comment c ON c.parent_comment_id = t.comment_id
+                {depth_filter}
+            )
+            SELECT t.comment_id, t.parent_comment_id, t.content, t.created_at,
+                   m.member_id, m.login_id, m.name, m.role,
+                   (SELECT count(*) FROM recipe_comment r WHERE r.parent_comment_id = t.comment_id)
+            FROM tree t
+            JOIN member m ON m.member_id = t.author_id
+            ORDER BY t.depth, t.created_at, t.comment_id
+            """,
+            {"recipe_id": recipe_id, "root_ids": root_ids, "max_depth": max_depth},
+        )
+        rows = cursor.fetchall()
+
+    by_id = {}
+    roots = []
+    for (comment_id, parent_id, content, created_at,
+         member_id, login_id, name, role, reply_count) in rows:
+        comment = RecipeComment(
+            comment_id=comment_id,
+            recipe_id=recipe_id,
+            author_id=member_id,
+            parent_comment_id=parent_id,
+            content=content,
+            created_at=created_at,
+        )
+        comment.author = Member(member_id=member_id, login_id=login_id, name=name, role=role)
+        comment.reply_count = reply_count
+        comment.thread_replies = []
+        by_id[comment_id] = comment
+        if parent_id is None:
+            roots.append(comment)
+        else:
+            by_id[parent_id].thread_replies.append(comment)
+
+    if root_ids is not None:
+        roots = [by_id[pk] for pk in root_ids if pk in by_id]
+    return roots
@@ -0,0 +1,81 @@
+"""
+이용 제한(제재) 확인.
+
+쓰기 API(레시피 작성, 댓글, 평점, 좋아요)는 요청마다 user_sanction 을 조회하지 않고
+회원별로 캐시한 "제한 종료 시각" 하나만 현재 시각과 비교한다.
+- 캐시 값: 0 (제한 없음) / 제한 종료 epoch 초 / math.inf (종료 시각 없는 제한)
+- 캐시가 없을 때만 user_sanction 을 한 번 읽는다.
+- 나중에 시작되는 제재가 있으면 그 시작 시각에 캐시가 만료되도록 timeout 을 줄인다.
+- "제한 없음" 은 SANCTION_NEGATIVE_CACHE_TTL 동안만 캐시한다. 다른 워커의 캐시(프로세스별 캐시 백엔드)나
+  앱 밖에서 넣은 제재도 이 시간 안에는 반영된다.
+제재를 만들거나 바꾸면 invalidate_sanction_cache 로 지운다 (신고 처리 API, UserSanction admin 이 커밋 후 호출).
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import UserSanction
+
+# 쓰기를 막지 않는 제재 종류 (그 외 종류는 기간 동안 쓰기 제한)
+SANCTION_NON_BLOCKING_TYPES = tuple(getattr(settings, "SANCTION_NON_BLOCKING_TYPES", ("WARNING",)))
+SANCTION_CACHE_TTL = getattr(settings, "SANCTION_CACHE_TTL", 60 * 60)
+SANCTION_NEGATIVE_CACHE_TTL = getattr(settings, "SANCTION_NEGATIVE_CACHE_TTL", 60)
+
+
+def _cache_key(member_id):
+    return f"sanction:until:{member_id}"
+
+
+def _load_blocked_until(member_id):
+    """
+    user_sanction 에서 지금 적용 중인 제한의 종료 시각(epoch 초)과 캐시 유지 시간을 구한다.
+    start_at 이 없으면 즉시 시작, end_at 이 없으면 종료 없음으로 본다.
+    """
+    now = timezone.now()
+    rows = (
+        UserSanction.objects
+        .filter(member_id=member_id)
+        .exclude(sanction__in=SANCTION_NON_BLOCKING_TYPES)
+        .filter(Q(end_at__isnull=True) | Q(end_at__gt=now))
+        .values_list("start_at", "end_at")
+    )
+
+    blocked_until = 0.0
+    next_start = None
+    for start_at, end_at in rows:
+        if start_at is not None and start_at > now:
+            next_start = start_at if next_start is None else min(next_start, start_at)
+            continue
+        until = math.inf if end_at is None else end_at.timestamp()
+        blocked_until = max(blocked_until, until)
+
+    timeout = SANCTION_CACHE_TTL if blocked_until else SANCTION_NEGATIVE_CACHE_TTL
+    if next_start is not None:
+        # 아직 시작 전인 제재: 시작 시각에 다시 읽도록
+        timeout = min(timeout, max(int((next_start - now).total_seconds()), 1))
+    return blocked_until, timeout
+
+
+def sanction_blocked_until(member_id):
+    """
+    제한 중이면 종료 시각(epoch 초, 종료 없음이면 math.inf), 아니면 None.
+    캐시에 있으면 쿼리 없이 판단한다.
+    """
+    key = _cache_key(member_id)
+    blocked_until = cache.get(key)
+    if blocked_until is None:
+        blocked_until, timeout = _load_blocked_until(member_id)
+        cache.set(key, blocked_until, timeout)
+
+    if blocked_until > time.time():
+        return blocked_until
+    return None
+
+
+def invalidate_sanction_cache(member_id):
+    """제재가 새로 생기거나 바뀌었을 때 호출 (트랜잭션 안이면 커밋 후에 호출할 것)"""
+    cache.delete(_cache_key(member_id))
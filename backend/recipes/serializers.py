@@ -1,5 +1,11 @@
+from django.conf import settings
 from django.contrib.auth.hashers import make_password, check_password
+from django.db import transaction
 from rest_framework import serializers
+from .cache import bump_recipe_detail_version
+from .feed import schedule_fan_out
+from .images import schedule_recipe_image
+from .queries import add_member_recipes
 from .models import (
     Member,
     Recipe,
@@ -14,9 +20,53 @@ from .models import (
     Report,
 )
 
+class ViewerStateFieldsMixin(serializers.Serializer):
+    """
+    목록 카드용 로그인 사용자 기준 값 (is_liked, my_score, is_following_author).
+    View 가 serializer context 에 viewer_state ({recipe_id: (is_liked, my_score, is_following_author)}) 를
+    넘긴 경우에만 응답에 포함한다. (views.ViewerStateListMixin 이 페이지 단위로 한 번에 조회해서 넘김)
+    """
+    VIEWER_FIELDS = ("is_liked", "my_score", "is_following_author")
+    _EMPTY_STATE = (False, None, False)
+
+    is_liked = serializers.SerializerMethodField()
+    my_score = serializers.SerializerMethodField()
+    is_following_author = serializers.SerializerMethodField()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if "viewer_state" not in self.context:
+            for name in self.VIEWER_FIELDS:
+                fields.pop(name, None)
+        return fields
+
+    def _viewer_state(self, obj):
+        return self.context["viewer_state"].get(obj.recipe_id, self._EMPTY_STATE)
+
+    def get_is_liked(self, obj):
+        return self._viewer_state(obj)[0]
+
+    def get_my_score(self, obj):
+        return self._viewer_state(obj)[1]
+
+    def get_is_following_author(self, obj):
+        return self._viewer_state(obj)[2]
+
+
 class MemberMeSerializer(serializers.ModelSerializer):
-    recipe_count = serializers.IntegerField(read_only=True)
-    like_received_count = serializers.IntegerField(read_only=True)
+    """
+    마이페이지 프로필. 통계는 member_stats 행(obj.stats)에서 읽는다.
+    (View 가 select_related("stats") 로 같이 읽음. 아직 행이 없는 새 회원은 0)
+    """
+    recipe_count = serializers.SerializerMethodField()
+    like_received_count = serializers.SerializerMethodField()
+    rating_received_count = serializers.SerializerMethodField()
+    avg_rating_received = serializers.DecimalField(
+        source="stats.avg_rating_received",
+        max_digits=3,
+        decimal_places=2,
+        read_only=True,
+    )
 
     class Meta:
         model = Member
@@ -27,9 +77,27 @@ class MemberMeSerializer(serializers.ModelSerializer):
             "created_at",
             "recipe_count",
             "like_received_count",
+            "rating_received_count",
+            "avg_rating_received",
+            "follower_count",
+            "following_count",
         )
 
-class MyRecipeSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def _stat(obj, name):
+        stats = getattr(obj, "stats", None)
+        return getattr(stats, name) if stats is not None else 0
+
+    def get_recipe_count(self, obj):
+        return self._stat(obj, "recipe_count")
+
+    def get_like_received_count(self, obj):
+        return self._stat(obj, "likes_received")
+
+    def get_rating_received_count(self, obj):
+        return self._stat(obj, "rating_count")
+
+class MyRecipeSerializer(ViewerStateFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Recipe
         fields = (
@@ -38,6 +106,10 @@ class MyRecipeSerializer(serializers.ModelSerializer):
             "description",
             "cooking_time",
             "image_path",
+            "image_variants",
+            "is_liked",
+            "my_score",
+            "is_following_author",
         )
 
 
@@ -47,6 +119,29 @@ class MemberSimpleSerializer(serializers.ModelSerializer):
         fields = ('member_id', 'login_id', 'name', 'role')
 
 
+class MemberFollowSerializer(MemberSimpleSerializer):
+    """
+    팔로워/팔로잉 목록 항목.
+    is_following: 로그인 사용자가 이 회원을 팔로우하는지 (View 가 context["followed_ids"] 로 페이지 단위 조회해서 넘김)
+    """
+    followed_at = serializers.DateTimeField(read_only=True)
+    is_following = serializers.SerializerMethodField()
+
+    class Meta(MemberSimpleSerializer.Meta):
+        fields = MemberSimpleSerializer.Meta.fields + (
+            'follower_count',
+            'following_count',
+            'followed_at',
+            'is_following',
+        )
+
+    def get_is_following(self, obj):
+        followed_ids = self.context.get("followed_ids")
+        if followed_ids is None:
+            return None
+        return obj.member_id in followed_ids
+
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
@@ -67,7 +162,7 @@ class RecipeStepSerializer(serializers.ModelSerializer):
         fields = ('step_id', 'step_order', 'content')
 
 
-class RecipeListSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(ViewerStateFieldsMixin, serializers.ModelSerializer):
     author = MemberSimpleSerializer(read_only=True)
     tags = serializers.SerializerMethodField()
 
@@ -79,9 +174,15 @@ class RecipeListSerializer(serializers.ModelSerializer):
             'author',
             'avg_score',
             'rating_count',
+            'like_count',
+            'comment_count',
             'image_path',
+            'image_variants',
             'created_at',
             'tags',
+            'is_liked',
+            'my_score',
+            'is_following_author',
         )
 
     def get_tags(self, obj):
@@ -90,10 +191,45 @@ class RecipeListSerializer(serializers.ModelSerializer):
         return TagSerializer(tag_objs, many=True).data
 
 
+class IngredientMatchSerializer(RecipeListSerializer):
+    """
+    재료 기반 검색 결과 카드.
+    matched_count 등은 View 에서 IngredientIndex.match() 결과를 인스턴스에 붙여서 넘긴다.
+    """
+    matched_count = serializers.IntegerField(read_only=True)
+    ingredient_count = serializers.IntegerField(read_only=True)
+    coverage = serializers.FloatField(read_only=True)
+    missing_ingredients = serializers.ListField(
+        child=serializers.CharField(), read_only=True,
+    )
+
+    class Meta(RecipeListSerializer.Meta):
+        fields = RecipeListSerializer.Meta.fields + (
+            'matched_count',
+            'ingredient_count',
+            'coverage',
+            'missing_ingredients',
+        )
+
+
+class IngredientMatchQuerySerializer(serializers.Serializer):
+    """
+    재료 기반 검색 파라미터: ?ingredients=김치,두부&limit=20
+    """
+    ingredients = serializers.CharField()
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_ingredients(self, value):
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        if not names:
+            raise serializers.ValidationError("재료를 하나 이상 입력해주세요.")
+        return names
+
+
 class RecipeDetailSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.name", read_only=True)
     tags = serializers.SerializerMethodField()
-    steps = RecipeStepSerializer(many=True, read_only=True)
+    steps = serializers.SerializerMethodField()
     ingredients = serializers.SerializerMethodField()
 
     class Meta:
@@ -105,21 +241,37 @@ class RecipeDetailSerializer(serializers.ModelSerializer):
             'description',
             'cooking_time',
             'image_path',
+            'image_variants',
             'created_at',
             'updated_at',
             'avg_score',
             'rating_count',
+            'like_count',
+            'comment_count',
             'tags',
             'steps',
             'ingredients',
         )
 
+    # queries.recipe_detail_queryset() 로 읽은 경우 tag_names / steps_data / ingredients_data
+    # annotation 이 이미 붙어 있으므로 추가 쿼리 없이 그대로 사용한다.
+
     def get_tags(self, obj):
         # JS가 ["한식","간단"] 형식을 기대하므로 이름만 리스트로 반환
+        if hasattr(obj, "tag_names"):
+            return obj.tag_names or []
         return [rt.tag.name for rt in obj.recipe_tags.all()]
 
+    def get_steps(self, obj):
+        if hasattr(obj, "steps_data"):
+            return obj.steps_data or []
+        steps = obj.steps.order_by("step_order", "step_id")
+        return RecipeStepSerializer(steps, many=True).data
+
     def get_ingredients(self, obj):
         # JS가 [{name, amount}] 형식을 기대하므로 키를 name으로 맞추기
+        if hasattr(obj, "ingredients_data"):
+            return obj.ingredients_data or []
         ri_qs = obj.recipe_ingredients.all()
         return [
             {
@@ -142,6 +294,21 @@ class RecipeCommentSerializer(serializers.ModelSerializer):
             'parent_comment',
         )
 
+
+class RecipeCommentThreadSerializer(RecipeCommentSerializer):
+    """
+    댓글 스레드 (queries.comment_threads 결과).
+    reply_count: 바로 아래 답글 수 / replies: 읽어 온 답글 (깊이 제한으로 잘렸으면 reply_count 보다 적을 수 있음)
+    """
+    reply_count = serializers.IntegerField(read_only=True)
+    replies = serializers.SerializerMethodField()
+
+    class Meta(RecipeCommentSerializer.Meta):
+        fields = RecipeCommentSerializer.Meta.fields + ('reply_count', 'replies')
+
+    def get_replies(self, obj):
+        return type(self)(obj.thread_replies, many=True, context=self.context).data
+
 # ============================
 # 회원가입 / 로그인 Serializer
 # ============================
@@ -216,38 +383,60 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         )
 
     def _set_tags(self, recipe, tag_ids):
-        # 기존 태그 연결 삭제
-        RecipeTag.objects.filter(recipe=recipe).delete()
+        # 전부 지웠다가 다시 넣지 않고 바뀐 것만 반영 → 다른 요청에는 이전/이후 태그 집합 중 하나만 보인다
+        with transaction.atomic():
+            # 같은 레시피의 태그를 동시에 바꾸는 요청은 레시피 행 잠금으로 직렬화
+            list(Recipe.objects.select_for_update().filter(pk=recipe.pk).values_list('pk', flat=True))
+
+            # 유효한 태그만 연결
+            wanted = set(
+                Tag.objects.filter(tag_id__in=tag_ids or []).values_list('tag_id', flat=True)
+            )
+            current = set(
+                RecipeTag.objects.filter(recipe=recipe).values_list('tag_id', flat=True)
+            )
 
-        if not tag_ids:
-            return
+            if current - wanted:
+                RecipeTag.objects.filter(recipe=recipe, tag_id__in=current - wanted).delete()
+            RecipeTag.objects.bulk_create([
+                RecipeTag(recipe=recipe, tag_id=tag_id)
+                for tag_id in sorted(wanted - current)
+            ])
 
-        # 유효한 태그만 조회해서 연결
-        tag_qs = Tag.objects.filter(tag_id__in=tag_ids)
-        recipe_tag_objs = [
-            RecipeTag(recipe=recipe, tag=tag)
-            for tag in tag_qs
-        ]
-        RecipeTag.objects.bulk_create(recipe_tag_objs)
+        bump_recipe_detail_version(recipe.recipe_id)
 
     def create(self, validated_data):
         request = self.context['request']
         tag_ids = validated_data.pop('tag_ids', [])
 
         # author는 JWT 인증된 Member
-        recipe = Recipe.objects.create(
-            author=request.user,
-            **validated_data,
-        )
-        self._set_tags(recipe, tag_ids)
+        with transaction.atomic():
+            recipe = Recipe.objects.create(
+                author=request.user,
+                **validated_data,
+            )
+            add_member_recipes(recipe.author_id)
+            self._set_tags(recipe, tag_ids)
+        schedule_recipe_image(recipe.recipe_id, recipe.image_path)
+        schedule_fan_out(recipe.recipe_id)
         return recipe
 
     def update(self, instance, validated_data):
         tag_ids = validated_data.pop('tag_ids', None)
+        image_changed = (
+            'image_path' in validated_data
+            and validated_data['image_path'] != instance.image_path
+        )
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
+        if image_changed:
+            # 이전 이미지의 variant 는 버리고 새로 만든다
+            instance.image_variants = None
         instance.save()
+        bump_recipe_detail_version(instance.recipe_id)
+        if image_changed:
+            schedule_recipe_image(instance.recipe_id, instance.image_path)
 
         # tag_ids 가 들어온 경우에만 태그 갱신
         if tag_ids is not None:
@@ -269,8 +458,35 @@ class RatingCreateUpdateSerializer(serializers.Serializer):
     score = serializers.IntegerField(min_value=1, max_value=5)
 
 
+class RatingImportItemSerializer(serializers.Serializer):
+    recipe_id = serializers.IntegerField()
+    member_id = serializers.IntegerField()
+    score = serializers.IntegerField(min_value=1, max_value=5)
+    created_at = serializers.DateTimeField(required=False, allow_null=True, default=None)
+
+
+class RatingImportSerializer(serializers.Serializer):
+    """
+    평점 일괄 등록 요청: {"ratings": [{recipe_id, member_id, score, created_at}, ...]}
+    한 요청은 RATING_IMPORT_MAX_BATCH 건까지. 같은 (recipe_id, member_id) 가 여러 번 오면 마지막 값을 쓴다.
+    """
+    ratings = RatingImportItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=getattr(settings, "RATING_IMPORT_MAX_BATCH", 1000),
+    )
+
+    def validate_ratings(self, value):
+        latest = {}
+        for item in value:
+            latest[(item["recipe_id"], item["member_id"])] = item
+        return list(latest.values())
+
+
 class RecipeCommentCreateSerializer(serializers.Serializer):
     content = serializers.CharField()
+    # 답글이면 부모 댓글 id (같은 레시피의 댓글이어야 함 — View 에서 확인)
+    parent_comment_id = serializers.IntegerField(required=False, allow_null=True)
 
     def validate_content(self, value):
         if not value.strip():
@@ -282,7 +498,7 @@ class RecipeCommentCreateSerializer(serializers.Serializer):
 # 인기 레시피 Serializer
 # ============================
 
-class PopularRecipeSerializer(serializers.ModelSerializer):
+class PopularRecipeSerializer(ViewerStateFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = RecipeSummary
         fields = (
@@ -294,6 +510,9 @@ class PopularRecipeSerializer(serializers.ModelSerializer):
             'rating_count',
             'like_count',
             'comment_count',
+            'is_liked',
+            'my_score',
+            'is_following_author',
         )
 
 
@@ -338,6 +557,48 @@ class ReportListSerializer(serializers.ModelSerializer):
         )
 
 
+class ReportedRecipePreviewSerializer(serializers.ModelSerializer):
+    author = MemberSimpleSerializer(read_only=True)
+
+    class Meta:
+        model = Recipe
+        fields = ('recipe_id', 'title', 'author')
+
+
+class ReportedCommentPreviewSerializer(serializers.ModelSerializer):
+    author = MemberSimpleSerializer(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = RecipeComment
+        fields = ('comment_id', 'recipe_id', 'snippet', 'author')
+
+
+class ModerationQueueItemSerializer(serializers.Serializer):
+    """
+    관리자 신고 처리 큐 항목 (신고 대상 하나에 대한 PENDING 신고 묶음, moderation.py 참고)
+    target: 대상 미리보기 (삭제된 대상이면 null)
+    """
+    target_type = serializers.CharField()
+    target_id = serializers.IntegerField()
+    recipe_id = serializers.IntegerField(allow_null=True)
+    comment_id = serializers.IntegerField(allow_null=True)
+    report_count = serializers.IntegerField()
+    first_reported_at = serializers.DateTimeField(allow_null=True)
+    last_reported_at = serializers.DateTimeField(allow_null=True)
+    report_ids = serializers.ListField(child=serializers.IntegerField())
+    recent_reasons = serializers.ListField(child=serializers.CharField())
+    target = serializers.SerializerMethodField()
+
+    def get_target(self, row):
+        target = row.get("target")
+        if target is None:
+            return None
+        if isinstance(target, RecipeComment):
+            return ReportedCommentPreviewSerializer(target).data
+        return ReportedRecipePreviewSerializer(target).data
+
+
 class ReportUpdateSerializer(serializers.Serializer):
     """
     관리자 신고 처리용
@@ -348,8 +609,36 @@ class ReportUpdateSerializer(serializers.Serializer):
     )
     handle_note = serializers.CharField(required=False, allow_blank=True)
 
+class ReportBulkUpdateSerializer(serializers.Serializer):
+    """
+    관리자 신고 일괄 처리: report_ids 또는 (target_type, target_id) 중 하나를 준다.
+    target 이면 그 대상에 쌓인 PENDING 신고 전체를 처리한다.
+    """
+    status = serializers.ChoiceField(choices=['RESOLVED', 'REJECTED'])
+    handle_note = serializers.CharField(required=False, allow_blank=True)
+    report_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=getattr(settings, "MODERATION_BULK_MAX_REPORTS", 500),
+    )
+    target_type = serializers.ChoiceField(choices=['RECIPE', 'COMMENT'], required=False)
+    target_id = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        has_ids = 'report_ids' in attrs
+        has_target = 'target_type' in attrs or 'target_id' in attrs
+        if has_ids == has_target:
+            raise serializers.ValidationError("report_ids 또는 target_type/target_id 중 하나만 입력해주세요.")
+        if has_target and not ('target_type' in attrs and 'target_id' in attrs):
+            raise serializers.ValidationError("target_type 과 target_id 를 함께 입력해주세요.")
+        if has_ids:
+            attrs['report_ids'] = sorted(set(attrs['report_ids']))
+        return attrs
+
 # recipes/serializers.py
 
+from django.db import transaction
 from rest_framework import serializers
 from .models import Recipe, Ingredient, RecipeIngredient, RecipeStep
 
@@ -379,27 +668,64 @@ class RecipeCreateSerializer(serializers.ModelSerializer):
             'steps',
         ]
 
+    def _ingredient_ids(self, names):
+        """
+        재료 이름 → ingredient_id.
+        이미 있는 이름은 SELECT 1번, 없는 이름은 upsert 1번(RETURNING)으로 한꺼번에 만든다.
+        (동시에 같은 이름을 만드는 요청이 있어도 ON CONFLICT 로 기존 id 를 돌려받는다)
+        """
+        ids = dict(
+            Ingredient.objects.filter(name__in=names).values_list("name", "ingredient_id")
+        )
+        missing = [name for name in names if name not in ids]
+        if missing:
+            created = Ingredient.objects.bulk_create(
+                [Ingredient(name=name) for name in missing],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=["name"],
+            )
+            ids.update((ing.name, ing.ingredient_id) for ing in created)
+        return ids
+
     def create(self, validated_data):
         ingredients_data = validated_data.pop("ingredients", [])
         steps_data = validated_data.pop("steps", [])
 
-        recipe = Recipe.objects.create(**validated_data)
-
-        # 1) 재료 저장
+        # 같은 재료가 여러 번 들어오면 처음 것만 사용 (recipe_ingredient 는 (recipe, ingredient) 유일)
+        amounts = {}
         for item in ingredients_data:
-            ing, _ = Ingredient.objects.get_or_create(name=item["name"])
-            RecipeIngredient.objects.create(
-                recipe=recipe,
-                ingredient=ing,
-                amount=item.get("amount")
-            )
-
-        # 2) 단계 저장
-        for step in steps_data:
-            RecipeStep.objects.create(
-                recipe=recipe,
-                step_order=step["step_order"],
-                content=step["content"]
-            )
-
+            amounts.setdefault(item["name"].strip(), item.get("amount"))
+
+        # 중간에 실패하면 레시피/재료/단계가 일부만 남지 않도록 한 트랜잭션으로
+        with transaction.atomic():
+            recipe = Recipe.objects.create(**validated_data)
+            add_member_recipes(recipe.author_id)
+
+            # 1) 재료 저장
+            if amounts:
+                ingredient_ids = self._ingredient_ids(list(amounts))
+                RecipeIngredient.objects.bulk_create([
+                    RecipeIngredient(
+                        recipe=recipe,
+                        ingredient_id=ingredient_ids[name],
+                        amount=amount,
+                    )
+                    for name, amount in amounts.items()
+                ])
+
+            # 2) 단계 저장
+            RecipeStep.objects.bulk_create([
+                RecipeStep(
+                    recipe=recipe,
+                    step_order=step["step_order"],
+                    content=step["content"],
+                )
+                for step in steps_data
+            ])
+
+            bump_recipe_detail_version(recipe.recipe_id)
+            # 재료 역색인 버전은 recipe_ingredient 트리거가 올린다 (ingredient_index.py)
+            # 팔로워 피드에 넣기 (커밋 후)
+            schedule_fan_out(recipe.recipe_id)
         return recipe
@@ -1,3 +1,2006 @@
-from django.test import TestCase
+import base64
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin import site as admin_site
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .authentication import (
+    JWTAuthentication,
+    TokenMember,
+    invalidate_member,
+    member_cache,
+)
+from . import authentication, checks, feed, ingredient_index, queries, sanctions, uploads
+from .admin import MemberAdmin, UserSanctionAdmin
+from .ingredient_index import IngredientIndex
+from .images import process_recipe_image
+from .jwt_utils import create_jwt
+from .pagination import KeysetPagination
+from .models import (
+    Ingredient,
+    FeedEntry,
+    Follow,
+    Member,
+    MemberStats,
+    Rating,
+    Recipe,
+    RecipeComment,
+    RecipeIngredient,
+    RecipeLike,
+    RecipePopularity,
+    RecipeSummary,
+    RecipeStep,
+    RecipeTag,
+    RecipeTrending,
+    Report,
+    Tag,
+    TrendingState,
+    UserSanction,
+)
+from .serializers import RecipeCreateSerializer, RecipeCreateUpdateSerializer
+from .throttles import ReportRateThrottle
+from .trending import update_trending
+from .views import (
+    AdminRatingImportAPIView,
+    FollowToggleAPIView,
+    PopularRecipeListAPIView,
+    RecipeLikeToggleAPIView,
+    RecipeRatingAPIView,
+)
+
+
+
+def run_migration_sql(name):
+    """
+    테스트 러너는 recipes 의 RunSQL 마이그레이션을 건너뛰므로,
+    트리거/MV 등 DB 쪽 객체가 필요한 테스트는 해당 마이그레이션 SQL 을 직접 실행한다 (테스트 트랜잭션과 함께 롤백).
+    """
+    migration = importlib.import_module(f"recipes.migrations.{name}").Migration
+    with connection.cursor() as cursor:
+        # setUpTestData 에서 쌓인 지연 FK 검사를 먼저 끝내야 DDL 을 실행할 수 있다
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for operation in migration.operations:
+            cursor.execute(operation.sql)
+
+class RecipeListQueryCountTests(TestCase):
+    """
+    GET /api/recipes/ 는 목록 크기와 관계없이 쿼리 수가 고정되어야 한다.
+    (recipe JOIN member 1회 + recipe_tag JOIN tag prefetch 1회, 페이지 응답이면 facet 집계 1회)
+    """
+
+    LIST_QUERIES = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+        cls.tags = [
+            Tag.objects.create(name=name) for name in ("한식", "간단", "매운맛")
+        ]
+
+    def seed(self, count):
+        recipes = [
+            Recipe.objects.create(
+                author=self.author,
+                title=f"레시피 {i}",
+                description="설명",
+                created_at=timezone.now(),
+            )
+            for i in range(count)
+        ]
+        RecipeTag.objects.bulk_create([
+            RecipeTag(recipe=recipe, tag=self.tags[i % len(self.tags)])
+            for i, recipe in enumerate(recipes)
+        ])
+        return recipes
+
+    def test_list_query_count_is_constant(self):
+        for count in (1, 10, 40):
+            with self.subTest(count=count):
+                RecipeTag.objects.all().delete()
+                Recipe.objects.all().delete()
+                self.seed(count)
+
+                with self.assertNumQueries(self.LIST_QUERIES):
+                    response = self.client.get("/api/recipes/")
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()), count)
+                self.assertTrue(all(len(r["tags"]) == 1 for r in response.json()))
+
+    def test_paginated_list_query_count_is_constant(self):
+        self.seed(30)
+
+        # 페이지 응답에는 태그 facet 집계(GROUP BY 1회)가 추가된다
+        with self.assertNumQueries(self.LIST_QUERIES + 1):
+            response = self.client.get("/api/recipes/", {"page_size": 25})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 25)
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_viewer_state_is_one_query_per_page(self):
+        recipes = self.seed(30)
+        RecipeLike.objects.create(member=self.author, recipe=recipes[-1], liked_at=timezone.now())
+        Rating.objects.create(
+            recipe=recipes[-2], member=self.author, score=4, created_at=timezone.now(),
+        )
+        token = create_jwt(member_id=self.author.member_id, role="COOK")
+
+        # 로그인 사용자: JWT 회원 조회 + facet 집계 + is_liked / my_score 조회 1회 (카드 수와 무관)
+        with self.assertNumQueries(self.LIST_QUERIES + 3):
+            response = self.client.get(
+                "/api/recipes/", {"page_size": 25}, HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+        results = response.json()["results"]
+        self.assertEqual(
+            [(r["is_liked"], r["my_score"]) for r in results[:3]],
+            [(True, None), (False, 4), (False, None)],
+        )
+
+        # 비로그인: 필드 자체가 없다
+        response = self.client.get("/api/recipes/", {"page_size": 25})
+        self.assertNotIn("is_liked", response.json()["results"][0])
+
+    def test_tag_filter_and_facets(self):
+        recipes = self.seed(6)   # 태그가 한식/간단/매운맛 순으로 2개씩
+        korean, quick, spicy = self.tags
+        RecipeTag.objects.bulk_create([RecipeTag(recipe=recipes[0], tag=quick)])
+
+        response = self.client.get(
+            "/api/recipes/",
+            {"page_size": 10, "tags": f"{korean.tag_id},{quick.tag_id}"},
+        )
+        self.assertEqual(
+            [r["recipe_id"] for r in response.json()["results"]],
+            [recipes[0].recipe_id],
+        )
+
+        response = self.client.get(
+            "/api/recipes/",
+            {"page_size": 10, "tags": f"{korean.tag_id},{quick.tag_id}", "tag_mode": "or"},
+        )
+        body = response.json()
+        self.assertEqual(len(body["results"]), 4)
+        self.assertEqual(
+            body["facets"]["tags"],
+            [
+                {"tag_id": quick.tag_id, "name": "간단", "count": 3},
+                {"tag_id": korean.tag_id, "name": "한식", "count": 2},
+            ],
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    cursor 로 끝까지 넘겼다가 previous 로 되돌아와도 행이 빠지거나 겹치지 않아야 한다.
+    created_at 이 같은 행(동점)과 created_at 이 NULL 인 행을 섞어 둔다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Member.objects.create(
+            login_id="pager", password="x", name="요리사", role="COOK", created_at=timezone.now(),
+        )
+        base = timezone.now().replace(microsecond=0)
+        stamps = [None, base, base - timedelta(days=1), base, None, base,
+                  base - timedelta(days=1), base - timedelta(days=2), None, base, base - timedelta(days=1)]
+        cls.recipes = [
+            Recipe.objects.create(author=author, title=f"레시피 {i}", description="", created_at=created_at)
+            for i, created_at in enumerate(stamps)
+        ]
+
+    def expected(self, descending):
+        # PostgreSQL 기본 NULL 정렬: DESC → NULLS FIRST, ASC → NULLS LAST
+        def key(recipe):
+            return (recipe.created_at is None, recipe.created_at or 0, recipe.recipe_id)
+        ordered = sorted(self.recipes, key=key)
+        return [r.recipe_id for r in (ordered[::-1] if descending else ordered)]
+
+    def walk(self, fetch, page_size):
+        """next 로 끝까지, 다시 previous 로 처음까지. 페이지 목록 두 개를 돌려준다."""
+        forward, body = [], fetch(None, page_size)
+        self.assertIsNone(body["previous"])
+        while True:
+            forward.append(body["results"])
+            if body["next"] is None:
+                break
+            self.assertLess(len(forward), len(self.recipes) + 1, "next 가 끝나지 않습니다")
+            body = fetch(body["next"], page_size)
+
+        backward = [body["results"]]
+        while body["previous"] is not None:
+            self.assertLess(len(backward), len(self.recipes) + 1, "previous 가 끝나지 않습니다")
+            body = fetch(body["previous"], page_size)
+            backward.insert(0, body["results"])
+        return forward, backward
+
+    def check(self, fetch, descending):
+        expected = self.expected(descending)
+        for page_size in (1, 2, 3, 4, len(expected), len(expected) + 1):
+            with self.subTest(page_size=page_size):
+                forward, backward = self.walk(fetch, page_size)
+                self.assertEqual([i for page in forward for i in page], expected)
+                self.assertTrue(all(len(page) == page_size for page in forward[:-1]))
+                # previous 로 되돌아온 페이지는 넘어갈 때 본 페이지와 같다
+                self.assertEqual(backward, forward)
+
+    def test_walk_descending_list_endpoint(self):
+        def fetch(url, page_size):
+            if url is None:
+                response = self.client.get("/api/recipes/", {"page_size": page_size})
+            else:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            return {**body, "results": [r["recipe_id"] for r in body["results"]]}
+
+        self.check(fetch, descending=True)
+
+    def test_walk_ascending_with_nulls_last(self):
+        view = SimpleNamespace(cursor_ordering=("created_at", "recipe_id"))
+        factory = APIRequestFactory()
+
+        def fetch(url, page_size):
+            request = Request(factory.get(url or "/recipes/", None if url else {"page_size": page_size}))
+            paginator = KeysetPagination()
+            rows = paginator.paginate_queryset(Recipe.objects.all(), request, view)
+            return {
+                "next": paginator.next_link,
+                "previous": paginator.previous_link,
+                "results": [r.recipe_id for r in rows],
+            }
+
+        self.check(fetch, descending=False)
+
+    def test_tampered_cursor_is_404(self):
+        for values in (["abc", 1], [None, "x"], [None, {"x": 1}], [[1], 1]):
+            with self.subTest(values=values):
+                raw = json.dumps({"v": values, "r": 0}).encode("utf-8")
+                token = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+                response = self.client.get("/api/recipes/", {"cursor": token})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {"detail": "잘못된 cursor 입니다."})
+
+
+class RecipeDetailQueryCountTests(TestCase):
+    """
+    GET /api/recipes/<id>/ 는 단계/재료/태그 개수와 관계없이 SELECT 1번으로 응답해야 한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, title="김치찌개", description="설명",
+            created_at=timezone.now(),
+        )
+        RecipeTag.objects.bulk_create([
+            RecipeTag(recipe=cls.recipe, tag=Tag.objects.create(name="한식")),
+        ])
+        RecipeStep.objects.bulk_create([
+            RecipeStep(recipe=cls.recipe, step_order=order, content=f"단계 {order}")
+            for order in (3, 1, 2)
+        ])
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(
+                recipe=cls.recipe,
+                ingredient=Ingredient.objects.create(name=name),
+                amount=amount,
+            )
+            for name, amount in (("김치", "200g"), ("돼지고기", None))
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_detail_is_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/recipes/{self.recipe.recipe_id}/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["author_name"], "요리사")
+        self.assertEqual(data["tags"], ["한식"])
+        self.assertEqual([s["step_order"] for s in data["steps"]], [1, 2, 3])
+        self.assertCountEqual(
+            data["ingredients"],
+            [{"name": "김치", "amount": "200g"}, {"name": "돼지고기", "amount": ""}],
+        )
+        self.assertIs(data["is_liked"], False)
+
+    def test_missing_recipe_returns_404(self):
+        response = self.client.get("/api/recipes/999999/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_detail_is_invalidated_on_update(self):
+        url = f"/api/recipes/{self.recipe.recipe_id}/"
+        self.client.get(url)
+
+        # 두 번째 요청은 캐시에서 (비로그인이므로 쿼리 0번)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()["title"], "김치찌개")
+
+        serializer = RecipeCreateUpdateSerializer(
+            self.recipe, data={"title": "된장찌개"}, partial=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.json()["title"], "된장찌개")
+
+
+class JWTAuthenticationTests(TestCase):
+    """
+    JWT_STATELESS_AUTH 를 켜면 읽기 요청은 claims 만으로 principal 을 만들고, 필요할 때만 member 행을 읽는다.
+    쓰기 요청은 항상 member 행을 확인한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = Member.objects.create(
+            login_id="user", password="x", name="사용자", role="GOURMET",
+            created_at=timezone.now(),
+        )
+
+    def setUp(self):
+        cache.clear()
+        member_cache.clear()
+        self.token = create_jwt(member_id=self.member.member_id, role="GOURMET")
+        patcher = mock.patch.object(authentication, "JWT_STATELESS_AUTH", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def authenticate(self, method="get"):
+        request = getattr(APIRequestFactory(), method)("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return JWTAuthentication().authenticate(request)[0]
+
+    def test_authenticate_does_not_query_member(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+
+        self.assertIsInstance(user, TokenMember)
+        self.assertEqual(user.member_id, self.member.member_id)
+        self.assertEqual(user.role, "GOURMET")
+
+    def test_full_row_is_loaded_once_through_member_cache(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().name, "사용자")
+            self.assertEqual(self.authenticate().login_id, "user")
+
+    def test_invalidated_member_uses_current_role(self):
+        Member.objects.filter(pk=self.member.pk).update(role="ADMIN")
+        invalidate_member(self.member.member_id)
+
+        user = self.authenticate()
+
+        self.assertNotIsInstance(user, TokenMember)
+        self.assertEqual(user.role, "ADMIN")
+
+    def test_write_uses_current_row(self):
+        # 토큰의 role claim 이 아니라 DB 의 현재 role (무효화 표시가 없어도)
+        Member.objects.filter(pk=self.member.pk).update(role="USER")
+        with self.assertNumQueries(1):
+            user = self.authenticate("post")
+        self.assertNotIsInstance(user, TokenMember)
+        self.assertEqual(user.role, "USER")
+
+    def test_demoted_admin_loses_admin_access(self):
+        admin = Member.objects.create(
+            login_id="admin", password="x", name="관리자", role="ADMIN", created_at=timezone.now(),
+        )
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {create_jwt(member_id=admin.member_id, role='ADMIN')}"}
+        self.assertEqual(self.client.get("/api/admin/reports/", **auth).status_code, 200)
+
+        # admin 화면에서 role 변경 → 무효화
+        admin.role = "USER"
+        form = mock.Mock(changed_data=["role"])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            MemberAdmin(Member, admin_site).save_model(request=None, obj=admin, form=form, change=True)
+        self.assertEqual(len(callbacks), 1)   # 커밋 후에 무효화
+
+        self.assertEqual(self.client.get("/api/admin/reports/", **auth).status_code, 403)
+        response = self.client.post(
+            "/api/admin/reports/bulk/", {"status": "REJECTED", "report_ids": [1]},
+            content_type="application/json", **auth,
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_deleted_member_token_is_rejected(self):
+        gone = Member.objects.create(
+            login_id="gone", password="x", name="탈퇴", role="USER", created_at=timezone.now(),
+        )
+        recipe = Recipe.objects.create(
+            author=self.member, title="레시피", description="설명", created_at=timezone.now(),
+        )
+        token = create_jwt(member_id=gone.member_id, role="USER")
+        gone.delete()
+
+        response = self.client.post(
+            f"/api/recipes/{recipe.recipe_id}/comments/create/", {"content": "댓글"},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(RecipeComment.objects.exists())
+
+    def test_stateless_auth_requires_shared_cache(self):
+        with override_settings(JWT_STATELESS_AUTH=True):
+            errors = checks.check_stateless_auth_cache(None)
+        self.assertEqual([e.id for e in errors], ["recipes.E001"])
+
+        shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(JWT_STATELESS_AUTH=True, CACHES=shared):
+            self.assertEqual(checks.check_stateless_auth_cache(None), [])
+        with override_settings(JWT_STATELESS_AUTH=False):
+            self.assertEqual(checks.check_stateless_auth_cache(None), [])
+
+
+class RecipeLikeToggleTests(TestCase):
+    """
+    좋아요 토글은 문장 하나로 recipe_like 와 recipe.like_count 를 함께 바꾼다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = Member.objects.create(
+            login_id="user", password="x", name="사용자", role="USER",
+            created_at=timezone.now(),
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.member, title="레시피", description="설명",
+            created_at=timezone.now(),
+        )
+
+    def toggle(self, recipe_id=None):
+        request = APIRequestFactory().post("/")
+        force_authenticate(request, user=self.member)
+        return RecipeLikeToggleAPIView.as_view()(
+            request, recipe_id=recipe_id or self.recipe.recipe_id,
+        )
+
+    def like_count(self):
+        return Recipe.objects.values_list("like_count", flat=True).get(pk=self.recipe.pk)
+
+    def test_toggle_updates_like_and_counter_in_one_query(self):
+        # 이용 제한 상태는 캐시에서 읽으므로 미리 채워 둔다
+        sanctions.sanction_blocked_until(self.member.member_id)
+        with self.assertNumQueries(1):
+            response = self.toggle()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"liked": True, "like_count": 1})
+        self.assertEqual(self.like_count(), 1)
+        self.assertTrue(RecipeLike.objects.filter(member=self.member, recipe=self.recipe).exists())
+
+        with self.assertNumQueries(1):
+            response = self.toggle()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"liked": False, "like_count": 0})
+        self.assertEqual(self.like_count(), 0)
+        self.assertFalse(RecipeLike.objects.filter(member=self.member, recipe=self.recipe).exists())
+
+    def test_unknown_recipe(self):
+        self.assertEqual(self.toggle(recipe_id=self.recipe.recipe_id + 1000).status_code, 404)
+        self.assertFalse(RecipeLike.objects.exists())
+
+
+class RatingWriteTests(TestCase):
+    """
+    평점 등록/삭제는 한 문장으로 쓰고, 트리거가 갱신한 recipe 의 새 평균/개수를 돌려준다.
+    """
+
+    # 운영 DB 의 rating → recipe.avg_score / rating_count 트리거 대역 (스키마는 저장소 밖에 있다).
+    # 응답 값이 트리거가 쓴 값과 같은지 확인하려는 용도라 식을 일부러 단순하게 둔다.
+    RATING_TRIGGER_SQL = """
+        CREATE FUNCTION test_rating_aggregate() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE recipe r
+            SET avg_score = s.avg, rating_count = s.n
+            FROM (
+                SELECT round(avg(score)::numeric, 2) AS avg, count(*) AS n
+                FROM rating WHERE recipe_id = coalesce(NEW.recipe_id, OLD.recipe_id)
+            ) s
+            WHERE r.recipe_id = coalesce(NEW.recipe_id, OLD.recipe_id);
+            RETURN NULL;
+        END;
+        $$;
+        CREATE TRIGGER test_rating_aggregate AFTER INSERT OR UPDATE OR DELETE ON rating
+            FOR EACH ROW EXECUTE FUNCTION test_rating_aggregate();
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.members = [
+            Member.objects.create(
+                login_id=f"user{i}", password="x", name=f"회원{i}",
+                role="ADMIN" if i == 0 else "USER", created_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        cls.recipe = Recipe.objects.create(
+            author=cls.members[0], title="레시피", description="설명",
+            created_at=timezone.now(),
+        )
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(self.RATING_TRIGGER_SQL)
+
+    def call(self, view, method, member, data=None, **kwargs):
+        request = getattr(APIRequestFactory(), method)("/", data, format="json")
+        force_authenticate(request, user=member)
+        return view.as_view()(request, **kwargs)
+
+    def rate(self, member, score):
+        return self.call(
+            RecipeRatingAPIView, "post", member, {"score": score},
+            recipe_id=self.recipe.recipe_id,
+        )
+
+    def test_upsert_and_delete_return_aggregates(self):
+        # 평점 쓰기 한 문장 + recipe 집계 읽기
+        with self.assertNumQueries(2):
+            response = self.rate(self.members[1], 4)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data["avg_score"], response.data["rating_count"]), (Decimal("4.00"), 1)
+        )
+
+        response = self.rate(self.members[2], 5)
+        self.assertEqual(response.data["avg_score"], Decimal("4.50"))
+
+        response = self.rate(self.members[1], 1)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["created"])
+        self.assertEqual(
+            (response.data["avg_score"], response.data["rating_count"]), (Decimal("3.00"), 2)
+        )
+
+        with self.assertNumQueries(2):
+            response = self.call(
+                RecipeRatingAPIView, "delete", self.members[1], recipe_id=self.recipe.recipe_id,
+            )
+        self.assertEqual(
+            (response.data["avg_score"], response.data["rating_count"]), (Decimal("5.00"), 1)
+        )
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        self.assertEqual(
+            (response.data["avg_score"], response.data["rating_count"]),
+            (recipe.avg_score, recipe.rating_count),
+        )
+        response = self.call(
+            RecipeRatingAPIView, "delete", self.members[1], recipe_id=self.recipe.recipe_id,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_recipe(self):
+        response = self.call(
+            RecipeRatingAPIView, "post", self.members[1], {"score": 3},
+            recipe_id=self.recipe.recipe_id + 1000,
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_import(self):
+        self.rate(self.members[1], 2)
+        recipe_id = self.recipe.recipe_id
+        response = self.call(AdminRatingImportAPIView, "post", self.members[0], {
+            "ratings": [
+                {"recipe_id": recipe_id, "member_id": self.members[1].member_id, "score": 3},
+                {"recipe_id": recipe_id, "member_id": self.members[1].member_id, "score": 5},
+                {"recipe_id": recipe_id, "member_id": self.members[2].member_id, "score": 4,
+                 "created_at": "2020-01-01T00:00:00Z"},
+                {"recipe_id": recipe_id + 1000, "member_id": self.members[2].member_id, "score": 4},
+            ],
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"created": 1, "updated": 1, "skipped": 1})
+        self.assertEqual(
+            dict(Rating.objects.values_list("member_id", "score")),
+            {self.members[1].member_id: 5, self.members[2].member_id: 4},
+        )
+
+        response = self.call(AdminRatingImportAPIView, "post", self.members[1], {"ratings": []})
+        self.assertEqual(response.status_code, 403)
+
+    def test_reimport_keeps_created_at_unless_given(self):
+        original = timezone.now() - timedelta(days=30)
+        rows = [(self.recipe.recipe_id, self.members[1].member_id, 3, original)]
+        self.assertEqual(queries.import_ratings(rows), [(self.recipe.recipe_id, True)])
+
+        # 시각 없이 다시 넣으면 점수만 바뀐다
+        rows = [(self.recipe.recipe_id, self.members[1].member_id, 4, None)]
+        self.assertEqual(queries.import_ratings(rows), [(self.recipe.recipe_id, False)])
+        rating = Rating.objects.get(member=self.members[1])
+        self.assertEqual((rating.score, rating.created_at), (4, original))
+
+        given = original + timedelta(days=1)
+        queries.import_ratings([(self.recipe.recipe_id, self.members[1].member_id, 5, given)])
+        self.assertEqual(Rating.objects.get(member=self.members[1]).created_at, given)
+
+
+class IngredientMatchTests(TestCase):
+    """
+    재료 기반 검색: 충족 비율 → 부족한 재료 수 순으로 정렬된다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+        names = ("김치", "두부", "돼지고기", "대파")
+        cls.ingredients = {name: Ingredient.objects.create(name=name) for name in names}
+
+        def recipe(title, *ingredient_names):
+            r = Recipe.objects.create(
+                author=author, title=title, description="", created_at=timezone.now(),
+            )
+            RecipeIngredient.objects.bulk_create([
+                RecipeIngredient(recipe=r, ingredient=cls.ingredients[n])
+                for n in ingredient_names
+            ])
+            return r
+
+        cls.stew = recipe("김치찌개", "김치", "두부", "돼지고기")
+        cls.fried = recipe("김치볶음", "김치", "돼지고기")
+        cls.tofu = recipe("두부부침", "두부")
+        cls.soup = recipe("파국", "대파")
+
+    def setUp(self):
+        cache.clear()
+        run_migration_sql("0015_ingredient_index_version")
+        # 다른 테스트에서 만들어진 프로세스 인덱스를 쓰지 않도록
+        patcher = mock.patch.object(ingredient_index, "_index", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ranked_by_coverage_then_missing(self):
+        index = IngredientIndex.build()
+        ids, unknown = index.resolve(["김치", " 두부 ", "치즈"])
+
+        matches = index.match(ids, limit=10)
+
+        self.assertEqual(unknown, ["치즈"])
+        self.assertEqual(
+            [(recipe_id, matched, total) for recipe_id, matched, total, _ in matches],
+            [
+                (self.tofu.recipe_id, 1, 1),
+                (self.stew.recipe_id, 2, 3),
+                (self.fried.recipe_id, 1, 2),
+            ],
+        )
+        self.assertEqual(matches[1][3], [self.ingredients["돼지고기"].ingredient_id])
+
+    def add_recipe_with(self, ingredient):
+        recipe = Recipe.objects.create(
+            author=self.stew.author, title="새 레시피", description="", created_at=timezone.now(),
+        )
+        RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient)
+        return recipe
+
+    def test_triggers_bump_version(self):
+        # 트리거는 커밋 직전에 도는 지연 트리거지만 run_migration_sql 이 SET CONSTRAINTS ALL IMMEDIATE 를 해 두었다
+        version = ingredient_index.current_version()
+
+        cheese = Ingredient.objects.create(name="치즈")
+        self.add_recipe_with(cheese)
+        self.assertEqual(ingredient_index.current_version(), version + 2)
+
+        RecipeIngredient.objects.filter(ingredient=cheese).delete()
+        self.assertEqual(ingredient_index.current_version(), version + 3)
+
+    def test_index_follows_db_version(self):
+        with mock.patch.object(ingredient_index, "INGREDIENT_INDEX_BACKGROUND_REBUILD", False):
+            index = ingredient_index.get_ingredient_index()
+            # 확인 간격 안에서는 쿼리 없이 같은 인덱스
+            with self.assertNumQueries(0):
+                self.assertIs(ingredient_index.get_ingredient_index(), index)
+
+            cheese = Ingredient.objects.create(name="치즈")
+            recipe = self.add_recipe_with(cheese)
+            with mock.patch.object(ingredient_index, "INGREDIENT_INDEX_MIN_REBUILD_INTERVAL", 0):
+                rebuilt = ingredient_index.get_ingredient_index()
+
+        self.assertIsNot(rebuilt, index)
+        ids, unknown = rebuilt.resolve(["치즈"])
+        self.assertEqual(unknown, [])
+        self.assertEqual([m[0] for m in rebuilt.match(ids, limit=10)], [recipe.recipe_id])
+
+    def test_index_rebuilt_after_max_age(self):
+        with mock.patch.multiple(
+            ingredient_index,
+            INGREDIENT_INDEX_BACKGROUND_REBUILD=False,
+            INGREDIENT_INDEX_MIN_REBUILD_INTERVAL=0,
+            INGREDIENT_INDEX_MAX_AGE=0,
+        ):
+            index = ingredient_index.get_ingredient_index()
+            self.assertIsNot(ingredient_index.get_ingredient_index(), index)
+
+    def test_stale_index_served_while_rebuilding_in_background(self):
+        with mock.patch.multiple(
+            ingredient_index, INGREDIENT_INDEX_MIN_REBUILD_INTERVAL=0, INGREDIENT_INDEX_MAX_AGE=0,
+        ):
+            index = ingredient_index.get_ingredient_index()
+            with mock.patch.object(ingredient_index.threading, "Thread") as thread:
+                self.assertIs(ingredient_index.get_ingredient_index(), index)
+                # 다시 만드는 중에는 또 만들지 않는다
+                self.assertIs(ingredient_index.get_ingredient_index(), index)
+        thread.assert_called_once()
+        ingredient_index._lock.release()
+
+    def test_endpoint(self):
+        response = self.client.get(
+            "/api/recipes/by-ingredients/", {"ingredients": "김치,두부"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [r["recipe_id"] for r in results],
+            [self.tofu.recipe_id, self.stew.recipe_id, self.fried.recipe_id],
+        )
+        self.assertEqual(results[0]["coverage"], 1.0)
+        self.assertEqual(results[2]["missing_ingredients"], ["돼지고기"])
+
+
+class RecipeCreateBulkWriteTests(TestCase):
+    """
+    RecipeCreateSerializer 는 재료/단계 개수와 관계없이 고정된 쿼리 수로 저장한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+        Ingredient.objects.create(name="재료 0")
+
+    def create(self, ingredient_count, step_count):
+        serializer = RecipeCreateSerializer(data={
+            "title": "레시피",
+            "description": "설명",
+            "ingredients": [
+                {"name": f"재료 {i}", "amount": f"{i}g"} for i in range(ingredient_count)
+            ] + [{"name": "재료 0", "amount": "중복"}],
+            "steps": [
+                {"step_order": i + 1, "content": f"단계 {i + 1}"} for i in range(step_count)
+            ],
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(author=self.author)
+
+    def test_query_count_is_constant(self):
+        # SAVEPOINT, recipe INSERT, member_stats upsert, 기존 재료 SELECT, 새 재료 upsert,
+        # recipe_ingredient INSERT, recipe_step INSERT, RELEASE SAVEPOINT
+        with self.assertNumQueries(8):
+            small = self.create(ingredient_count=3, step_count=2)
+        with self.assertNumQueries(8):
+            large = self.create(ingredient_count=20, step_count=15)
+
+        self.assertEqual(small.recipe_ingredients.count(), 3)
+        self.assertEqual(large.recipe_ingredients.count(), 20)
+        self.assertEqual(large.steps.count(), 15)
+        self.assertEqual(Ingredient.objects.count(), 20)
+        self.assertEqual(
+            large.recipe_ingredients.get(ingredient__name="재료 0").amount, "0g"
+        )
+
+
+class TrendingUpdateTests(TestCase):
+    """
+    update_trending 증분 갱신 결과는 같은 시각에 처음부터 다시 계산한 결과와 같아야 한다.
+    (점수 기준 시각 epoch 가 달라도 레시피 간 비율은 같다)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.members = [
+            Member.objects.create(
+                login_id=f"user{i}", password="x", name=f"회원{i}", role="USER",
+                created_at=timezone.now(),
+            )
+            for i in range(4)
+        ]
+        cls.recipes = [
+            Recipe.objects.create(
+                author=cls.members[0], title=f"레시피 {i}", created_at=timezone.now(),
+            )
+            for i in range(4)
+        ]
+
+    def like(self, member, recipe, at):
+        RecipeLike.objects.create(member=member, recipe=recipe, liked_at=at)
+
+    def scores(self):
+        rows = dict(RecipeTrending.objects.values_list("recipe_id", "score"))
+        base = max(rows.values())
+        return {recipe_id: score / base for recipe_id, score in rows.items()}
+
+    def test_incremental_matches_rebuild(self):
+        t0 = timezone.now() - timedelta(days=20)
+        r0, r1, r2, r3 = self.recipes
+        m0, m1, m2, m3 = self.members
+
+        self.like(m0, r0, t0 - timedelta(days=6))   # 다음 갱신 때 윈도우 밖으로 나감
+        self.like(m1, r0, t0 - timedelta(hours=1))
+        self.like(m0, r1, t0 - timedelta(days=2))
+        Rating.objects.create(recipe=r1, member=m1, score=5, created_at=t0 - timedelta(hours=3))
+        update_trending(now=t0)
+
+        t1 = t0 + timedelta(days=3)
+        self.like(m2, r2, t0 + timedelta(days=1))
+        RecipeComment.objects.create(
+            recipe=r3, author=m2, content="맛있어요", created_at=t0 + timedelta(days=2),
+        )
+        self.like(m3, r3, t1 + timedelta(hours=1))   # 아직 반영되지 않아야 함
+        update_trending(now=t1)
+        incremental = self.scores()
+
+        update_trending(rebuild=True, now=t1)
+        rebuilt = self.scores()
+
+        self.assertEqual(incremental.keys(), rebuilt.keys())
+        for recipe_id, score in rebuilt.items():
+            self.assertAlmostEqual(incremental[recipe_id], score, places=6)
+        # 이틀 전 댓글(2.0) > 이틀 전 좋아요(1.0) > 나흘~닷새 전 좋아요/평점
+        self.assertEqual(
+            list(
+                RecipeTrending.objects.order_by("-score").values_list("recipe_id", flat=True)
+            ),
+            [r3.recipe_id, r2.recipe_id, r1.recipe_id, r0.recipe_id],
+        )
+
+    def test_removed_events_are_subtracted(self):
+        r0, r1, r2, _ = self.recipes
+        m0, m1, *_ = self.members
+        now = timezone.now()
+        self.like(m0, r0, now - timedelta(hours=2))
+        self.like(m1, r2, now - timedelta(hours=2))
+        comment = RecipeComment.objects.create(
+            recipe=r1, author=m1, content="맛있어요", created_at=now - timedelta(hours=2),
+        )
+        Rating.objects.create(recipe=r1, member=m0, score=5, created_at=now - timedelta(hours=2))
+        update_trending(now=now - timedelta(hours=1))
+
+        # 좋아요 취소 후 다시 좋아요: 처음 좋아요 점수는 빠지고 새 좋아요만 남아야 한다
+        self.assertEqual(queries.toggle_recipe_like(m0.member_id, r0.recipe_id)[0], False)
+        self.assertEqual(queries.toggle_recipe_like(m0.member_id, r0.recipe_id)[0], True)
+        queries.delete_comment(comment.comment_id)
+        queries.delete_rating(m0.member_id, r1.recipe_id)
+        update_trending(now=now + timedelta(minutes=5))
+        incremental = self.scores()
+
+        update_trending(rebuild=True, now=now + timedelta(minutes=5))
+        rebuilt = self.scores()
+        self.assertEqual(incremental.keys(), rebuilt.keys())
+        self.assertNotIn(r1.recipe_id, rebuilt)
+        for recipe_id, score in rebuilt.items():
+            self.assertAlmostEqual(incremental[recipe_id], score, places=6)
+
+    def test_loop_rebuilds_on_interval(self):
+        with mock.patch("recipes.management.commands.update_trending.update_trending") as update, \
+                mock.patch("recipes.management.commands.update_trending.time") as clock:
+            update.return_value = timezone.now()
+            clock.monotonic.side_effect = [0, 0, 60, 60, 120, 120, 180, 180]
+            clock.sleep.side_effect = [None, None, None, KeyboardInterrupt]
+            with self.assertRaises(KeyboardInterrupt):
+                call_command(
+                    "update_trending", loop=True, interval=60, rebuild_every=120,
+                    stdout=io.StringIO(),
+                )
+        self.assertEqual(
+            [c.kwargs["rebuild"] for c in update.call_args_list], [True, False, True, False]
+        )
+
+    def test_rebase_keeps_ratios(self):
+        # 반감기 24시간이면 약 43일 뒤 λ·(now - epoch) 가 30 을 넘어 epoch 를 옮긴다
+        t0 = timezone.now() - timedelta(days=60)
+        for day in range(0, 50, 2):
+            RecipeComment.objects.create(
+                recipe=self.recipes[day % 3], author=self.members[0], content="댓글",
+                created_at=t0 + timedelta(days=day),
+            )
+            update_trending(now=t0 + timedelta(days=day, hours=1))
+
+        incremental = self.scores()
+        self.assertGreater(TrendingState.objects.get().epoch, t0)
+
+        update_trending(rebuild=True, now=t0 + timedelta(days=48, hours=1))
+        rebuilt = self.scores()
+        self.assertEqual(incremental.keys(), rebuilt.keys())
+        for recipe_id, score in rebuilt.items():
+            self.assertAlmostEqual(incremental[recipe_id], score, places=6)
+
+
+class RecipeImageVariantTests(TestCase):
+    """
+    업로드 원본으로 크기별 WebP/JPEG 를 만들고 메타데이터는 지운다.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+
+    def upload(self):
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x0112] = 6            # Orientation: 90도 회전 필요
+        exif[0x010F] = "카메라"      # Make
+        buffer = io.BytesIO()
+        Image.new("RGBA", (1200, 800), (200, 80, 40, 128)).save(buffer, "PNG", exif=exif)
+        name = default_storage.save("recipes/original.png", ContentFile(buffer.getvalue()))
+        return f"/media/{name}"
+
+    def test_variants_are_resized_and_stripped(self):
+        from PIL import Image
+
+        image_path = self.upload()
+        recipe = Recipe.objects.create(
+            author=self.author, title="레시피", description="", image_path=image_path,
+            created_at=timezone.now(),
+        )
+
+        variants = process_recipe_image(recipe.recipe_id, image_path)
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.image_variants, variants)
+        expected = {"thumb": (160, 160), "card": (480, 360), "full": (800, 1200)}
+        for name, size in expected.items():
+            for ext, image_format in (("webp", "WEBP"), ("jpeg", "JPEG")):
+                with self.subTest(variant=name, format=ext):
+                    url = variants[name][ext]
+                    with default_storage.open(url[len("/media/"):]) as f:
+                        with Image.open(f) as image:
+                            self.assertEqual(image.format, image_format)
+                            self.assertEqual(image.size, size)
+                            self.assertEqual(len(image.getexif()), 0)
+
+    def test_stale_image_is_not_recorded(self):
+        image_path = self.upload()
+        recipe = Recipe.objects.create(
+            author=self.author, title="레시피", description="", image_path="/media/other.png",
+            created_at=timezone.now(),
+        )
+
+        process_recipe_image(recipe.recipe_id, image_path)
+
+        recipe.refresh_from_db()
+        self.assertIsNone(recipe.image_variants)
+
+
+class RecipeImageUploadTests(TestCase):
+    """
+    레시피 이미지 업로드: 크기 제한 / magic bytes 형식 확인 / 내용 해시 경로 저장.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.author = Member.objects.create(
+            login_id="cook", password="x", name="요리사", role="COOK",
+            created_at=timezone.now(),
+        )
+        self.token = create_jwt(member_id=self.author.member_id, role="COOK")
+
+    def png(self):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48), (10, 120, 30)).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def post(self, content, name="photo.png"):
+        image = ContentFile(content, name=name)
+        return self.client.post(
+            "/api/recipes/create/",
+            {
+                "title": "레시피",
+                "description": "설명",
+                "ingredients[0][name]": "두부",
+                "ingredients[0][amount]": "1모",
+                "steps[0][content]": "굽는다",
+                "steps[0][step_order]": "1",
+                "image": image,
+            },
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+        )
+
+    def test_identical_images_are_stored_once(self):
+        content = self.png()
+        first = self.post(content, name="a.PNG")
+        second = self.post(content, name="b.jpg")   # 이름/확장자와 무관하게 내용으로 판별
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        paths = list(Recipe.objects.order_by("recipe_id").values_list("image_path", flat=True))
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(paths, [f"/media/recipes/{digest[:2]}/{digest}.png"] * 2)
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, "recipes", digest[:2])),
+            [f"{digest}.png"],
+        )
+
+    def test_rejects_non_image_content(self):
+        response = self.post(b"<?php echo 'hi'; ?>" + b"x" * 100, name="evil.png")
+
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_rejects_oversized_upload(self):
+        with mock.patch.object(uploads, "RECIPE_IMAGE_MAX_UPLOAD_SIZE", 100):
+            response = self.post(self.png())
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_rejection_drains_body_instead_of_resetting(self):
+        handler = uploads.RecipeImageUploadHandler(max_size=10)
+        handler.new_file("image", "photo.png", "image/png", None)
+        with self.assertRaises(uploads.StopUpload) as raised:
+            handler.receive_data_chunk(self.png(), 0)
+        self.assertFalse(raised.exception.connection_reset)
+        self.assertEqual(handler.error.status_code, 413)
+
+    def test_invalid_submission_stores_no_image(self):
+        image = ContentFile(self.png(), name="photo.png")
+        response = self.client.post(
+            "/api/recipes/create/",
+            {"description": "제목 없음", "image": image},
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "recipes")))
+
+
+class FeedTests(TestCase):
+    """
+    팔로우 피드: 작성 시 팔로워 타임라인으로 fan-out, 팔로워가 많은 작성자는 조회 시 pull.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.cook, cls.star, cls.fan = [
+            Member.objects.create(
+                login_id=login_id, password="x", name=login_id, role="USER",
+                created_at=timezone.now(),
+            )
+            for login_id in ("reader", "cook", "star", "fan")
+        ]
+        now = timezone.now()
+        for follower, followee in (
+            (cls.reader, cls.cook), (cls.reader, cls.star), (cls.fan, cls.star),
+        ):
+            Follow.objects.create(follower=follower, followee=followee, followed_at=now)
+
+    def write(self, author, minutes_ago):
+        recipe = Recipe.objects.create(
+            author=author, title=f"{author.name} 레시피", description="",
+            created_at=timezone.now() - timedelta(minutes=minutes_ago),
+        )
+        feed.fan_out_recipe(recipe.recipe_id)
+        return recipe
+
+    def feed_ids(self, **params):
+        token = create_jwt(member_id=self.reader.member_id, role="USER")
+        response = self.client.get("/api/feed/", params, HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_fan_out_and_pull_are_merged_in_order(self):
+        with mock.patch.object(feed, "FEED_FANOUT_MAX_FOLLOWERS", 1):
+            old = self.write(self.cook, minutes_ago=30)
+            star_recipe = self.write(self.star, minutes_ago=20)   # 팔로워 2명 → pull
+            new = self.write(self.cook, minutes_ago=10)
+            self.write(self.fan, minutes_ago=5)                    # 팔로우하지 않은 작성자
+
+        self.assertEqual(
+            set(FeedEntry.objects.filter(member=self.reader).values_list("recipe_id", flat=True)),
+            {old.recipe_id, new.recipe_id},
+        )
+
+        page = self.feed_ids(page_size=2)
+        self.assertEqual(
+            [r["recipe_id"] for r in page["results"]], [new.recipe_id, star_recipe.recipe_id]
+        )
+        cursor = page["next"].split("cursor=")[1].split("&")[0]
+        page = self.feed_ids(page_size=2, cursor=cursor)
+        self.assertEqual([r["recipe_id"] for r in page["results"]], [old.recipe_id])
+
+    def test_walk_whole_feed_with_cursor_in_subqueries(self):
+        with mock.patch.object(feed, "FEED_FANOUT_MAX_FOLLOWERS", 1):
+            recipes = [
+                self.write(self.star if i % 3 == 0 else self.cook, minutes_ago=i // 2)  # 동점 created_at
+                for i in range(12)
+            ]
+        expected = [
+            r.recipe_id
+            for r in sorted(recipes, key=lambda r: (r.created_at, r.recipe_id), reverse=True)
+        ]
+
+        pages, params = [], {"page_size": 5}
+        while True:
+            with CaptureQueriesContext(connection) as captured:
+                body = self.feed_ids(**params)
+            pages.append([r["recipe_id"] for r in body["results"]])
+            if not body["next"]:
+                break
+            params = {"page_size": 5, "cursor": body["next"].split("cursor=")[1].split("&")[0]}
+        self.assertEqual([i for page in pages for i in page], expected)
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+
+        # 마지막 페이지 조회: seek 조건과 LIMIT 이 타임라인 / pull subquery 각각에 들어 있다
+        sql = next(q["sql"] for q in captured.captured_queries if "UNION" in q["sql"])
+        timeline, pulled = sql.split('FROM "feed_entry"')[1].rsplit("))", 1)[0].split("UNION")
+        for subquery in (timeline, pulled):
+            self.assertIn('"created_at" <', subquery)
+            self.assertIn("LIMIT 6", subquery)
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        recipe = self.write(self.fan, minutes_ago=5)
+        self.assertFalse(FeedEntry.objects.filter(member=self.reader).exists())
+
+        request = APIRequestFactory().post("/")
+        force_authenticate(request, user=self.reader)
+        FollowToggleAPIView.as_view()(request, member_id=self.fan.member_id)
+        self.assertEqual(
+            list(FeedEntry.objects.filter(member=self.reader).values_list("recipe_id", flat=True)),
+            [recipe.recipe_id],
+        )
+
+        request = APIRequestFactory().post("/")
+        force_authenticate(request, user=self.reader)
+        FollowToggleAPIView.as_view()(request, member_id=self.fan.member_id)
+        self.assertFalse(FeedEntry.objects.filter(member=self.reader).exists())
+
+
+class FollowTests(TestCase):
+    """
+    팔로우 토글은 follower_count / following_count 를 함께 갱신하고,
+    목록의 "내가 팔로우하는지" 는 페이지 단위 쿼리 1번으로 구한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.members = [
+            Member.objects.create(
+                login_id=f"user{i}", password="x", name=f"회원{i}", role="USER",
+                created_at=timezone.now(),
+            )
+            for i in range(5)
+        ]
+
+    def toggle(self, follower, followee):
+        request = APIRequestFactory().post("/")
+        force_authenticate(request, user=follower)
+        return FollowToggleAPIView.as_view()(request, member_id=followee.member_id)
+
+    def counts(self, member):
+        return Member.objects.values_list("follower_count", "following_count").get(pk=member.pk)
+
+    def test_toggle_maintains_counters(self):
+        a, b = self.members[:2]
+
+        response = self.toggle(a, b)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"following": True, "follower_count": 1})
+        self.assertEqual((self.counts(a), self.counts(b)), ((0, 1), (1, 0)))
+
+        self.toggle(b, a)
+        self.assertEqual((self.counts(a), self.counts(b)), ((1, 1), (1, 1)))
+
+        response = self.toggle(a, b)
+        self.assertEqual(response.data, {"following": False, "follower_count": 0})
+        self.assertEqual((self.counts(a), self.counts(b)), ((1, 0), (0, 1)))
+
+        self.assertEqual(self.toggle(a, Member(member_id=a.member_id + 1000)).status_code, 404)
+
+    def test_followers_page_with_is_following(self):
+        star, *fans = self.members
+        for fan in fans:
+            self.toggle(fan, star)
+        viewer = fans[0]
+        self.toggle(viewer, fans[2])
+        token = create_jwt(member_id=viewer.member_id, role="USER")
+
+        # JWT 회원 조회 + 회원 확인 + 목록 + 내가 팔로우하는지 조회
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                f"/api/members/{star.member_id}/followers/", {"page_size": 2},
+                HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+        body = response.json()
+        self.assertEqual(
+            [(m["member_id"], m["is_following"]) for m in body["results"]],
+            [(fans[3].member_id, False), (fans[2].member_id, True)],
+        )
+        self.assertIsNotNone(body["next"])
+
+        response = self.client.get(
+            "/api/members/following-status/",
+            {"ids": ",".join(str(m.member_id) for m in self.members)},
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.json(), {"following": [star.member_id, fans[2].member_id]})
+
+
+class CommentThreadTests(TestCase):
+    """
+    댓글 목록은 루트 댓글 단위 스레드이고, 답글 트리는 깊이와 관계없이 쿼리 1번으로 읽는다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = Member.objects.create(
+            login_id="commenter", password="x", name="댓글러", role="USER",
+            created_at=timezone.now(),
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.member, title="된장찌개", description="설명", created_at=timezone.now(),
+        )
+        cls.other_recipe = Recipe.objects.create(
+            author=cls.member, title="다른 레시피", description="설명", created_at=timezone.now(),
+        )
+        base = timezone.now()
+
+        def comment(content, minutes, parent=None):
+            return RecipeComment.objects.create(
+                recipe=cls.recipe, author=cls.member, parent_comment=parent,
+                content=content, created_at=base + timedelta(minutes=minutes),
+            )
+
+        # a ─ a1 ─ a1x ─ a1xy
+        #   └ a2
+        # b
+        cls.a = comment("a", 0)
+        cls.b = comment("b", 1)
+        cls.a2 = comment("a2", 3, cls.a)
+        cls.a1 = comment("a1", 2, cls.a)
+        cls.a1x = comment("a1x", 4, cls.a1)
+        cls.a1xy = comment("a1xy", 5, cls.a1x)
+
+    def url(self):
+        return f"/api/recipes/{self.recipe.recipe_id}/comments/"
+
+    @staticmethod
+    def shape(nodes):
+        return [(n["content"], n["reply_count"], CommentThreadTests.shape(n["replies"])) for n in nodes]
+
+    def test_full_tree_in_one_query(self):
+        # 루트 페이지 + 스레드 (깊이와 관계없이)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.shape(response.json()["results"]),
+            [
+                ("a", 2, [
+                    ("a1", 1, [("a1x", 1, [("a1xy", 0, [])])]),
+                    ("a2", 0, []),
+                ]),
+                ("b", 0, []),
+            ],
+        )
+        self.assertEqual(response.json()["results"][0]["author"]["name"], "댓글러")
+
+    def test_depth_limited_page_of_roots(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url(), {"page_size": 1, "depth": 1})
+        body = response.json()
+        self.assertEqual(
+            self.shape(body["results"]),
+            [("a", 2, [("a1", 1, []), ("a2", 0, [])])],
+        )
+
+        response = self.client.get(body["next"])
+        self.assertEqual(self.shape(response.json()["results"]), [("b", 0, [])])
+
+        response = self.client.get(self.url(), {"page_size": 1, "depth": 0, "order": "newest"})
+        body = response.json()
+        self.assertEqual(self.shape(body["results"]), [("b", 0, [])])
+        response = self.client.get(body["next"])
+        self.assertEqual(self.shape(response.json()["results"]), [("a", 2, [])])
+
+    def test_create_reply(self):
+        token = create_jwt(member_id=self.member.member_id, role="USER")
+        url = f"/api/recipes/{self.recipe.recipe_id}/comments/create/"
+
+        response = self.client.post(
+            url, {"content": "답글", "parent_comment_id": self.b.comment_id},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["parent_comment"], self.b.comment_id)
+        self.assertEqual(response.json()["comment_count"], 1)
+
+        # 다른 레시피의 댓글에는 답글 불가
+        foreign = RecipeComment.objects.create(
+            recipe=self.other_recipe, author=self.member, content="x", created_at=timezone.now(),
+        )
+        response = self.client.post(
+            url, {"content": "답글", "parent_comment_id": foreign.comment_id},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_comment_count_follows_create_and_delete(self):
+        Recipe.objects.filter(pk=self.recipe.pk).update(comment_count=6)
+        token = create_jwt(member_id=self.member.member_id, role="USER")
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        sanctions.sanction_blocked_until(self.member.member_id)
+
+        # JWT 회원 조회 + 쓰기 SQL 한 문장 (이용 제한 상태는 캐시)
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                f"/api/recipes/{self.recipe.recipe_id}/comments/create/",
+                {"content": "새 댓글"}, content_type="application/json", **auth,
+            )
+        self.assertEqual(response.json()["comment_count"], 7)
+        self.assertIsNotNone(response.json()["created_at"])
+
+        # 답글이 달린 댓글을 지우면 답글까지 (a, a1, a2, a1x, a1xy)
+        response = self.client.delete(f"/api/comments/{self.a.comment_id}/", **auth)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Recipe.objects.get(pk=self.recipe.pk).comment_count, 2)
+        self.assertEqual(
+            RecipeComment.objects.filter(recipe=self.recipe).count(), 2,
+        )
+
+        response = self.client.get(f"/api/recipes/{self.recipe.recipe_id}/")
+        self.assertEqual(response.json()["comment_count"], 2)
+
+        response = self.client.post(
+            "/api/recipes/999999/comments/create/",
+            {"content": "x"}, content_type="application/json", **auth,
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class MemberStatsTests(TestCase):
+    """
+    member_stats 는 쓰기 경로가 같은 문장에서 증감하고, 마이페이지는 그 행을 PK 로 한 번만 읽는다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.fan, cls.critic = [
+            Member.objects.create(
+                login_id=f"stats{i}", password="x", name=f"회원{i}", role="USER",
+                created_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+
+    def create_recipe(self):
+        request = APIRequestFactory().post("/")
+        request.user = self.author
+        serializer = RecipeCreateUpdateSerializer(
+            data={"title": "레시피", "description": "설명"}, context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def stats(self):
+        stats = MemberStats.objects.get(pk=self.author.pk)
+        return (stats.recipe_count, stats.likes_received, stats.rating_sum, stats.rating_count)
+
+    def test_write_paths_keep_stats(self):
+        first, second = self.create_recipe(), self.create_recipe()
+        self.assertEqual(self.stats(), (2, 0, 0, 0))
+
+        queries.toggle_recipe_like(self.fan.member_id, first.recipe_id)
+        queries.toggle_recipe_like(self.critic.member_id, second.recipe_id)
+        queries.toggle_recipe_like(self.critic.member_id, second.recipe_id)
+        self.assertEqual(self.stats(), (2, 1, 0, 0))
+
+        queries.upsert_rating(self.fan.member_id, first.recipe_id, 4)
+        queries.upsert_rating(self.fan.member_id, first.recipe_id, 2)
+        queries.upsert_rating(self.critic.member_id, first.recipe_id, 5)
+        self.assertEqual(self.stats(), (2, 1, 7, 2))
+
+        queries.delete_rating(self.critic.member_id, first.recipe_id)
+        queries.import_ratings([
+            (first.recipe_id, self.fan.member_id, 5, None),
+            (second.recipe_id, self.critic.member_id, 3, None),
+        ])
+        self.assertEqual(self.stats(), (2, 1, 8, 2))
+
+        token = create_jwt(member_id=self.author.member_id, role="USER")
+        # JWT 회원 조회 + member JOIN member_stats
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        body = response.json()
+        self.assertEqual(
+            (body["recipe_count"], body["like_received_count"],
+             body["rating_received_count"], body["avg_rating_received"]),
+            (2, 1, 2, "4.00"),
+        )
+
+    def test_reconcile_command_recomputes(self):
+        # 통계 행이 아직 없는 회원
+        token = create_jwt(member_id=self.fan.member_id, role="USER")
+        response = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(
+            (response.json()["recipe_count"], response.json()["avg_rating_received"]), (0, None),
+        )
+
+        recipe = self.create_recipe()
+        RecipeLike.objects.create(member=self.fan, recipe=recipe, liked_at=timezone.now())
+        Recipe.objects.filter(pk=recipe.pk).update(like_count=1)
+        Rating.objects.create(
+            member=self.fan, recipe=recipe, score=3, created_at=timezone.now(),
+        )
+        MemberStats.objects.filter(pk=self.author.pk).update(recipe_count=9)
+
+        call_command("reconcile_member_stats", batch_size=2, stdout=io.StringIO())
+        self.assertEqual(self.stats(), (1, 1, 3, 1))
+        # 활동이 없는 회원도 0 으로 채워진다
+        self.assertEqual(
+            MemberStats.objects.filter(pk=self.fan.pk).values_list("recipe_count", flat=True).get(), 0,
+        )
+
+
+class ModerationQueueTests(TestCase):
+    """
+    처리 큐는 PENDING 신고를 대상별로 묶어 신고 수 순으로 보여 주고, 대상 미리보기는 종류별 쿼리 1번이다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.author, *cls.reporters = [
+            Member.objects.create(
+                login_id=f"mod{i}", password="x", name=f"회원{i}",
+                role="ADMIN" if i == 0 else "USER", created_at=timezone.now(),
+            )
+            for i in range(5)
+        ]
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, title="신고된 레시피", description="설명", created_at=timezone.now(),
+        )
+        cls.other_recipe = Recipe.objects.create(
+            author=cls.author, title="다른 레시피", description="설명", created_at=timezone.now(),
+        )
+        cls.comment = RecipeComment.objects.create(
+            recipe=cls.recipe, author=cls.author, content="광고" * 100, created_at=timezone.now(),
+        )
+        base = timezone.now() - timedelta(days=1)
+
+        def report(target, minutes, status="PENDING", reporter=0):
+            kwargs = (
+                {"target_type": "COMMENT", "comment": target}
+                if isinstance(target, RecipeComment)
+                else {"target_type": "RECIPE", "recipe": target}
+            )
+            return Report.objects.create(
+                reporter=cls.reporters[reporter], reason=f"사유 {minutes}", status=status,
+                created_at=base + timedelta(minutes=minutes), **kwargs,
+            )
+
+        # 댓글: 신고 3건 / 레시피: 2건 (먼저 신고됨) / 다른 레시피: 2건 (나중) + 처리 완료 1건
+        for minutes in (10, 11, 12):
+            report(cls.comment, minutes, reporter=minutes - 10)
+        report(cls.recipe, 1)
+        report(cls.recipe, 2, reporter=1)
+        report(cls.other_recipe, 5)
+        report(cls.other_recipe, 6, reporter=1)
+        report(cls.other_recipe, 7, status="RESOLVED", reporter=2)
+
+    def get(self, url, params=None):
+        token = create_jwt(member_id=self.admin.member_id, role="ADMIN")
+        return self.client.get(url, params or {}, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_grouped_priority_queue_with_previews(self):
+        # JWT 회원 조회 + 큐 페이지 + 레시피 미리보기 + 댓글 미리보기
+        with self.assertNumQueries(4):
+            response = self.get("/api/admin/reports/queue/", {"page_size": 2})
+        body = response.json()
+        self.assertEqual(
+            [(item["target_type"], item["target_id"], item["report_count"]) for item in body["results"]],
+            [("COMMENT", self.comment.comment_id, 3), ("RECIPE", self.recipe.recipe_id, 2)],
+        )
+        comment_item, recipe_item = body["results"]
+        self.assertEqual(comment_item["recent_reasons"], ["사유 12", "사유 11", "사유 10"])
+        self.assertEqual(len(comment_item["report_ids"]), 3)
+        self.assertEqual(len(comment_item["target"]["snippet"]), 80)
+        self.assertEqual(comment_item["target"]["author"]["member_id"], self.author.member_id)
+        self.assertEqual(recipe_item["target"]["title"], "신고된 레시피")
+
+        response = self.get(body["next"])
+        body = response.json()
+        self.assertEqual(
+            [(item["target_id"], item["report_count"]) for item in body["results"]],
+            [(self.other_recipe.recipe_id, 2)],
+        )
+        self.assertIsNone(body["next"])
+
+    def test_admin_only(self):
+        token = create_jwt(member_id=self.author.member_id, role="USER")
+        response = self.client.get("/api/admin/reports/queue/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            "/api/admin/reports/bulk/", {"status": "REJECTED", "report_ids": [1]},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def bulk(self, payload):
+        token = create_jwt(member_id=self.admin.member_id, role="ADMIN")
+        return self.client.post(
+            "/api/admin/reports/bulk/", payload,
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_bulk_resolve_target_creates_one_sanction(self):
+        # JWT 회원 조회, SAVEPOINT, 신고 UPDATE + 제재 INSERT 한 문장, RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            response = self.bulk({
+                "status": "RESOLVED", "target_type": "COMMENT", "target_id": self.comment.comment_id,
+            })
+        body = response.json()
+        self.assertEqual(body["updated"], 3)
+        self.assertEqual(body["sanctioned_member_ids"], [self.author.member_id])
+        sanction = UserSanction.objects.get(pk=body["created_sanction_ids"][0])
+        self.assertEqual(sanction.sanction, "WARNING")
+        self.assertIn(f"report_id={','.join(map(str, sorted(body['report_ids'])))}", sanction.reason)
+        self.assertEqual(
+            set(Report.objects.filter(comment=self.comment).values_list("status", "handled_by")),
+            {("RESOLVED", self.admin.member_id)},
+        )
+
+        # 이미 처리된 신고는 다시 처리되지 않고 제재도 중복되지 않는다
+        response = self.bulk({
+            "status": "RESOLVED", "target_type": "COMMENT", "target_id": self.comment.comment_id,
+        })
+        self.assertEqual(response.json()["updated"], 0)
+        self.assertEqual(UserSanction.objects.count(), 1)
+
+    def test_bulk_reject_report_ids(self):
+        ids = list(
+            Report.objects.filter(recipe__in=[self.recipe, self.other_recipe])
+            .values_list("report_id", flat=True)
+        )
+        response = self.bulk({"status": "REJECTED", "handle_note": "문제 없음", "report_ids": ids})
+        body = response.json()
+        # 이미 RESOLVED 인 1건은 제외
+        self.assertEqual(body["updated"], 4)
+        self.assertEqual(body["created_sanction_ids"], [])
+        self.assertFalse(UserSanction.objects.exists())
+        self.assertEqual(
+            Report.objects.filter(handle_note="문제 없음", status="REJECTED").count(), 4,
+        )
+
+        self.assertEqual(self.bulk({"status": "REJECTED"}).status_code, 400)
+        self.assertEqual(
+            self.bulk({"status": "REJECTED", "report_ids": ids, "target_type": "RECIPE"}).status_code,
+            400,
+        )
+
+
+class SanctionEnforcementTests(TestCase):
+    """
+    이용 제한 중인 회원은 쓰기 API 를 쓸 수 없고, 제한 상태는 캐시에서 읽는다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin, cls.author, cls.member = [
+            Member.objects.create(
+                login_id=f"sanction{i}", password="x", name=f"회원{i}",
+                role="ADMIN" if i == 0 else "USER", created_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, title="레시피", description="설명", created_at=timezone.now(),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def sanction(self, kind="SUSPENSION", start=timedelta(hours=-1), end=timedelta(days=1)):
+        now = timezone.now()
+        return UserSanction.objects.create(
+            member=self.member, sanction=kind, reason="테스트",
+            start_at=now + start if start is not None else None,
+            end_at=now + end if end is not None else None,
+            created_by=self.admin, created_at=now,
+        )
+
+    def post_comment(self):
+        token = create_jwt(member_id=self.member.member_id, role="USER")
+        return self.client.post(
+            f"/api/recipes/{self.recipe.recipe_id}/comments/create/", {"content": "댓글"},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_active_suspension_blocks_writes(self):
+        self.sanction()
+        response = self.post_comment()
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("이용이 제한된 계정입니다.", response.json()["detail"])
+        self.assertFalse(RecipeComment.objects.exists())
+
+        request = APIRequestFactory().post(f"/api/recipes/{self.recipe.recipe_id}/like/")
+        force_authenticate(request, user=self.member)
+        response = RecipeLikeToggleAPIView.as_view()(request, recipe_id=self.recipe.recipe_id)
+        self.assertEqual(response.status_code, 403)
+
+    def test_cached_lookup_skips_query(self):
+        self.sanction(end=None)
+        with self.assertNumQueries(1):
+            self.assertEqual(sanctions.sanction_blocked_until(self.member.member_id), float("inf"))
+        with self.assertNumQueries(0):
+            self.assertEqual(sanctions.sanction_blocked_until(self.member.member_id), float("inf"))
+
+    def test_non_blocking_sanctions_allow_writes(self):
+        # 경고, 끝난 제한, 아직 시작 전인 제한은 쓰기를 막지 않는다
+        self.sanction(kind="WARNING", end=None)
+        self.sanction(start=timedelta(days=-3), end=timedelta(days=-1))
+        self.sanction(start=timedelta(days=1), end=timedelta(days=2))
+        self.assertIsNone(sanctions.sanction_blocked_until(self.member.member_id))
+        self.assertEqual(self.post_comment().status_code, 201)
+
+    def test_not_blocked_is_cached_briefly(self):
+        with mock.patch.object(sanctions, "cache", wraps=cache) as cache_spy:
+            self.assertIsNone(sanctions.sanction_blocked_until(self.member.member_id))
+        cache_spy.set.assert_called_once_with(
+            f"sanction:until:{self.member.member_id}", 0.0, sanctions.SANCTION_NEGATIVE_CACHE_TTL,
+        )
+
+    def test_suspension_from_admin_blocks_next_write(self):
+        self.assertEqual(self.post_comment().status_code, 201)
+
+        now = timezone.now()
+        suspension = UserSanction(
+            member=self.member, sanction="SUSPENSION", reason="도배",
+            start_at=now, end_at=now + timedelta(days=7), created_by=self.admin, created_at=now,
+        )
+        form = mock.Mock(changed_data=[], initial={})
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSanctionAdmin(UserSanction, admin_site).save_model(
+                request=None, obj=suspension, form=form, change=False,
+            )
+        self.assertEqual(self.post_comment().status_code, 403)
+
+        # 제재를 지우면 바로 풀린다
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSanctionAdmin(UserSanction, admin_site).delete_model(request=None, obj=suspension)
+        self.assertEqual(self.post_comment().status_code, 201)
+
+    def test_report_handling_invalidates_cache(self):
+        # "제한 없음" 이 캐시된 뒤에 제한이 들어온 경우
+        self.assertIsNone(sanctions.sanction_blocked_until(self.member.member_id))
+        self.sanction()
+
+        comment = RecipeComment.objects.create(
+            recipe=self.recipe, author=self.member, content="광고", created_at=timezone.now(),
+        )
+        report = Report.objects.create(
+            reporter=self.author, target_type="COMMENT", comment=comment, reason="광고",
+            status="PENDING", created_at=timezone.now(),
+        )
+        token = create_jwt(member_id=self.admin.member_id, role="ADMIN")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/admin/reports/{report.report_id}/", {"status": "RESOLVED"},
+                content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(sanctions.sanction_blocked_until(self.member.member_id))
+
+
+class ReportCreateTests(TestCase):
+    """
+    신고 접수는 한 문장으로 중복을 거르고(부분 유니크 인덱스 + ON CONFLICT), 회원별 빈도 제한은 캐시만 쓴다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.reporter = [
+            Member.objects.create(
+                login_id=f"reporter{i}", password="x", name=f"회원{i}",
+                role="USER", created_at=timezone.now(),
+            )
+            for i in range(2)
+        ]
+        cls.recipe = Recipe.objects.create(
+            author=cls.author, title="레시피", description="설명", created_at=timezone.now(),
+        )
+        cls.comment = RecipeComment.objects.create(
+            recipe=cls.recipe, author=cls.author, content="댓글", created_at=timezone.now(),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def report(self, url, reason="광고"):
+        token = create_jwt(member_id=self.reporter.member_id, role="USER")
+        return self.client.post(
+            url, {"reason": reason}, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_duplicate_pending_report_is_rejected(self):
+        url = f"/api/recipes/{self.recipe.recipe_id}/report/"
+        # JWT 회원 조회 + (대상 확인 + 중복 확인 + INSERT 한 문장)
+        with self.assertNumQueries(2):
+            response = self.report(url)
+        self.assertEqual(response.status_code, 201)
+        report_id = response.json()["report_id"]
+
+        response = self.report(url, reason="다시")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Report.objects.filter(recipe=self.recipe).count(), 1)
+
+        # 처리된 뒤에는 같은 대상을 다시 신고할 수 있다
+        Report.objects.filter(pk=report_id).update(status="REJECTED")
+        self.assertEqual(self.report(url).status_code, 201)
+
+    def test_reopen_conflicting_with_pending_report_is_409(self):
+        url = f"/api/recipes/{self.recipe.recipe_id}/report/"
+        handled_id = self.report(url).json()["report_id"]
+        Report.objects.filter(pk=handled_id).update(status="REJECTED")
+        self.assertEqual(self.report(url).status_code, 201)
+
+        admin = Member.objects.create(
+            login_id="admin", password="x", name="관리자", role="ADMIN", created_at=timezone.now(),
+        )
+        token = create_jwt(member_id=admin.member_id, role="ADMIN")
+        response = self.client.patch(
+            f"/api/admin/reports/{handled_id}/", {"status": "PENDING", "handle_note": "재검토"},
+            content_type="application/json", HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            Report.objects.values_list("status", "handle_note").get(pk=handled_id), ("REJECTED", None),
+        )
+
+        comment_url = f"/api/comments/{self.comment.comment_id}/report/"
+        self.assertEqual(self.report(comment_url).status_code, 201)
+        self.assertEqual(self.report(comment_url).status_code, 400)
+
+    def test_missing_target_returns_404(self):
+        self.assertEqual(self.report("/api/recipes/999999/report/").status_code, 404)
+        self.assertEqual(self.report("/api/comments/999999/report/").status_code, 404)
+        self.assertFalse(Report.objects.exists())
+
+    def test_rate_limit(self):
+        recipes = [
+            Recipe.objects.create(
+                author=self.author, title=f"레시피 {i}", description="설명", created_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        with mock.patch.object(ReportRateThrottle, "limit", 2):
+            responses = [self.report(f"/api/recipes/{recipe.recipe_id}/report/") for recipe in recipes]
+        self.assertEqual([r.status_code for r in responses], [201, 201, 429])
+        self.assertIn("Retry-After", responses[-1].headers)
+        self.assertIn("신고가 너무 많습니다.", responses[-1].json()["detail"])
+        self.assertEqual(Report.objects.count(), 2)
+
+
+class RecipeSearchTests(TestCase):
+    """
+    GET /api/recipes/search/ : recipe_search(0002 마이그레이션 트리거가 유지)로
+    제목 > 태그/재료 > 설명 순 관련도 정렬, trigram 오타 일치, (rank, recipe_id) cursor 페이지네이션.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            cls.has_trgm = cursor.fetchone() is not None
+
+    def setUp(self):
+        if not self.has_trgm:
+            self.skipTest("pg_trgm 확장이 없는 PostgreSQL")
+        run_migration_sql("0002_recipe_search")
+
+        self.author = Member.objects.create(
+            login_id="searcher", password="x", name="요리사", role="COOK", created_at=timezone.now(),
+        )
+        kimchi = Ingredient.objects.create(name="김치")
+        self.title_hit = self.recipe("김치찌개", "얼큰한 국물")
+        self.ingredient_hit = self.recipe("돼지고기 볶음", "센 불에 볶는다")
+        RecipeIngredient.objects.create(recipe=self.ingredient_hit, ingredient=kimchi)
+        self.description_hit = self.recipe("두부 부침", "김치 곁들이면 좋다")
+        self.recipe("파국", "대파")
+        self.carbonara = self.recipe("Spaghetti Carbonara", "creamy pasta")
+
+    def recipe(self, title, description):
+        return Recipe.objects.create(
+            author=self.author, title=title, description=description, created_at=timezone.now(),
+        )
+
+    def search(self, q, **params):
+        return self.client.get("/api/recipes/search/", {"q": q, **params})
+
+    def test_rank_title_then_ingredient_then_description(self):
+        response = self.search("김치")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["recipe_id"] for r in response.json()],
+            [self.title_hit.recipe_id, self.ingredient_hit.recipe_id, self.description_hit.recipe_id],
+        )
+
+    def test_trigram_matches_typo(self):
+        response = self.search("carbonra")
+        self.assertEqual([r["recipe_id"] for r in response.json()], [self.carbonara.recipe_id])
+
+    def test_triggers_follow_title_changes(self):
+        Recipe.objects.filter(pk=self.carbonara.pk).update(title="Aglio e olio")
+        self.assertEqual(self.search("carbonara").json(), [])
+        self.assertEqual(
+            [r["recipe_id"] for r in self.search("aglio").json()], [self.carbonara.recipe_id],
+        )
+
+    def test_cursor_pages_over_rank_ties(self):
+        # 같은 rank 5개 + 더 높은 rank 1개 → (-rank, -recipe_id) 순서
+        tied = [self.recipe("된장국", f"국 {i}") for i in range(5)]
+        best = self.recipe("된장 된장국", "된장")
+        expected = [best.recipe_id] + sorted((r.recipe_id for r in tied), reverse=True)
+
+        seen, url, params = [], "/api/recipes/search/", {"q": "된장", "page_size": 2}
+        for _ in range(len(expected)):
+            body = self.client.get(url, params).json()
+            seen.extend(r["recipe_id"] for r in body["results"])
+            url, params = body["next"], None
+            if not url:
+                break
+        self.assertIsNone(url)
+        self.assertEqual(seen, expected)
+
+
+class PopularRecipeTests(TestCase):
+    """
+    GET /api/recipes/popular/ : 스냅샷(mv_recipe_popularity)이 충분히 새로우면 MV 를 정렬 인덱스 순서로,
+    비어 있거나 오래됐으면 v_recipe_summary 를 직접 읽는다.
+    """
+
+    # 운영 DB 의 v_recipe_summary 대역 (뷰 정의는 저장소 밖에 있다)
+    SUMMARY_VIEW_SQL = """
+        DROP TABLE mv_recipe_popularity;
+        DROP TABLE v_recipe_summary;
+        CREATE VIEW v_recipe_summary AS
+        SELECT recipe_id, title, description, cooking_time,
+               coalesce(avg_score, 0)::numeric(3, 2) AS avg_score,
+               coalesce(rating_count, 0) AS rating_count,
+               like_count, comment_count
+        FROM recipe;
+    """
+
+    def setUp(self):
+        cache.clear()
+        with connection.cursor() as cursor:
+            cursor.execute(self.SUMMARY_VIEW_SQL)
+        # refresh 전이라 popularity_refresh_state 가 비어 있음 = 스냅샷 시각을 모르는 상태
+        run_migration_sql("0004_recipe_popularity_mv")
+
+        author = Member.objects.create(
+            login_id="popular", password="x", name="요리사", role="COOK", created_at=timezone.now(),
+        )
+
+        def recipe(title, likes, avg, ratings):
+            return Recipe.objects.create(
+                author=author, title=title, description="", created_at=timezone.now(),
+                like_count=likes, avg_score=avg, rating_count=ratings,
+            )
+
+        self.a = recipe("a", 9, Decimal("1.00"), 1)
+        self.b = recipe("b", 5, Decimal("4.50"), 2)
+        self.c = recipe("c", 5, Decimal("4.50"), 2)    # b 와 동점 → recipe_id 큰 c 가 먼저
+        self.e = recipe("e", 5, Decimal("3.00"), 4)
+
+    def ids(self, **params):
+        seen, url = [], "/api/recipes/popular/"
+        params = {"page_size": 2, **params}
+        for _ in range(10):
+            body = self.client.get(url, params).json()
+            seen.extend(r["recipe_id"] for r in body["results"])
+            url, params = body["next"], None
+            if not url:
+                return seen
+        self.fail("다음 페이지가 끝나지 않습니다")
+
+    def test_missing_snapshot_falls_back_to_summary_view(self):
+        self.assertIs(queries.popular_recipes_queryset().model, RecipeSummary)
+        self.assertEqual(self.ids(), [r.recipe_id for r in (self.a, self.c, self.b, self.e)])
+
+    def test_fresh_snapshot_is_served_from_mv(self):
+        call_command("refresh_popular_recipes", stdout=io.StringIO())   # CONCURRENTLY
+        self.assertIsNotNone(queries.popularity_refreshed_at())
+        Recipe.objects.filter(pk=self.a.pk).update(like_count=0)
+
+        self.assertIs(queries.popular_recipes_queryset().model, RecipePopularity)
+        # 스냅샷 시점 순서 그대로
+        self.assertEqual(self.ids(), [r.recipe_id for r in (self.a, self.c, self.b, self.e)])
+
+        call_command("refresh_popular_recipes", stdout=io.StringIO())
+        self.assertEqual(self.ids(), [r.recipe_id for r in (self.c, self.b, self.e, self.a)])
+
+    def test_concurrent_refresh_rewrites_only_changed_rows(self):
+        def row_locations():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT recipe_id, ctid::text FROM mv_recipe_popularity")
+                return dict(cursor.fetchall())
+
+        queries.refresh_popularity()
+        before = row_locations()
+        Recipe.objects.filter(pk=self.e.pk).update(comment_count=3)
+        queries.refresh_popularity()
+        after = row_locations()
+
+        self.assertEqual(
+            [recipe_id for recipe_id in before if before[recipe_id] != after[recipe_id]],
+            [self.e.recipe_id],
+        )
+        # 스냅샷 시각은 MV 행이 아니라 popularity_refresh_state 에 있다
+        # (테스트 트랜잭션 안에서는 now() 가 고정이라 위 비교만으로는 잡히지 않음)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM mv_recipe_popularity LIMIT 0")
+            self.assertNotIn("refreshed_at", [column.name for column in cursor.description])
+
+    def test_stale_snapshot_falls_back_to_summary_view(self):
+        queries.refresh_popularity()
+        Recipe.objects.filter(pk=self.a.pk).update(like_count=0)
+
+        with override_settings(POPULAR_RECIPES_MAX_STALENESS=0):
+            self.assertIs(queries.popular_recipes_queryset().model, RecipeSummary)
+            self.assertEqual(self.ids(), [r.recipe_id for r in (self.c, self.b, self.e, self.a)])
+
+    def test_ordering_matches_rank_index(self):
+        queries.refresh_popularity()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            queries.popular_recipes_queryset()
+            .order_by(*PopularRecipeListAPIView.cursor_ordering)[:20]
+            .explain()
+        )
+        self.assertIn("mv_recipe_popularity_rank_idx", plan)
+        self.assertNotIn("Sort", plan)
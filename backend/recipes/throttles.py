@@ -0,0 +1,83 @@
+"""
+요청 빈도 제한 (DRF throttle).
+
+신고 접수는 회원별로 REPORT_RATE_WINDOW 초 동안 REPORT_RATE_LIMIT 건까지만 받는다.
+DRF 기본 SimpleRateThrottle 은 요청 시각 목록을 통째로 캐시에 읽고 쓰므로,
+여기서는 고정 창 카운터 두 개(이전 창 / 현재 창)로 슬라이딩 윈도우를 근사한다.
+  추정치 = 이전 창 건수 × (현재 창에서 아직 지나지 않은 비율) + 현재 창 건수
+요청마다 캐시 get_many 1번 + incr 1번이고 DB 는 읽지 않는다.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+REPORT_RATE_LIMIT = getattr(settings, "REPORT_RATE_LIMIT", 10)
+REPORT_RATE_WINDOW = getattr(settings, "REPORT_RATE_WINDOW", 10 * 60)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    로그인한 회원 단위 슬라이딩 윈도우 카운터.
+    하위 클래스에서 scope / limit / window 를 정한다 (비로그인 요청은 다른 permission 이 막으므로 통과).
+    """
+    scope = None
+    limit = None
+    window = None
+
+    def _key(self, member_id, index):
+        return f"throttle:{self.scope}:{member_id}:{index}"
+
+    def allow_request(self, request, view):
+        user = request.user
+        if not user or not getattr(user, "is_authenticated", False):
+            return True
+
+        now = time.time()
+        index, offset = divmod(now, self.window)
+        index = int(index)
+        previous_key = self._key(user.member_id, index - 1)
+        current_key = self._key(user.member_id, index)
+        counts = cache.get_many([previous_key, current_key])
+        previous = counts.get(previous_key, 0)
+        current = counts.get(current_key, 0)
+
+        remaining = 1 - offset / self.window
+        if previous * remaining + current + 1 > self.limit:
+            self._wait = self._retry_after(previous, current, offset)
+            return False
+
+        # 현재 창 카운터는 다음 창에서 "이전 창" 으로 쓰이므로 창 두 개 길이만큼 유지
+        if not cache.add(current_key, 1, self.window * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                # add 와 incr 사이에 만료된 경우
+                cache.set(current_key, 1, self.window * 2)
+        return True
+
+    def _retry_after(self, previous, current, offset):
+        """추정치가 limit - 1 이하로 내려갈 때까지 남은 시간(초)"""
+        allowed = self.limit - 1
+        if current > allowed:
+            # 현재 창 건수만으로 넘친 경우: 다음 창에서 current 가 이전 창 몫으로 줄어들 때까지
+            return (self.window - offset) + self.window * (1 - allowed / current)
+        # 이전 창 몫이 줄어들 때까지: previous × (1 - t/window) + current <= allowed
+        return max(self.window * (1 - (allowed - current) / previous) - offset, 1)
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class ReportRateThrottle(SlidingWindowThrottle):
+    scope = "report"
+    limit = REPORT_RATE_LIMIT
+    window = REPORT_RATE_WINDOW
+
+
+class ReportThrottled(Throttled):
+    default_detail = "신고가 너무 많습니다. 잠시 후 다시 시도해주세요."
+    extra_detail_singular = "({wait}초 후 가능)"
+    extra_detail_plural = "({wait}초 후 가능)"
@@ -0,0 +1,181 @@
+"""
+시간 감쇠(exponential decay) 트렌딩 점수.
+
+이벤트(좋아요/평점/댓글) 하나의 현재 점수는 weight * exp(-λ (now - t)) 이다.
+모든 레시피에 같은 exp(-λ now) 가 곱해지므로 순위에는 영향이 없어서,
+고정된 기준 시각 epoch 로 환산한 weight * exp(λ (t - epoch)) 를 누적해 두면
+시간이 지나도 기존 점수를 다시 계산할 필요 없이 새 이벤트만 더하면 된다 (forward decay).
+
+update_trending() 한 번은
+  1) 지난 실행 이후 생긴 이벤트를 더하고
+  2) 윈도우(TRENDING_WINDOW_DAYS) 밖으로 나간 이벤트를 빼고
+  3) 지수가 너무 커지기 전에 epoch 를 현재로 옮긴다(전체 점수에 상수 곱)
+모두 시각 인덱스를 타는 구간 스캔이고, 요청 처리 중에는 recipe_trending 만 읽는다.
+
+취소된 좋아요 / 삭제된 댓글 / 삭제된 평점은 지우는 문장 안에서 retract_sql() 로 이미 더한 점수를 뺀다
+(queries.toggle_recipe_like / delete_comment / delete_rating).
+그 밖의 경로(관리자 화면, 직접 SQL, 과거 시각으로 이관한 평점)는 증분에 잡히지 않으므로
+manage.py update_trending --loop 가 TRENDING_REBUILD_INTERVAL 마다 rebuild=True 로 다시 만든다.
+"""
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+
+TRENDING_HALF_LIFE_HOURS = getattr(settings, "TRENDING_HALF_LIFE_HOURS", 24)
+TRENDING_WINDOW_DAYS = getattr(settings, "TRENDING_WINDOW_DAYS", 7)
+# 커밋이 늦은 이벤트를 놓치지 않도록 이 시간만큼 이전까지만 반영
+TRENDING_LAG_SECONDS = getattr(settings, "TRENDING_LAG_SECONDS", 60)
+TRENDING_WEIGHTS = getattr(
+    settings,
+    "TRENDING_WEIGHTS",
+    {"like": 1.0, "rating": 1.5, "comment": 2.0},
+)
+
+# (가중치 키, 테이블, 시각 컬럼)
+EVENT_SOURCES = (
+    ("like", "recipe_like", "liked_at"),
+    ("rating", "rating", "created_at"),
+    ("comment", "recipe_comment", "created_at"),
+)
+
+# λ·(now - epoch) 가 이 값을 넘으면 epoch 를 옮긴다 (exp 오버플로 방지)
+_REBASE_EXPONENT = 30.0
+
+
+def decay_rate():
+    """초당 감쇠율 λ"""
+    return math.log(2) / (TRENDING_HALF_LIFE_HOURS * 60 * 60)
+
+
+def _events_sql():
+    """
+    구간 (lower, upper] 에 속한 이벤트의 레시피별 환산 점수 합.
+    파라미터: 소스마다 (weight, λ, epoch, lower, upper)
+    """
+    parts = [
+        f"""
+        SELECT recipe_id, %s * exp(%s * extract(epoch FROM {column} - %s)) AS score
+        FROM {table}
+        WHERE {column} > %s AND {column} <= %s
+        """
+        for _, table, column in EVENT_SOURCES
+    ]
+    return (
+        "SELECT recipe_id, sum(score) AS score FROM ("
+        + " UNION ALL ".join(parts)
+        + ") events GROUP BY recipe_id"
+    )
+
+
+def _events_params(rate, epoch, lower, upper):
+    params = []
+    for key, _, _ in EVENT_SOURCES:
+        params += [TRENDING_WEIGHTS[key], rate, epoch, lower, upper]
+    return params
+
+
+def retract_sql(kind, removed):
+    """
+    지운 이벤트의 점수를 recipe_trending 에서 빼는 CTE 본문 (원본 행을 지우는 문장 안에서 쓴다).
+    removed 는 지운 이벤트의 (recipe_id, 이벤트 시각) 을 돌려주는 SELECT.
+    이미 더해졌고(시각 <= processed_until) 아직 윈도우 안인 이벤트만 뺀다.
+    trending_state 를 FOR SHARE 로 읽으므로 실행 중인 update_trending 이 끝난 뒤의 상태 기준으로 빼고,
+    반대로 update_trending 은 이 문장이 커밋된 뒤에 시작한다 (FOR SHARE 끼리는 서로 막지 않는다).
+    """
+    weight = float(TRENDING_WEIGHTS[kind])
+    window_seconds = TRENDING_WINDOW_DAYS * 24 * 60 * 60
+    return f"""
+        UPDATE recipe_trending t
+        SET score = t.score - e.score
+        FROM (
+            SELECT d.recipe_id,
+                   sum({weight!r} * exp({decay_rate()!r} * extract(epoch FROM d.at - s.epoch))) AS score
+            FROM ({removed}) d (recipe_id, at)
+            CROSS JOIN (
+                SELECT epoch, processed_until FROM trending_state WHERE id = 1 FOR SHARE
+            ) s
+            WHERE d.at <= s.processed_until
+              AND d.at > s.processed_until - make_interval(secs => {window_seconds})
+            GROUP BY d.recipe_id
+        ) e
+        WHERE t.recipe_id = e.recipe_id
+    """
+
+
+def update_trending(rebuild=False, now=None):
+    """
+    트렌딩 점수 한 단계 갱신. 동시에 여러 번 돌더라도 trending_state 행 잠금으로 직렬화된다.
+    now 를 주지 않으면 DB 의 now() 를 기준으로 한다.
+    반환: 반영한 구간의 끝 시각
+    """
+    rate = decay_rate()
+    window = timedelta(days=TRENDING_WINDOW_DAYS)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if now is None:
+            cursor.execute("SELECT now()")
+            now = cursor.fetchone()[0]
+        upper = now - timedelta(seconds=TRENDING_LAG_SECONDS)
+
+        cursor.execute(
+            "SELECT epoch, processed_until FROM trending_state WHERE id = 1 FOR UPDATE"
+        )
+        row = cursor.fetchone()
+
+        if row is None or rebuild:
+            # 윈도우 안의 이벤트로 처음부터 다시 계산
+            cursor.execute("DELETE FROM recipe_trending")
+            cursor.execute(
+                "INSERT INTO recipe_trending (recipe_id, score) " + _events_sql(),
+                _events_params(rate, upper, upper - window, upper),
+            )
+            cursor.execute(
+                """
+                INSERT INTO trending_state (id, epoch, processed_until) VALUES (1, %s, %s)
+                ON CONFLICT (id) DO UPDATE
+                    SET epoch = EXCLUDED.epoch, processed_until = EXCLUDED.processed_until
+                """,
+                [upper, upper],
+            )
+            return upper
+
+        epoch, lower = row
+        if upper <= lower:
+            return lower
+
+        # 1) 새 이벤트: (lower, upper] 중 아직 윈도우 안에 있는 것
+        cursor.execute(
+            "INSERT INTO recipe_trending (recipe_id, score) "
+            + _events_sql()
+            + " ON CONFLICT (recipe_id) DO UPDATE"
+              " SET score = recipe_trending.score + EXCLUDED.score",
+            _events_params(rate, epoch, max(lower, upper - window), upper),
+        )
+
+        # 2) 윈도우 밖으로 나간 이벤트: 이전에 더했던 것(t <= lower) 중
+        #    (lower - window, upper - window] 구간
+        expired_upper = min(lower, upper - window)
+        if expired_upper > lower - window:
+            cursor.execute(
+                "UPDATE recipe_trending t SET score = t.score - e.score FROM ("
+                + _events_sql()
+                + ") e WHERE t.recipe_id = e.recipe_id",
+                _events_params(rate, epoch, lower - window, expired_upper),
+            )
+            # 윈도우 안 이벤트의 최솟값은 weight * exp(-λ·window) 정도이므로 그보다 한참 작으면 0 으로 본다
+            threshold = 1e-6 * math.exp(rate * (upper - window - epoch).total_seconds())
+            cursor.execute("DELETE FROM recipe_trending WHERE score <= %s", [threshold])
+
+        # 3) epoch 이동
+        if rate * (upper - epoch).total_seconds() > _REBASE_EXPONENT:
+            factor = math.exp(-rate * (upper - epoch).total_seconds())
+            cursor.execute("UPDATE recipe_trending SET score = score * %s", [factor])
+            epoch = upper
+
+        cursor.execute(
+            "UPDATE trending_state SET epoch = %s, processed_until = %s WHERE id = 1",
+            [epoch, upper],
+        )
+    return upper
@@ -0,0 +1,127 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+# 레시피 이미지 업로드 최대 크기(바이트)
+RECIPE_IMAGE_MAX_UPLOAD_SIZE = getattr(
+    settings, "RECIPE_IMAGE_MAX_UPLOAD_SIZE", 10 * 1024 * 1024
+)
+
+# 파일 앞부분(magic bytes) → (content_type, 확장자)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"GIF87a", "image/gif", ".gif"),
+    (b"GIF89a", "image/gif", ".gif"),
+)
+_SNIFF_SIZE = 12
+
+
+def sniff_image_type(head):
+    """파일 앞 12바이트로 실제 이미지 형식 판별. 모르는 형식이면 None."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    for signature, content_type, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extension
+    return None
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ImageUploadedFile(TemporaryUploadedFile):
+    """스트리밍하면서 계산한 sha256 / 판별한 확장자를 함께 들고 있는 업로드 파일"""
+    sha256 = None
+    extension = None
+
+
+class RecipeImageUploadHandler(FileUploadHandler):
+    """
+    레시피 이미지(field_name)만 받는 스트리밍 업로드 핸들러.
+    - 청크 단위로 임시 파일에 쓰고 (메모리에 통째로 올리지 않음)
+    - 받는 동안 sha256 을 계산하고
+    - 첫 청크의 magic bytes 로 실제 형식을 확인하고
+    - 최대 크기를 넘는 순간 파일 쓰기를 중단한다 (나머지 본문은 버리면서 읽음)
+    문제가 있으면 self.error (UploadRejected) 에 남기고, View 가 응답으로 바꾼다.
+    """
+
+    def __init__(self, request=None, field_name="image", max_size=None):
+        super().__init__(request)
+        self.field_name = field_name
+        self.max_size = max_size or RECIPE_IMAGE_MAX_UPLOAD_SIZE
+        self.error = None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if field_name != self.field_name:
+            self.reject(400, "허용되지 않은 파일 필드입니다.")
+        if content_length is not None and content_length > self.max_size:
+            self.reject_too_large()
+
+        self.file = ImageUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        self.hasher = hashlib.sha256()
+        self.head = b""
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.reject_too_large()
+
+        if len(self.head) < _SNIFF_SIZE:
+            self.head += raw_data[:_SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= _SNIFF_SIZE and sniff_image_type(self.head) is None:
+                self.reject_unsupported()
+
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+        # 다른 핸들러로 넘기지 않음
+        return None
+
+    def file_complete(self, file_size):
+        detected = sniff_image_type(self.head)
+        if detected is None:
+            self.reject_unsupported()
+
+        self.file.content_type, self.file.extension = detected
+        self.file.sha256 = self.hasher.hexdigest()
+        self.file.size = file_size
+        self.file.seek(0)
+        return self.file
+
+    def reject(self, status_code, detail):
+        self.error = UploadRejected(status_code, detail)
+        file = getattr(self, "file", None)
+        if file is not None:
+            file.close()
+        # 남은 본문은 Django 가 읽어서 버린다. connection_reset=True 로 읽기를 멈추면
+        # 브라우저가 응답(413/415 JSON) 대신 연결 끊김을 보게 된다.
+        raise StopUpload()
+
+    def reject_too_large(self):
+        limit_mb = self.max_size / (1024 * 1024)
+        self.reject(413, f"이미지는 {limit_mb:g}MB 까지 업로드할 수 있습니다.")
+
+    def reject_unsupported(self):
+        self.reject(415, "JPEG, PNG, GIF, WebP 이미지만 업로드할 수 있습니다.")
+
+
+def store_recipe_image(uploaded):
+    """
+    내용 해시 기반 경로(recipes/ab/abcdef....jpg)에 저장하고 URL 을 돌려준다.
+    같은 이미지는 한 번만 저장된다.
+    """
+    digest = uploaded.sha256
+    name = f"recipes/{digest[:2]}/{digest}{uploaded.extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, uploaded)
+    return default_storage.url(name)
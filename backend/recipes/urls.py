@@ -1,6 +1,8 @@
 from django.urls import path
 from .views import (
     RecipeListAPIView,
+    RecipeSearchAPIView,
+    RecipeIngredientMatchAPIView,
     RecipeDetailAPIView,
     RecipeCommentListAPIView,
     MemberSignupAPIView,
@@ -12,11 +14,18 @@ from .views import (
     RecipeCommentDeleteAPIView,
     FollowToggleAPIView,
     FollowingListAPIView,
+    FollowerListAPIView,
+    FollowStatusAPIView,
+    FeedAPIView,
     PopularRecipeListAPIView,
+    RecipeTrendingListAPIView,
     RecipeReportCreateAPIView,     # ✅ 추가
     CommentReportCreateAPIView,    # ✅ 추가
     AdminReportListAPIView,        # ✅ 추가
+    AdminModerationQueueAPIView,
+    AdminReportBulkUpdateAPIView,
     AdminReportUpdateAPIView,      # ✅ 추가
+    AdminRatingImportAPIView,
     RecipeCreateView,
     MyRecipeListAPIView,
     LikedRecipeListAPIView,
@@ -30,6 +39,8 @@ urlpatterns = [
     # 레시피 목록 & 생성
     path('api/recipes/', RecipeListAPIView.as_view(), name='recipe-list'),
     path('api/recipes/create/', RecipeCreateView.as_view(), name='recipe-create'),
+    path('api/recipes/search/', RecipeSearchAPIView.as_view(), name='recipe-search'),
+    path('api/recipes/by-ingredients/', RecipeIngredientMatchAPIView.as_view(), name='recipe-by-ingredients'),
 
     # 레시피 상세 / 수정 / 삭제
     path('api/recipes/<int:recipe_id>/', RecipeDetailAPIView.as_view(), name='recipe-detail'),
@@ -53,13 +64,24 @@ urlpatterns = [
     # 팔로우
     path('api/members/<int:member_id>/follow/', FollowToggleAPIView.as_view(), name='member-follow'),
     path('api/members/<int:member_id>/following/', FollowingListAPIView.as_view(), name='member-following'),
+    path('api/members/<int:member_id>/followers/', FollowerListAPIView.as_view(), name='member-followers'),
+    path('api/members/following-status/', FollowStatusAPIView.as_view(), name='member-following-status'),
+
+    # 팔로우 피드
+    path('api/feed/', FeedAPIView.as_view(), name='feed'),
 
     # 인기 레시피
     path('api/recipes/popular/', PopularRecipeListAPIView.as_view(), name='recipe-popular'),
+    path('api/recipes/trending/', RecipeTrendingListAPIView.as_view(), name='recipe-trending'),
 
     # ✅ 신고 관련
     path('api/recipes/<int:recipe_id>/report/', RecipeReportCreateAPIView.as_view(), name='recipe-report'),
     path('api/comments/<int:comment_id>/report/', CommentReportCreateAPIView.as_view(), name='comment-report'),
     path('api/admin/reports/', AdminReportListAPIView.as_view(), name='admin-report-list'),
+    path('api/admin/reports/queue/', AdminModerationQueueAPIView.as_view(), name='admin-report-queue'),
+    path('api/admin/reports/bulk/', AdminReportBulkUpdateAPIView.as_view(), name='admin-report-bulk'),
     path('api/admin/reports/<int:report_id>/', AdminReportUpdateAPIView.as_view(), name='admin-report-update'),
+
+    # 평점 일괄 이관
+    path('api/admin/ratings/import/', AdminRatingImportAPIView.as_view(), name='admin-rating-import'),
 ]
@@ -2,25 +2,23 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
-from django.db import transaction
-from django.db.models import Count
-from django.core.files.storage import default_storage
-from django.utils.crypto import get_random_string
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch
 from rest_framework.parsers import MultiPartParser, FormParser
-import os
 from rest_framework import generics, permissions, filters
 from rest_framework.exceptions import PermissionDenied
 
 from .jwt_utils import create_jwt
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
-from .authentication import JWTAuthentication
+from .authentication import JWTAuthentication, invalidate_member
 from .models import (
     Recipe,
     RecipeComment,
     Member,
     RecipeLike,
+    RecipeTag,
     Rating,
-    Follow,
     RecipeSummary,
     Report,
     UserSanction,
@@ -34,12 +32,15 @@ from .serializers import (
     RecipeListSerializer,
     RecipeDetailSerializer,
     RecipeCommentSerializer,
+    RecipeCommentThreadSerializer,
     MemberSignupSerializer,
     MemberLoginSerializer,
     RecipeCreateUpdateSerializer,
     RatingCreateUpdateSerializer,
+    RatingImportSerializer,
     RecipeCommentCreateSerializer,
     MemberSimpleSerializer,
+    MemberFollowSerializer,
     PopularRecipeSerializer,
     ReportCreateSerializer,
     ReportListSerializer,
@@ -47,57 +48,152 @@ from .serializers import (
     RecipeCreateSerializer,
     MyRecipeSerializer,
     MemberMeSerializer,
+    IngredientMatchSerializer,
+    IngredientMatchQuerySerializer,
+    ModerationQueueItemSerializer,
+    ReportBulkUpdateSerializer,
 )
-from .permissions import IsAuthorOrAdmin
+from .permissions import IsAuthorOrAdmin, IsNotSanctioned
+from .sanctions import invalidate_sanction_cache
+from .throttles import ReportRateThrottle, ReportThrottled
+from .pagination import AlwaysKeysetPagination, KeysetPagination
+from .filters import TagFilterBackend, tag_facets
+from django.db import connection
+from .queries import (
+    comment_threads,
+    create_comment,
+    delete_comment,
+    delete_rating,
+    followed_member_ids,
+    import_ratings,
+    popular_recipes_queryset,
+    recipe_detail_queryset,
+    search_recipes_queryset,
+    search_terms,
+    toggle_follow,
+    toggle_recipe_like,
+    upsert_rating,
+    viewer_recipe_state,
+)
+from .ingredient_index import get_ingredient_index
+from .feed import feed_queryset, follow_added, follow_removed
+from .moderation import (
+    QUEUE_ORDERING,
+    bulk_handle_reports,
+    create_report,
+    load_target_previews,
+    moderation_queue_queryset,
+)
+from .images import schedule_recipe_image
+from .uploads import RecipeImageUploadHandler, store_recipe_image
+from .cache import (
+    RECIPE_DETAIL_CACHE_TIMEOUT,
+    bump_recipe_detail_version,
+    recipe_detail_cache_key,
+)
+from django.core.cache import cache
 
 class MemberMeAPIView(APIView):
     authentication_classes = [JWTAuthentication]  # ✅ 추가
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        qs = (
+        # member + member_stats 를 PK 로 한 번에 (레시피/좋아요를 집계하지 않음)
+        me = (
             Member.objects
+            .select_related("stats")
             .filter(pk=request.user.pk)
-            .annotate(
-                recipe_count=Count("recipes", distinct=True),
-                like_received_count=Count("recipes__likes", distinct=True),
-            )
+            .first()
         )
-        me = qs.first()
         serializer = MemberMeSerializer(me)
         return Response(serializer.data)
 
-class LikedRecipeListAPIView(generics.ListAPIView):
+class ViewerStateListMixin:
+    """
+    로그인 사용자면 목록(현재 페이지)에 있는 레시피들의 is_liked / my_score 를
+    쿼리 1번으로 구해 serializer context(viewer_state)로 넘긴다. 카드마다 조회하지 않는다.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get("many") and args and self.request.user.is_authenticated:
+            kwargs.setdefault("context", self.get_serializer_context())
+            kwargs["context"]["viewer_state"] = viewer_recipe_state(
+                self.request.user, [obj.recipe_id for obj in args[0]]
+            )
+        return super().get_serializer(*args, **kwargs)
+
+
+class LikedRecipeListAPIView(ViewerStateListMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = MyRecipeSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-liked_at", "-recipe_id")
 
     def get_queryset(self):
         user = self.request.user
         # 현재 로그인한 사용자가 좋아요한 레시피
+        # (member, recipe) 는 유일하므로 distinct 없이 같은 join 으로 liked_at 을 꺼내 정렬 키로 사용
         return (
             Recipe.objects.filter(likes__member=user)
-            .order_by("-likes__liked_at", "-created_at")
-            .distinct()
+            .annotate(liked_at=F("likes__liked_at"))
+            .order_by(*self.cursor_ordering)
         )
 
-class MyRecipeListAPIView(generics.ListAPIView):
+class MyRecipeListAPIView(ViewerStateListMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = MyRecipeSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created_at", "-recipe_id")
 
     def get_queryset(self):
         # JWT 인증으로 들어온 현재 로그인 사용자 기준
         return Recipe.objects.filter(
             author=self.request.user
-        ).order_by("-created_at")
+        ).order_by(*self.cursor_ordering)
+
+class TagFacetListMixin:
+    """
+    목록 응답이 페이지네이션 형태({next, previous, results})일 때
+    필터가 적용된 전체 결과의 태그별 개수(facets.tags)를 함께 돌려준다.
+    페이지 조회와 개수 집계가 같은 스냅샷을 보도록 REPEATABLE READ 트랜잭션에서 읽는다.
+    """
 
-class RecipeListAPIView(generics.ListCreateAPIView):
-    queryset = Recipe.objects.select_related('author').order_by('-created_at')
-    filter_backends = [filters.SearchFilter]
+    def list(self, request, *args, **kwargs):
+        if connection.in_atomic_block:
+            return super().list(request, *args, **kwargs)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            return super().list(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        self.filtered_queryset = super().filter_queryset(queryset)
+        return self.filtered_queryset
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data["facets"] = {"tags": tag_facets(self.filtered_queryset)}
+        return response
+
+
+class RecipeListAPIView(ViewerStateListMixin, TagFacetListMixin, generics.ListCreateAPIView):
+    # 태그는 페이지 전체를 한 번에 prefetch (recipe_tag JOIN tag 1회) → 목록 크기와 무관하게 쿼리 2개
+    queryset = (
+        Recipe.objects
+        .select_related('author')
+        .prefetch_related(
+            Prefetch('recipe_tags', queryset=RecipeTag.objects.select_related('tag'))
+        )
+        .order_by('-created_at', '-recipe_id')
+    )
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created_at', '-recipe_id')
+    filter_backends = [filters.SearchFilter, TagFilterBackend]
     search_fields = ['title', 'description']   # ← 일단 여기만 사용
 
     def get_permissions(self):
         if self.request.method == 'POST':
-            return [permissions.IsAuthenticated()]
+            return [permissions.IsAuthenticated(), IsNotSanctioned()]
         return [permissions.AllowAny()]
 
     def get_serializer_class(self):
@@ -105,46 +201,165 @@ class RecipeListAPIView(generics.ListCreateAPIView):
             return RecipeCreateUpdateSerializer
         return RecipeListSerializer
 
+class RecipeSearchAPIView(ViewerStateListMixin, TagFacetListMixin, generics.ListAPIView):
+    """
+    GET /api/recipes/search/?q=<검색어>
+    제목/설명/태그/재료 이름 전문 검색 + trigram 부분 일치, 관련도(rank)순
+    (?tags=1,2&tag_mode=and|or 태그 필터 가능)
+    """
+    serializer_class = RecipeListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    filter_backends = [TagFilterBackend]
+    cursor_ordering = ('-rank', '-recipe_id')
+
+    def get_queryset(self):
+        return (
+            search_recipes_queryset(self.request.query_params.get('q'))
+            .select_related('author')
+            .prefetch_related(
+                Prefetch('recipe_tags', queryset=RecipeTag.objects.select_related('tag'))
+            )
+            .order_by(*self.cursor_ordering)
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not search_terms(request.query_params.get('q')):
+            return Response(
+                {"detail": "검색어(q)를 입력해주세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return super().list(request, *args, **kwargs)
+
+
+class RecipeIngredientMatchAPIView(APIView):
+    """
+    GET /api/recipes/by-ingredients/?ingredients=김치,두부,대파&limit=20
+    가진 재료로 만들 수 있는 레시피를 재료 충족 비율이 높은 순(→ 부족한 재료가 적은 순)으로
+    재료 역색인(recipes/ingredient_index.py)에서 바로 계산한다.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = IngredientMatchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        index = get_ingredient_index()
+        ingredient_ids, unknown = index.resolve(params.validated_data["ingredients"])
+        matches = index.match(ingredient_ids, params.validated_data["limit"])
+
+        recipes = (
+            Recipe.objects
+            .select_related('author')
+            .prefetch_related(
+                Prefetch('recipe_tags', queryset=RecipeTag.objects.select_related('tag'))
+            )
+            .in_bulk([recipe_id for recipe_id, *_ in matches])
+        )
+
+        results = []
+        for recipe_id, matched, total, missing_ids in matches:
+            recipe = recipes.get(recipe_id)
+            if recipe is None:
+                # 인덱스 재생성 전에 삭제된 레시피
+                continue
+            recipe.matched_count = matched
+            recipe.ingredient_count = total
+            recipe.coverage = round(matched / total, 4)
+            recipe.missing_ingredients = [index.ingredient_names[i] for i in missing_ids]
+            results.append(recipe)
+
+        context = {"request": request}
+        if request.user.is_authenticated:
+            context["viewer_state"] = viewer_recipe_state(
+                request.user, [recipe.recipe_id for recipe in results]
+            )
+        return Response(
+            {
+                "unknown_ingredients": unknown,
+                "results": IngredientMatchSerializer(results, many=True, context=context).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class RecipeDetailAPIView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-    def get_object(self, recipe_id):
-        return get_object_or_404(Recipe, pk=recipe_id)
+    def get_object(self, recipe_id, member=None):
+        # 작성자/태그/단계/재료/좋아요 여부까지 쿼리 1번으로 로딩
+        return get_object_or_404(recipe_detail_queryset(member), pk=recipe_id)
 
     def get(self, request, recipe_id):
-        recipe = self.get_object(recipe_id)
-
-        # 기본 상세 데이터
-        serializer = RecipeDetailSerializer(recipe)
-        data = serializer.data
-
-        # 로그인한 경우, 이 레시피에 좋아요 했는지 여부 추가
         user = request.user if request.user.is_authenticated else None
-        if user:
-            liked = RecipeLike.objects.filter(member=user, recipe=recipe).exists()
+
+        # 기본 상세 데이터는 사용자와 무관하므로 버전 키로 캐시 (수정 시 버전이 올라가 자동 무효화)
+        cache_key = recipe_detail_cache_key(recipe_id)
+        data = cache.get(cache_key)
+
+        if data is None:
+            # 캐시 미스: 좋아요 여부도 같은 쿼리에서 계산
+            recipe = self.get_object(recipe_id, member=user)
+            data = dict(RecipeDetailSerializer(recipe).data)
+            cache.set(cache_key, data, RECIPE_DETAIL_CACHE_TIMEOUT)
+            liked = recipe.is_liked
+        elif user:
+            liked = RecipeLike.objects.filter(member=user, recipe_id=recipe_id).exists()
         else:
             liked = False
 
-        data["is_liked"] = liked
-        return Response(data)
+        # 사용자별 값은 캐시된 payload 에 넣지 않고 응답 직전에 합친다
+        return Response({**data, "is_liked": liked})
 
 
 
 class RecipeCommentListAPIView(generics.ListAPIView):
     """
     GET /api/recipes/<recipe_id>/comments/
-    해당 레시피의 댓글 목록 조회
+    해당 레시피의 댓글을 루트 댓글 단위 스레드로 조회 (각 댓글에 replies / reply_count)
+    - 루트 댓글 기준 cursor 페이지네이션 (?cursor= / ?page_size=, 기본 20개)
+    - ?order=newest : 최신 루트 댓글부터 (기본은 오래된 순). 답글은 항상 작성순
+    - ?depth=N : 루트 아래 N 단계까지만 답글 포함 (더 깊은 답글은 reply_count 로만 표시)
+    루트 페이지 1번 + 답글 트리는 queries.comment_threads 의 재귀 CTE 1번으로 읽는다.
+    전체 댓글 수는 레시피 상세의 comment_count 를 쓴다.
     """
-    serializer_class = RecipeCommentSerializer
+    serializer_class = RecipeCommentThreadSerializer
+    pagination_class = AlwaysKeysetPagination
+
+    @property
+    def cursor_ordering(self):
+        if self.request.query_params.get('order') == 'newest':
+            return ('-created_at', '-comment_id')
+        return ('created_at', 'comment_id')
 
     def get_queryset(self):
         recipe_id = self.kwargs['recipe_id']
         return (
             RecipeComment.objects
-            .select_related('author', 'recipe')
-            .filter(recipe_id=recipe_id)
-            .order_by('created_at')
+            .filter(recipe_id=recipe_id, parent_comment__isnull=True)
+            .only('comment_id', 'created_at')
+            .order_by(*self.cursor_ordering)
+        )
+
+    def get_max_depth(self):
+        raw = self.request.query_params.get('depth')
+        if raw is None:
+            return None
+        try:
+            depth = int(raw)
+        except ValueError:
+            return None
+        return max(depth, 0)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        threads = comment_threads(
+            self.kwargs['recipe_id'],
+            root_ids=[comment.comment_id for comment in page],
+            max_depth=self.get_max_depth(),
         )
+        serializer = self.get_serializer(threads, many=True)
+        return self.get_paginated_response(serializer.data)
 
 # ============================
 # 회원가입 / 로그인 API
@@ -192,22 +407,23 @@ class MemberLoginAPIView(APIView):
 
 class RecipeLikeToggleAPIView(APIView):
     authentication_classes = [JWTAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsNotSanctioned]
 
     def post(self, request, recipe_id):
         member: Member = request.user
-        recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
 
-        qs = RecipeLike.objects.filter(member=member, recipe=recipe)
+        # 삭제/추가와 like_count 갱신을 한 문장으로 (queries.toggle_recipe_like)
+        result = toggle_recipe_like(member.member_id, recipe_id)
+        if result is None:
+            raise Http404
+        liked, created, like_count = result
 
-        if qs.exists():
-            # 이미 좋아요 되어 있으면 → 취소
-            qs.delete()   # ✅ member+recipe 조건으로 삭제
-            return Response({"liked": False}, status=status.HTTP_200_OK)
-        else:
-            # 아직 좋아요 안 했으면 → 추가
-            RecipeLike.objects.create(member=member, recipe=recipe)
-            return Response({"liked": True}, status=status.HTTP_201_CREATED)
+        # 상세 캐시에 like_count 가 들어 있으므로 무효화
+        bump_recipe_detail_version(recipe_id)
+        return Response(
+            {"liked": liked, "like_count": like_count},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 
 class RecipeRatingAPIView(APIView):
@@ -217,7 +433,7 @@ class RecipeRatingAPIView(APIView):
     DELETE /api/recipes/<recipe_id>/rating/
     """
     authentication_classes = [JWTAuthentication]
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    permission_classes = [IsAuthenticatedOrReadOnly, IsNotSanctioned]
 
     def get(self, request, recipe_id):
         recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
@@ -247,29 +463,26 @@ class RecipeRatingAPIView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
         member: Member = request.user
 
         serializer = RatingCreateUpdateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         score = serializer.validated_data["score"]
 
-        rating, created = Rating.objects.update_or_create(
-            recipe=recipe,
-            member=member,
-            defaults={"score": score},
-        )
-
-        # 트리거에 의해 recipe.avg_score, rating_count가 갱신되었을 수 있으니 새로 읽기
-        recipe.refresh_from_db()
+        # upsert 한 문장 + 트리거가 갱신한 avg_score / rating_count 읽기
+        result = upsert_rating(member.member_id, recipe_id, score)
+        if result is None:
+            raise Http404
+        created, score, avg_score, rating_count = result
+        bump_recipe_detail_version(recipe_id)
 
         return Response(
             {
                 "created": created,
-                "score": rating.score,
-                "recipe_id": recipe.recipe_id,
-                "avg_score": recipe.avg_score,
-                "rating_count": recipe.rating_count,
+                "score": score,
+                "recipe_id": recipe_id,
+                "avg_score": avg_score,
+                "rating_count": rating_count,
             },
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
         )
@@ -282,25 +495,65 @@ class RecipeRatingAPIView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
         member: Member = request.user
 
-        qs = Rating.objects.filter(recipe=recipe, member=member)
-        if not qs.exists():
+        result = delete_rating(member.member_id, recipe_id)
+        if result is None:
             return Response(
                 {"detail": "이 레시피에 남긴 평점이 없습니다."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        qs.delete()
-        recipe.refresh_from_db()
+        avg_score, rating_count = result
+        bump_recipe_detail_version(recipe_id)
 
         return Response(
             {
                 "deleted": True,
-                "recipe_id": recipe.recipe_id,
-                "avg_score": recipe.avg_score,
-                "rating_count": recipe.rating_count,
+                "recipe_id": recipe_id,
+                "avg_score": avg_score,
+                "rating_count": rating_count,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AdminRatingImportAPIView(APIView):
+    """
+    POST /api/admin/ratings/import/
+    기존 시스템 평점 이관용 일괄 등록. {"ratings": [{recipe_id, member_id, score, created_at}, ...]}
+    - 배치 하나를 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 넣는다 (있으면 점수/시각 덮어쓰기)
+    - 존재하지 않는 레시피/회원은 건너뛰고 skipped 로 센다
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        admin: Member = request.user
+
+        if admin.role != "ADMIN":
+            return Response(
+                {"detail": "관리자만 접근할 수 있습니다."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = RatingImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ratings = serializer.validated_data["ratings"]
+
+        with transaction.atomic():
+            written = import_ratings([
+                (r["recipe_id"], r["member_id"], r["score"], r["created_at"])
+                for r in ratings
+            ])
+            for recipe_id in {recipe_id for recipe_id, _ in written}:
+                bump_recipe_detail_version(recipe_id)
+
+        created = sum(1 for _, is_new in written if is_new)
+        return Response(
+            {
+                "created": created,
+                "updated": len(written) - created,
+                "skipped": len(ratings) - len(written),
             },
             status=status.HTTP_200_OK,
         )
@@ -309,31 +562,47 @@ class RecipeRatingAPIView(APIView):
 class RecipeCommentCreateAPIView(APIView):
     """
     POST /api/recipes/<recipe_id>/comments/
+    - parent_comment_id 를 주면 그 댓글의 답글로 작성
     """
     authentication_classes = [JWTAuthentication]
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsNotSanctioned]
 
     def post(self, request, recipe_id):
         serializer = RecipeCommentCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
         member: Member = request.user
         content = serializer.validated_data["content"]
+        parent_comment_id = serializer.validated_data.get("parent_comment_id")
 
-        comment = RecipeComment.objects.create(
-            recipe=recipe,
+        result = create_comment(recipe_id, member.member_id, content, parent_comment_id)
+        if result is None:
+            if not Recipe.objects.filter(recipe_id=recipe_id).exists():
+                raise Http404
+            return Response(
+                {"parent_comment_id": ["이 레시피에 없는 댓글에는 답글을 달 수 없습니다."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        comment_id, created_at, comment_count = result
+        bump_recipe_detail_version(recipe_id)
+
+        comment = RecipeComment(
+            comment_id=comment_id,
+            recipe_id=recipe_id,
             author=member,
-            content=content
+            parent_comment_id=parent_comment_id,
+            content=content,
+            created_at=created_at,
         )
+        data = RecipeCommentSerializer(comment).data
+        data["comment_count"] = comment_count
+        return Response(data, status=status.HTTP_201_CREATED)
+
 
-        return Response(
-            RecipeCommentSerializer(comment).data,
-            status=status.HTTP_201_CREATED
-        )
 class RecipeCommentDeleteAPIView(APIView):
     """
     DELETE /api/comments/<comment_id>/
+    - 답글이 달린 댓글이면 답글도 함께 삭제
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -348,7 +617,9 @@ class RecipeCommentDeleteAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        comment.delete()
+        # 답글까지 함께 지우고 recipe.comment_count 를 맞춘다
+        if delete_comment(comment.comment_id) is not None:
+            bump_recipe_detail_version(comment.recipe_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -357,6 +628,7 @@ class FollowToggleAPIView(APIView):
     POST /api/members/<member_id>/follow/
     - 팔로우 안 했으면 생성
     - 이미 팔로우 했으면 삭제(언팔)
+    follow 행과 양쪽 follower_count / following_count 를 한 문장으로 바꾼다 (queries.toggle_follow)
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -371,42 +643,141 @@ class FollowToggleAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        followee = get_object_or_404(Member, member_id=member_id)
+        with transaction.atomic():
+            result = toggle_follow(me.member_id, member_id)
+            if result is None:
+                raise Http404
+            following, created, follower_count = result
 
-        qs = Follow.objects.filter(follower=me, followee=followee)
+            # 피드 타임라인도 같은 트랜잭션에서 맞춘다
+            if created:
+                follow_added(me.member_id, member_id)
+            elif not following:
+                follow_removed(me.member_id, member_id)
 
-        if qs.exists():
-            # 이미 팔로우 → 언팔로우
-            qs.delete()
-            return Response({"following": False}, status=status.HTTP_200_OK)
-        else:
-            # 새로 팔로우
-            Follow.objects.create(follower=me, followee=followee)
-            return Response({"following": True}, status=status.HTTP_201_CREATED)
+        return Response(
+            {"following": following, "follower_count": follower_count},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 
-class FollowingListAPIView(APIView):
+class FollowListMixin:
+    """
+    팔로워/팔로잉 목록 공통.
+    - ?cursor= / ?page_size= 를 주면 keyset 페이지네이션 (팔로우한 시각 최신순)
+    - 로그인 사용자면 각 회원을 내가 팔로우하는지(is_following)를 페이지 단위로 한 번에 조회
+    """
+    serializer_class = MemberFollowSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-followed_at', '-member_id')
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get("many") and args and self.request.user.is_authenticated:
+            kwargs.setdefault("context", self.get_serializer_context())
+            kwargs["context"]["followed_ids"] = followed_member_ids(
+                self.request.user, [member.member_id for member in args[0]]
+            )
+        return super().get_serializer(*args, **kwargs)
+
+    def get_member(self):
+        return get_object_or_404(Member, member_id=self.kwargs["member_id"])
+
+
+class FollowingListAPIView(FollowListMixin, generics.ListAPIView):
     """
     GET /api/members/<member_id>/following/
     member_id 사용자가 팔로우하는 사람들 리스트
     """
-    def get(self, request, member_id):
-        member = get_object_or_404(Member, member_id=member_id)
 
-        followings = Member.objects.filter(
-            follower_set__follower=member
+    def get_queryset(self):
+        member = self.get_member()
+        return (
+            Member.objects
+            .filter(follower_set__follower=member)
+            .annotate(followed_at=F('follower_set__followed_at'))
+            .order_by(*self.cursor_ordering)
         )
 
-        data = MemberSimpleSerializer(followings, many=True).data
-        return Response(data, status=status.HTTP_200_OK)
 
+class FollowerListAPIView(FollowListMixin, generics.ListAPIView):
+    """
+    GET /api/members/<member_id>/followers/
+    member_id 사용자를 팔로우하는 사람들 리스트
+    """
 
-class PopularRecipeListAPIView(generics.ListAPIView):
+    def get_queryset(self):
+        member = self.get_member()
+        return (
+            Member.objects
+            .filter(following_set__followee=member)
+            .annotate(followed_at=F('following_set__followed_at'))
+            .order_by(*self.cursor_ordering)
+        )
+
+
+class FollowStatusAPIView(APIView):
+    """
+    GET /api/members/following-status/?ids=3,7,12
+    여러 회원을 내가 팔로우하는지 한 번에 조회 → {"following": [3, 12]}
+    (레시피 카드의 작성자 팔로우 배지 등)
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+
+    def get(self, request):
+        raw = request.query_params.get("ids", "")
+        try:
+            ids = {int(part) for part in raw.split(",") if part.strip()}
+        except ValueError:
+            return Response(
+                {"ids": "회원 id 를 쉼표로 구분해 입력해주세요. (예: 1,2,3)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > self.max_ids:
+            return Response(
+                {"ids": f"한 번에 {self.max_ids}명까지 조회할 수 있습니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        followed = followed_member_ids(request.user, ids)
+        return Response({"following": sorted(followed)}, status=status.HTTP_200_OK)
+
+
+class FeedAPIView(ViewerStateListMixin, generics.ListAPIView):
+    """
+    GET /api/feed/
+    내가 팔로우한 작성자들의 레시피 (최신순, 항상 keyset 페이지: ?cursor= / ?page_size=)
+    미리 펼쳐 둔 타임라인 + 팔로워가 많은 작성자는 조회 시 직접 읽어서 합친다 (recipes/feed.py)
+    개수 제한 없이 next 로 끝까지 넘길 수 있다.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = RecipeListSerializer
+    pagination_class = AlwaysKeysetPagination
+    cursor_ordering = ('-created_at', '-recipe_id')
+
+    def get_queryset(self):
+        return self.seek_queryset(self.cursor_ordering, None, None)
+
+    def seek_queryset(self, ordering, predicate, limit):
+        # cursor 조건과 LIMIT 을 타임라인 / pull subquery 안에 넣는다 (KeysetPagination 이 호출)
+        return (
+            feed_queryset(self.request.user, ordering, predicate, limit)
+            .select_related('author')
+            .prefetch_related(
+                Prefetch('recipe_tags', queryset=RecipeTag.objects.select_related('tag'))
+            )
+        )
+
+
+class PopularRecipeListAPIView(ViewerStateListMixin, generics.ListAPIView):
     """
     GET /api/recipes/popular/
-    v_recipe_summary 뷰를 기반으로 한 인기 레시피 목록
+    v_recipe_summary 스냅샷(mv_recipe_popularity)을 기반으로 한 인기 레시피 목록
     """
-    queryset = RecipeSummary.objects.all().order_by(
+    cursor_ordering = (
         '-like_count',
         '-avg_score',
         '-rating_count',
@@ -415,100 +786,98 @@ class PopularRecipeListAPIView(generics.ListAPIView):
     )
     serializer_class = PopularRecipeSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return popular_recipes_queryset().order_by(*self.cursor_ordering)
 
 
-class RecipeReportCreateAPIView(APIView):
+class RecipeTrendingListAPIView(ViewerStateListMixin, generics.ListAPIView):
     """
-    POST /api/recipes/<recipe_id>/report/
+    GET /api/recipes/trending/
+    최근 좋아요/평점/댓글에 시간 감쇠를 준 점수(recipe_trending)순 목록.
+    점수는 manage.py update_trending 이 주기적으로 갱신한다.
+    """
+    queryset = (
+        Recipe.objects
+        .filter(trending__isnull=False)
+        .annotate(trending_score=F('trending__score'))
+        .select_related('author')
+        .prefetch_related(
+            Prefetch('recipe_tags', queryset=RecipeTag.objects.select_related('tag'))
+        )
+        .order_by('-trending_score', '-recipe_id')
+    )
+    serializer_class = RecipeListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-trending_score', '-recipe_id')
+
+
+class ReportCreateAPIView(APIView):
+    """
+    신고 접수 공통 처리.
+    - 대상 확인 + 중복(같은 대상의 내 PENDING 신고) 확인 + INSERT 를 한 문장으로 (moderation.create_report)
+    - 회원별 신고 빈도 제한 (throttles.ReportRateThrottle, 캐시만 사용)
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [ReportRateThrottle]
+    target_type = None
 
-    def post(self, request, recipe_id):
+    def throttled(self, request, wait):
+        raise ReportThrottled(wait)
+
+    def create_report(self, request, target_id):
         reporter: Member = request.user
-        recipe = get_object_or_404(Recipe, recipe_id=recipe_id)
 
         serializer = ReportCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         reason = serializer.validated_data['reason']
 
-        # 유저가 이미 PENDING 신고를 보낸 경우 막기
-        existing = Report.objects.filter(
-            reporter=reporter,
-            target_type='RECIPE',
-            recipe=recipe,
-            status='PENDING'
-        ).first()
-
-        if existing:
+        report_id, error = create_report(reporter.member_id, self.target_type, target_id, reason)
+        if error == "not_found":
+            raise Http404
+        if error == "duplicate":
             return Response(
                 {"detail": "이미 처리 대기 중인 신고가 있습니다."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        report = Report.objects.create(
-            reporter=reporter,
-            target_type='RECIPE',
-            recipe=recipe,
-            reason=reason,
-            status='PENDING',
-            created_at=timezone.now(),
-        )
-
         return Response(
-            {"report_id": report.report_id, "message": "신고가 접수되었습니다."},
+            {"report_id": report_id, "message": "신고가 접수되었습니다."},
             status=status.HTTP_201_CREATED
         )
 
-class CommentReportCreateAPIView(APIView):
+
+class RecipeReportCreateAPIView(ReportCreateAPIView):
     """
-    POST /api/comments/<comment_id>/report/
+    POST /api/recipes/<recipe_id>/report/
     """
-    authentication_classes = [JWTAuthentication]
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request, comment_id):
-        reporter: Member = request.user
-        comment = get_object_or_404(RecipeComment, comment_id=comment_id)
-
-        serializer = ReportCreateSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        reason = serializer.validated_data['reason']
+    target_type = 'RECIPE'
 
-        existing = Report.objects.filter(
-            reporter=reporter,
-            target_type='COMMENT',
-            comment=comment,
-            status='PENDING'
-        ).first()
+    def post(self, request, recipe_id):
+        return self.create_report(request, recipe_id)
 
-        if existing:
-            return Response(
-                {"detail": "이미 처리 대기 중인 신고가 있습니다."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
 
-        report = Report.objects.create(
-            reporter=reporter,
-            target_type='COMMENT',
-            comment=comment,
-            reason=reason,
-            status='PENDING',
-            created_at=timezone.now(),
-        )
+class CommentReportCreateAPIView(ReportCreateAPIView):
+    """
+    POST /api/comments/<comment_id>/report/
+    """
+    target_type = 'COMMENT'
 
-        return Response(
-            {"report_id": report.report_id, "message": "신고가 접수되었습니다."},
-            status=status.HTTP_201_CREATED
-        )
+    def post(self, request, comment_id):
+        return self.create_report(request, comment_id)
 
 
 class AdminReportListAPIView(APIView):
     """
     GET /api/admin/reports/
+    - ?cursor= / ?page_size= 를 주면 keyset 페이지네이션 응답({next, previous, results})
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ('-created_at', '-report_id')
 
     def get(self, request):
         admin: Member = request.user
@@ -521,22 +890,57 @@ class AdminReportListAPIView(APIView):
 
         status_filter = request.query_params.get('status')
 
-        qs = Report.objects.select_related('reporter', 'handled_by').order_by('-created_at')
+        qs = Report.objects.select_related('reporter', 'handled_by').order_by(*self.cursor_ordering)
 
         if status_filter:
             qs = qs.filter(status=status_filter)
         else:
             qs = qs.filter(status='PENDING')
 
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        if page is not None:
+            serializer = ReportListSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = ReportListSerializer(qs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+class AdminModerationQueueAPIView(APIView):
+    """
+    GET /api/admin/reports/queue/
+    처리 대기 신고를 대상(레시피/댓글)별로 묶은 처리 큐 (recipes/moderation.py)
+    - 신고 수 많은 순 → 먼저 신고된 순, cursor 페이지네이션 (?cursor= / ?page_size=, 기본 20개)
+    - 각 항목에 대상 미리보기(레시피 제목 / 댓글 앞부분 + 작성자)를 포함
+    쿼리: 큐 페이지 1번 + 미리보기 (레시피 1번, 댓글 1번)
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    cursor_ordering = QUEUE_ORDERING
+
+    def get(self, request):
+        admin: Member = request.user
+
+        if admin.role != "ADMIN":
+            return Response(
+                {"detail": "관리자만 접근할 수 있습니다."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        paginator = AlwaysKeysetPagination()
+        page = paginator.paginate_queryset(moderation_queue_queryset(), request, view=self)
+        load_target_previews(page)
+        serializer = ModerationQueueItemSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
 class AdminReportUpdateAPIView(APIView):
     """
     PATCH /api/admin/reports/<report_id>/
     - 신고 상태 처리 (RESOLVED / REJECTED 등)
     - handle_note 작성
     - RESOLVED인 경우, 신고 대상 사용자에게 WARNING 제재 생성
+    - PENDING 으로 되돌릴 때 같은 신고자의 같은 대상 PENDING 신고가 있으면 409
     """
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -568,7 +972,16 @@ class AdminReportUpdateAPIView(APIView):
 
             report.handled_by = admin
             report.handled_at = timezone.now()
-            report.save()
+            try:
+                with transaction.atomic():
+                    report.save()
+            except IntegrityError:
+                # PENDING 으로 되돌리려는데 같은 신고자의 같은 대상 PENDING 신고가 이미 있음
+                # (report_pending_recipe_uniq / report_pending_comment_uniq)
+                return Response(
+                    {"detail": "같은 신고자가 같은 대상에 처리 대기 중인 신고가 이미 있습니다."},
+                    status=status.HTTP_409_CONFLICT,
+                )
 
             created_sanction_id = None
 
@@ -592,6 +1005,13 @@ class AdminReportUpdateAPIView(APIView):
                         created_at=timezone.now(),
                     )
                     created_sanction_id = sanction.sanction_id
+                    # 제재 대상의 캐시된 인증 정보 / 이용 제한 상태는 더 이상 믿지 않도록
+                    transaction.on_commit(
+                        lambda member_id=target_member.member_id: invalidate_member(member_id)
+                    )
+                    transaction.on_commit(
+                        lambda member_id=target_member.member_id: invalidate_sanction_cache(member_id)
+                    )
 
         return Response(
             {
@@ -605,24 +1025,82 @@ class AdminReportUpdateAPIView(APIView):
             status=status.HTTP_200_OK,
         )
 
+class AdminReportBulkUpdateAPIView(APIView):
+    """
+    POST /api/admin/reports/bulk/
+    신고 여러 건을 한 번에 처리 (RESOLVED / REJECTED)
+    - {"status", "handle_note", "report_ids": [...]} 또는 {"status", "handle_note", "target_type", "target_id"}
+    - 대기(PENDING) 신고만 처리하고, RESOLVED 면 대상 작성자마다 WARNING 제재를 한 건씩 만든다
+    신고 UPDATE 와 제재 INSERT 는 SQL 한 문장 (moderation.bulk_handle_reports)
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        admin: Member = request.user
+
+        if admin.role != "ADMIN":
+            return Response(
+                {"detail": "관리자만 접근할 수 있습니다."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ReportBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        target = None
+        if 'target_type' in data:
+            target = (data['target_type'], data['target_id'])
+
+        with transaction.atomic():
+            handled_ids, sanctions = bulk_handle_reports(
+                admin.member_id,
+                data['status'],
+                handle_note=data.get('handle_note'),
+                report_ids=data.get('report_ids'),
+                target=target,
+            )
+            # 제재 대상의 캐시된 인증 정보 / 이용 제한 상태는 더 이상 믿지 않도록
+            for _, member_id in sanctions:
+                transaction.on_commit(
+                    lambda member_id=member_id: invalidate_member(member_id)
+                )
+                transaction.on_commit(
+                    lambda member_id=member_id: invalidate_sanction_cache(member_id)
+                )
+
+        return Response(
+            {
+                "status": data['status'],
+                "updated": len(handled_ids),
+                "report_ids": handled_ids,
+                "created_sanction_ids": [sanction_id for sanction_id, _ in sanctions],
+                "sanctioned_member_ids": [member_id for _, member_id in sanctions],
+            },
+            status=status.HTTP_200_OK,
+        )
+
 from rest_framework.parsers import MultiPartParser, FormParser
 
 class RecipeCreateView(APIView):
     authentication_classes = [JWTAuthentication]
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsNotSanctioned]
     parser_classes = [MultiPartParser, FormParser]
 
+    def initialize_request(self, request, *args, **kwargs):
+        # 본문을 파싱하기 전에 이미지 전용 스트리밍 핸들러로 교체 (크기 제한 / 형식 확인 / 해시)
+        self.image_upload_handler = RecipeImageUploadHandler(request)
+        request.upload_handlers = [self.image_upload_handler]
+        return super().initialize_request(request, *args, **kwargs)
+
     def post(self, request):
         # 0) 이미지 파일 받기
         image_file = request.FILES.get("image")
 
-        image_path = None
-        if image_file:
-            ext = os.path.splitext(image_file.name)[1]
-            filename = f"recipes/{get_random_string(12)}{ext}"
-
-            saved_path = default_storage.save(filename, image_file)
-            image_path = f"/media/{saved_path}"
+        rejected = self.image_upload_handler.error
+        if rejected is not None:
+            return Response({"image": [rejected.detail]}, status=rejected.status_code)
 
         # 1) 재료 읽기
         ingredients = []
@@ -656,7 +1134,6 @@ class RecipeCreateView(APIView):
             "title": request.data.get("title"),
             "description": request.data.get("description"),
             "cooking_time": request.data.get("cooking_time"),
-            "image_path": image_path,
             "ingredients": ingredients,
             "steps": steps,
         }
@@ -664,7 +1141,12 @@ class RecipeCreateView(APIView):
         serializer = RecipeCreateSerializer(data=data)
 
         if serializer.is_valid():
-            recipe = serializer.save(author=request.user)
+            # 검증을 통과한 요청의 이미지만 저장 (잘못된 요청이 남기는 고아 파일 방지)
+            # 내용 해시 경로에 저장 → 같은 이미지는 한 번만 저장
+            image_path = store_recipe_image(image_file) if image_file else None
+            recipe = serializer.save(author=request.user, image_path=image_path)
+            # 썸네일/카드/원본 크기 variant 는 커밋 후 워커 풀에서 생성
+            schedule_recipe_image(recipe.recipe_id, recipe.image_path)
             return Response({"recipe_id": recipe.recipe_id}, status=201)
 
         # 디버깅할 때는 이걸 잠깐 켜두면 어디서 막히는지 보임